@@ -0,0 +1,103 @@
+"""Shared helpers for benchmarks that run the gateway as a separate process.
+
+The gateway is started with ``python -m mcp_gateway.server`` in front of the
+bundled fake MCP server, so benchmarks need no network access or Node.js.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Sequence, Tuple
+
+import httpx
+from mcp_gateway import fake_server
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_gateway(
+    workdir: str, transport: str = "tcp", server_args: Sequence[str] = (), limits: int = 100
+) -> Tuple[subprocess.Popen, httpx.AsyncClient]:
+    """Start a gateway process serving the fake server; returns (process, client).
+
+    Args:
+        workdir: Directory for the config, catalog snapshots and socket
+        transport: tcp or uds, with an -h2 suffix for HTTP/2
+        server_args: Command-line options for the fake server
+        limits: Most connections the client opens
+    """
+    config_path = os.path.join(workdir, "config.json")
+    with open(config_path, "w") as f:
+        json.dump({"mcp": {"servers": {"fake": {
+            "command": sys.executable,
+            "args": [fake_server.__file__, *server_args],
+            "call_timeout": None
+        }}}}, f)
+    env = {
+        **os.environ,
+        "MCP_CONFIG": config_path,
+        "MCP_CATALOG_DIR": os.path.join(workdir, "catalog"),
+        "PYTHONPATH": os.path.dirname(os.path.dirname(fake_server.__file__)),
+    }
+    http2 = transport.endswith("-h2")
+    if http2:
+        env["MCP_HTTP2"] = "1"
+    if transport.startswith("uds"):
+        socket_path = os.path.join(workdir, f"{transport}.sock")
+        env["MCP_UDS"] = socket_path
+        base_url = "http://localhost"
+        http_transport = httpx.AsyncHTTPTransport(
+            uds=socket_path, http1=not http2, http2=http2, limits=httpx.Limits(max_connections=limits)
+        )
+    else:
+        env["MCP_PORT"] = str(_free_port())
+        base_url = f"http://127.0.0.1:{env['MCP_PORT']}"
+        http_transport = httpx.AsyncHTTPTransport(
+            http1=not http2, http2=http2, limits=httpx.Limits(max_connections=limits)
+        )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "mcp_gateway.server"],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    client = httpx.AsyncClient(transport=http_transport, base_url=base_url, timeout=None)
+    return process, client
+
+
+async def wait_ready(client: httpx.AsyncClient, process: subprocess.Popen, timeout: float = 30) -> None:
+    """Wait until the gateway reports the fake server ready."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Gateway exited with code {process.returncode}")
+        try:
+            response = await client.get("/servers")
+            if response.json().get("fake", {}).get("status") == "ready":
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.1)
+    raise TimeoutError("Gateway did not become ready")
+
+
+async def stop_gateway(process: subprocess.Popen, client: httpx.AsyncClient) -> None:
+    await client.aclose()
+    process.terminate()
+    process.wait()
+
+
+def percentiles(latencies: List[float]) -> Dict[str, float]:
+    """p50, p95 and p99 of latencies in seconds."""
+    if len(latencies) < 2:
+        value = latencies[0] if latencies else float("nan")
+        return {"p50": value, "p95": value, "p99": value}
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98]}
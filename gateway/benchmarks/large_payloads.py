@@ -0,0 +1,98 @@
+"""Benchmark reading large files through the gateway.
+
+Starts the bundled fake MCP server behind an in-process gateway and times
+``read_file`` calls for files of each size, both as direct ``call_tool``
+calls and as HTTP requests to ``/message`` (via an in-process transport, so
+no port is opened). Run from the gateway directory:
+
+    python benchmarks/large_payloads.py --sizes 1 10 100 --repeat 3
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from typing import Awaitable, Callable, List
+
+import httpx
+from mcp_gateway import fake_server
+from mcp_gateway import server as gateway_server
+from mcp_gateway.server import Gateway, MCPServerConfig, app
+
+MB = 1024 * 1024
+
+
+async def _time(call: Callable[[], Awaitable[int]], repeat: int) -> List[float]:
+    """Run a call repeatedly and return each duration in seconds."""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await call()
+        durations.append(time.perf_counter() - started)
+    return durations
+
+
+def _report(label: str, size_mb: int, durations: List[float]) -> None:
+    median = statistics.median(durations)
+    print(
+        f"{label:<10} {size_mb:>5} MB  median {median * 1000:9.1f} ms"
+        f"  {size_mb / median:8.1f} MB/s  max {max(durations) * 1000:9.1f} ms"
+    )
+
+
+async def main(sizes: List[int], repeat: int) -> None:
+    gateway = Gateway()
+    gateway_server.gateway = gateway
+    largest = max(sizes) * MB
+    await gateway.start_server("fake", MCPServerConfig(
+        command=sys.executable,
+        args=[fake_server.__file__],
+        # Leave room for JSON escaping and the envelope
+        max_message_bytes=2 * largest + MB,
+        call_timeout=None
+    ))
+    try:
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://gateway", timeout=None
+        ) as client:
+            for size_mb in sizes:
+                with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as f:
+                    f.write("x" * (size_mb * MB))
+                try:
+                    arguments = {"path": f.name}
+
+                    async def direct() -> int:
+                        result = await gateway.call_tool("read_file", arguments)
+                        return len(result["content"][0]["text"])
+
+                    async def http() -> int:
+                        response = await client.post("/message", json={
+                            "method": "tools/call",
+                            "params": {"name": "read_file", "arguments": arguments}
+                        })
+                        response.raise_for_status()
+                        return len(response.content)
+
+                    _report("call_tool", size_mb, await _time(direct, repeat))
+                    _report("/message", size_mb, await _time(http, repeat))
+                finally:
+                    os.unlink(f.name)
+    finally:
+        await gateway.shutdown()
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"peak gateway RSS {peak:.0f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100], help="file sizes in MB")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(main(args.sizes, args.repeat))
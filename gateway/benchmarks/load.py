@@ -0,0 +1,195 @@
+"""Load test the gateway's ``/message`` endpoint.
+
+Starts a gateway process in front of the bundled fake MCP server and runs
+each scenario against it, reporting throughput and latency percentiles:
+
+    small      echo calls
+    large      1 MiB payloads
+    mixed      mostly echo, with some 64 KiB payloads and 10 ms sleeps
+    burst      every request sent at once
+
+Requests are sent with a fixed number in flight (closed loop), or with
+``--rate`` at a fixed number per second regardless of how fast responses
+come back (open loop). In open loop, latency is measured from when a request
+was due, so a stalled gateway shows up in the percentiles. Everything runs
+locally. Run from the gateway directory:
+
+    python benchmarks/load.py --latency 0.002 --error-rate 0.01
+    python benchmarks/load.py --scenarios small --rate 500 --json results.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from harness import percentiles, start_gateway, stop_gateway, wait_ready
+
+KB = 1024
+
+# Picks the tool and arguments of the next request
+CallFactory = Callable[[random.Random], Tuple[str, Dict[str, Any]]]
+
+
+@dataclass
+class Scenario:
+    """A kind of load to put on the gateway."""
+    name: str
+    calls: CallFactory
+    requests: int
+    # Requests kept in flight, when not sending at a fixed rate
+    concurrency: int
+
+
+def _mixed(rng: random.Random) -> Tuple[str, Dict[str, Any]]:
+    roll = rng.random()
+    if roll < 0.7:
+        return "echo", {"text": "hello"}
+    if roll < 0.9:
+        return "payload", {"size": 64 * KB}
+    return "sleep", {"seconds": 0.01, "text": "slept"}
+
+
+SCENARIOS = {
+    scenario.name: scenario for scenario in (
+        Scenario("small", lambda rng: ("echo", {"text": "hello"}), requests=2000, concurrency=32),
+        Scenario("large", lambda rng: ("payload", {"size": 1024 * KB}), requests=100, concurrency=4),
+        Scenario("mixed", _mixed, requests=1000, concurrency=32),
+        Scenario("burst", lambda rng: ("echo", {"text": "hello"}), requests=500, concurrency=500),
+    )
+}
+
+
+class Recorder:
+    """Collects the latency and outcome of each request."""
+
+    def __init__(self):
+        """Start with no requests recorded."""
+        self.latencies: List[float] = []
+        self.errors = 0
+
+    async def send(self, client: httpx.AsyncClient, call: Tuple[str, Dict[str, Any]], started: float) -> None:
+        """Send one tool call and record its latency since ``started``."""
+        name, arguments = call
+        try:
+            response = await client.post("/message", json={
+                "method": "tools/call",
+                "params": {"name": name, "arguments": arguments}
+            })
+            if response.status_code != 200 or b'"isError":true' in response.content:
+                self.errors += 1
+        except httpx.HTTPError:
+            self.errors += 1
+        self.latencies.append(time.perf_counter() - started)
+
+
+async def run_closed(
+    client: httpx.AsyncClient, calls: List[Tuple[str, Dict[str, Any]]], concurrency: int
+) -> Tuple[Recorder, float]:
+    """Send calls with a fixed number in flight; returns the recorder and elapsed seconds."""
+    recorder = Recorder()
+    remaining = iter(calls)
+
+    async def worker() -> None:
+        for call in remaining:
+            await recorder.send(client, call, time.perf_counter())
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(calls)))))
+    return recorder, time.perf_counter() - started
+
+
+async def run_open(
+    client: httpx.AsyncClient, calls: List[Tuple[str, Dict[str, Any]]], rate: float
+) -> Tuple[Recorder, float]:
+    """Send calls at a fixed rate; returns the recorder and elapsed seconds."""
+    recorder = Recorder()
+    tasks = []
+    started = time.perf_counter()
+    for i, call in enumerate(calls):
+        due = started + i / rate
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(recorder.send(client, call, due)))
+    await asyncio.gather(*tasks)
+    return recorder, time.perf_counter() - started
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: Scenario, rate: Optional[float], seed: int
+) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    calls = [scenario.calls(rng) for _ in range(scenario.requests)]
+    if rate:
+        recorder, elapsed = await run_open(client, calls, rate)
+    else:
+        recorder, elapsed = await run_closed(client, calls, scenario.concurrency)
+    return {
+        "scenario": scenario.name,
+        "requests": len(calls),
+        "errors": recorder.errors,
+        "throughput": len(calls) / elapsed,
+        **percentiles(recorder.latencies),
+    }
+
+
+def _report(result: Dict[str, Any]) -> None:
+    print(
+        f"{result['scenario']:<8} {result['requests']:>6} req  {result['errors']:>5} err"
+        f"  {result['throughput']:8.0f} req/s  p50 {result['p50'] * 1000:8.2f} ms"
+        f"  p95 {result['p95'] * 1000:8.2f} ms  p99 {result['p99'] * 1000:8.2f} ms"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    server_args = ["--latency", str(args.latency), "--error-rate", str(args.error_rate), "--seed", str(args.seed)]
+    scenarios = [SCENARIOS[name] for name in args.scenarios]
+    if args.requests:
+        scenarios = [Scenario(s.name, s.calls, args.requests, s.concurrency) for s in scenarios]
+    if args.concurrency:
+        scenarios = [Scenario(s.name, s.calls, s.requests, args.concurrency) for s in scenarios]
+
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        limits = max(s.concurrency for s in scenarios)
+        process, client = start_gateway(workdir, args.transport, server_args, limits=limits)
+        try:
+            await wait_ready(client, process)
+            mode = f"{args.rate:g} req/s" if args.rate else "closed loop"
+            print(f"gateway over {args.transport}, {mode}, server latency {args.latency * 1000:g} ms, "
+                  f"error rate {args.error_rate:g}")
+            for scenario in scenarios:
+                # Warm up connections and the server before measuring
+                await run_closed(client, [scenario.calls(random.Random(0))] * scenario.concurrency, scenario.concurrency)
+                result = await run_scenario(client, scenario, args.rate, args.seed)
+                results.append(result)
+                _report(result)
+        finally:
+            await stop_gateway(process, client)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, help="requests per scenario (default: per scenario)")
+    parser.add_argument("--concurrency", type=int, help="requests in flight (default: per scenario)")
+    parser.add_argument("--rate", type=float, help="send this many requests per second instead")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the fake server adds to each call")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of calls the fake server fails")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--transport", choices=("tcp", "uds", "tcp-h2", "uds-h2"), default="tcp")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(main(args))
@@ -0,0 +1,86 @@
+"""Benchmark the transports between the agent and the gateway.
+
+Starts a gateway process in front of the bundled fake MCP server for each
+transport and sends concurrent ``echo`` calls through it, reporting call
+latency percentiles and throughput:
+
+    tcp        HTTP/1.1 over TCP (the default)
+    uds        HTTP/1.1 over a Unix domain socket
+    tcp-h2     HTTP/2 over TCP, all calls on one connection
+    uds-h2     HTTP/2 over a Unix domain socket
+
+The HTTP/2 transports need the optional ``hypercorn`` and ``h2`` packages
+and are skipped without them. Run from the gateway directory:
+
+    python benchmarks/transports.py --calls 2000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import logging
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+from harness import percentiles, start_gateway, stop_gateway, wait_ready
+
+TRANSPORTS = ("tcp", "uds", "tcp-h2", "uds-h2")
+
+
+async def _run(client: httpx.AsyncClient, calls: int, concurrency: int) -> Dict[str, float]:
+    """Send calls with a fixed number in flight; returns latency stats."""
+    latencies: List[float] = []
+    remaining = iter(range(calls))
+
+    async def worker() -> None:
+        for i in remaining:
+            started = time.perf_counter()
+            response = await client.post("/message", json={
+                "method": "tools/call",
+                "params": {"name": "echo", "arguments": {"text": str(i)}}
+            })
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {**percentiles(latencies), "throughput": calls / elapsed}
+
+
+async def bench(transport: str, calls: int, concurrency: int) -> Dict[str, float]:
+    with tempfile.TemporaryDirectory() as workdir:
+        process, client = start_gateway(workdir, transport)
+        try:
+            await wait_ready(client, process)
+            # Warm up connections before measuring
+            await _run(client, min(calls, concurrency * 4), concurrency)
+            return await _run(client, calls, concurrency)
+        finally:
+            await stop_gateway(process, client)
+
+
+async def main(transports: List[str], calls: int, concurrency: int) -> None:
+    has_http2 = all(importlib.util.find_spec(name) for name in ("hypercorn", "h2"))
+    print(f"{calls} echo calls, {concurrency} in flight")
+    for transport in transports:
+        if transport.endswith("-h2") and not has_http2:
+            print(f"{transport:<8} skipped: install hypercorn and h2")
+            continue
+        stats = await bench(transport, calls, concurrency)
+        print(
+            f"{transport:<8} p50 {stats['p50'] * 1000:7.2f} ms  p95 {stats['p95'] * 1000:7.2f} ms"
+            f"  p99 {stats['p99'] * 1000:7.2f} ms  {stats['throughput']:8.0f} calls/s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transports", nargs="+", choices=TRANSPORTS, default=list(TRANSPORTS))
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    asyncio.run(main(args.transports, args.calls, args.concurrency))
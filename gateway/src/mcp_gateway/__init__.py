@@ -1,5 +1,6 @@
 """MCP Gateway Server package."""
 
-from mcp_gateway.server import app, Gateway
+from mcp_gateway.admission import ServerBusyError
+from mcp_gateway.server import app, Gateway, ToolNotFoundError, ToolsPendingError, ToolTimeoutError
 
-__all__ = ["app", "Gateway"]
+__all__ = ["app", "Gateway", "ServerBusyError", "ToolNotFoundError", "ToolsPendingError", "ToolTimeoutError"]
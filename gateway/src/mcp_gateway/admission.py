@@ -0,0 +1,187 @@
+"""Admission control for tool calls.
+
+Each server admits a bounded number of concurrent calls. Further calls wait
+in a queue of bounded length, and calls arriving at a full queue are
+rejected straight away with a hint of when to retry, so overload sheds
+load instead of adding latency for every caller.
+
+Waiting calls are admitted by priority (high, medium, low), in arrival
+order within a priority. A call's priority rises by one level for every
+``aging`` seconds it has waited, so low-priority calls are delayed under
+load but never starved. When the queue is full, a call outranking the
+lowest-priority waiter takes its place, and that waiter is rejected.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+# Priority names, most urgent first
+PRIORITIES = ("high", "medium", "low")
+DEFAULT_PRIORITY = "medium"
+
+
+class ServerBusyError(Exception):
+    """Raised when a server's wait queue is full."""
+
+    def __init__(self, message: str, retry_after: int):
+        """Create the error; ``retry_after`` is a hint in seconds for the client."""
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def priority_level(priority: Optional[str]) -> int:
+    """Rank a priority name, 0 being the most urgent; unknown names rank as medium."""
+    if priority in PRIORITIES:
+        return PRIORITIES.index(priority)
+    return PRIORITIES.index(DEFAULT_PRIORITY)
+
+
+@dataclass
+class _Waiter:
+    level: int
+    future: asyncio.Future[None]
+    queued_at: float = field(default_factory=time.monotonic)
+
+
+class AdmissionQueue:
+    """Concurrency limit with a bounded priority queue of waiting calls."""
+
+    def __init__(self, name: str, limit: int, max_queue: Optional[int] = None, aging: float = 5.0):
+        """Create a queue admitting ``limit`` calls at once and queueing up to ``max_queue``."""
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        # Seconds of waiting that raise a call's priority by one level
+        self.aging = aging
+        self.active = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        # Moving average of how long an admitted call holds its slot
+        self.service_time = 0.0
+        self.admitted_by_priority = {priority: 0 for priority in PRIORITIES}
+        # A FIFO of waiting calls per priority level
+        self._waiters: List[Deque[_Waiter]] = [deque() for _ in PRIORITIES]
+
+    @property
+    def depth(self) -> int:
+        """Number of calls waiting for a slot."""
+        return sum(len(waiters) for waiters in self._waiters)
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        """Return the waiter to admit next: the most urgent after aging, oldest first."""
+        now = time.monotonic()
+        best: Optional[_Waiter] = None
+        best_rank = 0.0
+        for waiters in self._waiters:
+            if not waiters:
+                continue
+            # The oldest waiter of a level has aged the most
+            head = waiters[0]
+            rank = head.level - (now - head.queued_at) / self.aging
+            if best is None or rank < best_rank or (rank == best_rank and head.queued_at < best.queued_at):
+                best, best_rank = head, rank
+        return best
+
+    def _displace(self, level: int) -> bool:
+        """Reject the newest waiter of the lowest priority below level to make room."""
+        for waiters in reversed(self._waiters[level + 1:]):
+            if waiters:
+                waiter = waiters.pop()
+                self.rejected += 1
+                waiter.future.set_exception(ServerBusyError(
+                    f"Server {self.name} is busy; displaced by a higher-priority call", self.retry_after()
+                ))
+                return True
+        return False
+
+    def retry_after(self) -> int:
+        """Estimate whole seconds until a queued call would be admitted."""
+        return max(1, math.ceil(self.service_time * (self.depth + 1) / self.limit))
+
+    async def acquire(self, priority: Optional[str] = None) -> None:
+        """Wait for a slot.
+
+        Args:
+            priority: high, medium or low; defaults to medium
+
+        Raises:
+            ServerBusyError: If the queue is full of calls of the same or
+                higher priority, or if this call is displaced from the queue
+                by a higher-priority one
+        """
+        level = priority_level(priority)
+        if self.active < self.limit and not self.depth:
+            self.active += 1
+            self._admitted(level, 0.0)
+            return
+        if self.max_queue is not None and self.depth >= self.max_queue and not self._displace(level):
+            self.rejected += 1
+            raise ServerBusyError(
+                f"Server {self.name} is busy ({self.depth} calls queued)", self.retry_after()
+            )
+
+        waiter = _Waiter(level, asyncio.get_running_loop().create_future())
+        self._waiters[level].append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # The slot was handed over just as the caller gave up
+                self.release()
+            elif waiter in self._waiters[level]:
+                self._waiters[level].remove(waiter)
+            raise
+        self._admitted(level, time.monotonic() - waiter.queued_at)
+
+    def _admitted(self, level: int, waited: float) -> None:
+        self.admitted += 1
+        self.admitted_by_priority[PRIORITIES[level]] += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    def release(self) -> None:
+        """Free a slot, handing it to the most urgent waiting call."""
+        self.active -= 1
+        while self.active < self.limit:
+            waiter = self._next_waiter()
+            if waiter is None:
+                break
+            self._waiters[waiter.level].popleft()
+            if not waiter.future.done():
+                self.active += 1
+                waiter.future.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, priority: Optional[str] = None) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block."""
+        await self.acquire(priority)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.service_time = 0.8 * self.service_time + 0.2 * (time.monotonic() - started)
+            self.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return current usage and wait time counters."""
+        return {
+            "limit": self.limit,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "depth": self.depth,
+            "depth_by_priority": {
+                priority: len(waiters) for priority, waiters in zip(PRIORITIES, self._waiters)
+            },
+            "admitted": self.admitted,
+            "admitted_by_priority": dict(self.admitted_by_priority),
+            "rejected": self.rejected,
+            "avg_wait": self.total_wait / self.admitted if self.admitted else 0.0,
+            "max_wait": self.max_wait,
+        }
@@ -0,0 +1,90 @@
+"""Tool result cache.
+
+Caches results of read-only tool calls keyed on the tool and its
+canonicalized arguments, with a TTL per entry and LRU eviction once the
+cache exceeds its memory budget.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import orjson
+
+
+def cache_key(server: str, tool: str, arguments: Dict[str, Any]) -> str:
+    """Build a key that is the same for equivalent arguments."""
+    canonical = orjson.dumps(arguments, option=orjson.OPT_SORT_KEYS).decode()
+    return f"{server}\0{tool}\0{canonical}"
+
+
+@dataclass
+class CacheEntry:
+    """A cached result and its bookkeeping."""
+    value: Any
+    size: int
+    expires_at: float
+
+
+class ToolResultCache:
+    """LRU cache of tool results bounded by total size in bytes."""
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """Create an empty cache holding at most ``max_bytes`` of results."""
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a live cached value, or None on a miss."""
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def put(self, key: str, value: Any, ttl: float, size: int) -> None:
+        """Cache a value for ttl seconds, evicting least recently used entries."""
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = CacheEntry(value, size, time.monotonic() + ttl)
+        self.size += size
+        while self.size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def clear(self, server: Optional[str] = None) -> None:
+        """Drop every entry, or only those for one server."""
+        if server is None:
+            self._entries.clear()
+            self.size = 0
+            return
+        prefix = f"{server}\0"
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            self._remove(key)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current usage."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self.size -= entry.size
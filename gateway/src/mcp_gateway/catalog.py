@@ -0,0 +1,61 @@
+"""Persisted tool catalog snapshots.
+
+Each server's tool list is saved to a JSON file keyed by a fingerprint of
+the command, args and env that started it, so it can be served without
+spawning the server.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def config_fingerprint(command: str, args: List[str], env: Dict[str, str]) -> str:
+    """Hash the parts of a server config that determine its tools."""
+    key = json.dumps({"command": command, "args": args, "env": env}, sort_keys=True)
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class CatalogStore:
+    """Reads and writes per-server tool catalog snapshots in a directory."""
+
+    def __init__(self, directory: str):
+        """Create a store keeping snapshots in ``directory``."""
+        self.directory = directory
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.json")
+
+    def load(self, name: str, fingerprint: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the saved tools for a server, if saved under this fingerprint."""
+        try:
+            with open(self._path(name)) as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable catalog snapshot for {name}: {str(e)}")
+            return None
+
+        if snapshot.get("fingerprint") != fingerprint:
+            logger.info(f"Catalog snapshot for {name} is for a different config")
+            return None
+        tools: List[Dict[str, Any]] = snapshot.get("tools", [])
+        return tools
+
+    def save(self, name: str, fingerprint: str, tools: List[Dict[str, Any]]) -> None:
+        """Save a server's tools, replacing any previous snapshot atomically."""
+        path = self._path(name)
+        tmp_path = f"{path}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump({"fingerprint": fingerprint, "saved_at": time.time(), "tools": tools}, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not save catalog snapshot for {name}: {str(e)}")
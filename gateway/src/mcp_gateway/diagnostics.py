@@ -0,0 +1,108 @@
+"""Diagnostics for MCP server processes.
+
+A server's stderr is kept in a bounded ring buffer so recent output can be
+inspected without logging all of it; lines are forwarded to the gateway log
+at a limited rate, and the number of lines held back is reported instead.
+Process memory and open files are read from ``/proc`` on Linux.
+"""
+
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional, Set, Tuple
+
+# Longer stderr lines are truncated before being buffered or logged
+MAX_LINE_CHARS = 2000
+
+
+class StderrBuffer:
+    """The last lines a server wrote to stderr, with a log rate limit."""
+
+    def __init__(self, max_lines: int = 200, log_rate: float = 10.0):
+        """Keep the last ``max_lines`` lines and log at most ``log_rate`` lines a second."""
+        self.lines: Deque[Tuple[float, str]] = deque(maxlen=max_lines)
+        self.total = 0
+        # Token bucket for forwarding lines to the log, allowing bursts of
+        # up to one second's worth
+        self.log_rate = log_rate
+        self._tokens = log_rate
+        self._refilled_at = time.monotonic()
+        self.not_logged = 0
+        self._unreported = 0
+
+    def append(self, line: str) -> bool:
+        """Buffer a line; return whether it may be logged."""
+        if len(line) > MAX_LINE_CHARS:
+            line = line[:MAX_LINE_CHARS] + "..."
+        self.lines.append((time.time(), line))
+        self.total += 1
+
+        now = time.monotonic()
+        self._tokens = min(self.log_rate, self._tokens + (now - self._refilled_at) * self.log_rate)
+        self._refilled_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        self.not_logged += 1
+        self._unreported += 1
+        return False
+
+    def take_unreported(self) -> int:
+        """Lines held back from the log since the last call."""
+        count, self._unreported = self._unreported, 0
+        return count
+
+    def snapshot(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Describe the buffered lines, most recent last."""
+        lines = list(self.lines)[-limit:] if limit else list(self.lines)
+        return {
+            "lines": [{"time": at, "text": text} for at, text in lines],
+            "total": self.total,
+            "not_logged": self.not_logged,
+        }
+
+
+@dataclass
+class ProcessGroupUsage:
+    """Resource use of the processes in one process group."""
+    processes: int = 0
+    # Summed across the group's processes
+    rss_bytes: int = 0
+    # Of the largest process, since rlimits apply to each process
+    max_vm_bytes: int = 0
+    max_open_files: int = 0
+
+
+def process_group_usage(pgids: Set[int]) -> Optional[Dict[int, ProcessGroupUsage]]:
+    """Resource use of the given process groups, read from /proc in one pass.
+
+    Groups with no processes left are missing from the result. Returns None
+    where /proc is unavailable.
+    """
+    if not os.path.isdir("/proc"):
+        return None
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    usage: Dict[int, ProcessGroupUsage] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                stat = f.read()
+            # Fields after the parenthesized command name, starting at state
+            fields = stat[stat.rindex(b")") + 2:].split()
+            pgid = int(fields[2])
+            if pgid not in pgids:
+                continue
+            open_files = len(os.listdir(f"/proc/{entry}/fd"))
+            group = usage.setdefault(pgid, ProcessGroupUsage())
+            group.processes += 1
+            group.rss_bytes += int(fields[21]) * page_size
+            group.max_vm_bytes = max(group.max_vm_bytes, int(fields[20]))
+            group.max_open_files = max(group.max_open_files, open_files)
+        except (OSError, ValueError, IndexError):
+            # The process exited while being read
+            continue
+    return usage
+
@@ -0,0 +1,210 @@
+"""Fake MCP Server.
+
+A minimal stdio MCP server used to exercise the gateway without Node.js.
+Run it with ``python -m mcp_gateway.fake_server``. Requests are handled
+concurrently, so responses may be written out of order.
+
+Options:
+    --startup-delay SECONDS  Wait before reading any requests
+    --latency SECONDS        Added to every tool call
+    --error-rate FRACTION    Share of tool calls answered with an error
+    --seed N                 Seed for choosing which calls fail
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional, Set
+
+TOOLS = [
+    {
+        "name": "echo",
+        "description": "Echo the given text back.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"text": {"type": "string"}},
+            "required": ["text"],
+        },
+    },
+    {
+        "name": "sleep",
+        "description": "Sleep for the given number of seconds, then echo the text.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "seconds": {"type": "number"},
+                "text": {"type": "string"},
+            },
+            "required": ["seconds"],
+        },
+    },
+    {
+        "name": "count",
+        "description": "Return one text part per number up to n, reporting progress along the way.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "n": {"type": "integer"},
+                "delay": {"type": "number"},
+            },
+            "required": ["n"],
+        },
+    },
+    {
+        "name": "payload",
+        "description": "Return a text of the given size in bytes.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"size": {"type": "integer"}},
+            "required": ["size"],
+        },
+    },
+    {
+        "name": "log",
+        "description": "Write the text to stderr n times.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "text": {"type": "string"},
+                "n": {"type": "integer"},
+            },
+            "required": ["text"],
+        },
+    },
+    {
+        "name": "read_file",
+        "description": "Return the contents of a file.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"path": {"type": "string"}},
+            "required": ["path"],
+        },
+    },
+]
+
+_write_lock = threading.Lock()
+# Ids of requests the client has cancelled
+_cancelled: Set[Any] = set()
+# Set from the command line
+_latency = 0.0
+_error_rate = 0.0
+_random = random.Random()
+
+
+def _send(message: Dict[str, Any]) -> None:
+    """Write a single JSON-RPC message to stdout."""
+    data = json.dumps(message) + "\n"
+    with _write_lock:
+        sys.stdout.write(data)
+        sys.stdout.flush()
+
+
+def _sleep(seconds: float, request_id: Any) -> bool:
+    """Sleep unless the request is cancelled first; return whether it was."""
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        if request_id in _cancelled:
+            return True
+        time.sleep(min(0.01, max(0.0, deadline - time.monotonic())))
+    return request_id in _cancelled
+
+
+def _call_tool(
+    name: str, arguments: Dict[str, Any], progress_token: Any = None, request_id: Any = None
+) -> Optional[Dict[str, Any]]:
+    """Run one of the fake tools, returning None if it was cancelled."""
+    if _latency and _sleep(_latency, request_id):
+        return None
+    if _error_rate and _random.random() < _error_rate:
+        raise RuntimeError(f"Injected failure in {name}")
+    if name == "count":
+        n = int(arguments.get("n", 0))
+        for i in range(1, n + 1):
+            time.sleep(float(arguments.get("delay", 0)))
+            if progress_token is not None:
+                _send({
+                    "jsonrpc": "2.0",
+                    "method": "notifications/progress",
+                    "params": {"progressToken": progress_token, "progress": i, "total": n},
+                })
+        return {"content": [{"type": "text", "text": str(i)} for i in range(1, n + 1)]}
+    if name == "payload":
+        return {"content": [{"type": "text", "text": "x" * int(arguments["size"])}]}
+    if name == "log":
+        n = int(arguments.get("n", 1))
+        sys.stderr.write(f"{arguments['text']}\n" * n)
+        sys.stderr.flush()
+        return {"content": [{"type": "text", "text": str(n)}]}
+    if name == "read_file":
+        with open(arguments["path"]) as f:
+            return {"content": [{"type": "text", "text": f.read()}]}
+    if name == "sleep":
+        if _sleep(float(arguments.get("seconds", 0)), request_id):
+            return None
+    elif name != "echo":
+        raise ValueError(f"Unknown tool: {name}")
+    return {"content": [{"type": "text", "text": str(arguments.get("text", ""))}]}
+
+
+def _handle(request: Dict[str, Any]) -> None:
+    """Handle a single JSON-RPC request."""
+    if "id" not in request:
+        # Notifications need no response
+        if request.get("method") == "notifications/cancelled":
+            _cancelled.add((request.get("params") or {}).get("requestId"))
+        return
+    method = request.get("method")
+    params = request.get("params") or {}
+    try:
+        if method == "initialize":
+            result: Dict[str, Any] = {
+                "protocolVersion": params.get("protocolVersion", "2024-11-05"),
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": "fake-mcp-server", "version": "0.1.0"},
+            }
+        elif method == "tools/list":
+            result = {"tools": TOOLS}
+        elif method == "tools/call":
+            progress_token = (params.get("_meta") or {}).get("progressToken")
+            called = _call_tool(params["name"], params.get("arguments") or {}, progress_token, request["id"])
+            if called is None:
+                # Cancelled requests get no response
+                return
+            result = called
+        else:
+            raise ValueError(f"Method not found: {method}")
+        _send({"jsonrpc": "2.0", "id": request["id"], "result": result})
+    except Exception as e:
+        _send({
+            "jsonrpc": "2.0",
+            "id": request["id"],
+            "error": {"code": -32603, "message": str(e)},
+        })
+
+
+def main() -> None:
+    """Serve requests from stdin until it is closed."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--startup-delay", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    global _latency, _error_rate
+    _latency = args.latency
+    _error_rate = args.error_rate
+    _random.seed(args.seed)
+    time.sleep(args.startup_delay)
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        threading.Thread(target=_handle, args=(request,), daemon=True).start()
+
+
+if __name__ == "__main__":
+    main()
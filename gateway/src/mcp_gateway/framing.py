@@ -0,0 +1,138 @@
+"""Newline-delimited JSON-RPC framing over stdio.
+
+MCP stdio servers write one JSON message per line. Lines can be many
+megabytes (e.g. a large file read), so they are assembled from fixed-size
+chunks rather than with ``StreamReader.readline()``, whose buffer limit
+would otherwise need to fit the largest message.
+"""
+
+import asyncio
+import json
+import re
+from typing import Any, List, Optional
+
+# Bytes requested from the pipe per read, also used as the StreamReader limit
+READ_CHUNK_SIZE = 1024 * 1024
+
+# Bytes kept from each end of an oversized message to find its id
+_EDGE_BYTES = 256
+_ID_PATTERN = re.compile(rb'"id"\s*:\s*(-?\d+|"(?:[^"\\]|\\.)*")')
+
+
+class MessageTooLargeError(Exception):
+    """Raised for a message longer than the configured limit.
+
+    The message itself is discarded; ``request_id`` is the JSON-RPC id found
+    near its start or end, if any, so the matching request can be failed.
+    """
+
+    def __init__(self, size: int, limit: int, request_id: Any = None):
+        """Create the error; ``request_id`` is the oversized message's id, if found."""
+        super().__init__(f"Message of at least {size} bytes exceeds the {limit} byte limit")
+        self.size = size
+        self.limit = limit
+        self.request_id = request_id
+
+
+def _find_id(head: bytes, tail: bytes) -> Any:
+    """Find a JSON-RPC id in the edges of a message.
+
+    Responses usually put the id first or last; the last match in the tail
+    is preferred because ids in the head may belong to nested objects.
+    """
+    matches = _ID_PATTERN.findall(tail) or _ID_PATTERN.findall(head)
+    return json.loads(matches[-1]) if matches else None
+
+
+class MessageReader:
+    """Split a byte stream into newline-delimited messages.
+
+    Messages are found by searching from an offset into the current chunk,
+    and each is copied out once, joined from the chunks it spans, so
+    framing is linear in the bytes read however many messages a chunk holds.
+    """
+
+    def __init__(self, stream: asyncio.StreamReader, max_message_bytes: int):
+        """Create a reader for ``stream`` rejecting messages over ``max_message_bytes``."""
+        self.stream = stream
+        self.max_message_bytes = max_message_bytes
+        # The start of the message in progress, from earlier chunks
+        self._parts: List[bytes] = []
+        self._size = 0
+        # The last chunk read, and where its unread bytes start
+        self._chunk = b""
+        self._pos = 0
+        # Set while discarding the rest of an oversized message
+        self._skipping = False
+        self._head = b""
+        self._tail = b""
+        self._skipped = 0
+
+    async def read_message(self) -> Optional[bytes]:
+        """Return the next message without its newline, or None at end of stream.
+
+        Raises:
+            MessageTooLargeError: After discarding an oversized message;
+                reading may continue afterwards
+        """
+        while True:
+            message = self._take_message()
+            if message is not None:
+                return message
+            chunk = await self.stream.read(READ_CHUNK_SIZE)
+            if not chunk:
+                if self._parts and not self._skipping:
+                    # A final message without a trailing newline
+                    message = b"".join(self._parts)
+                    self._parts, self._size = [], 0
+                    return message
+                return None
+            self._chunk, self._pos = chunk, 0
+
+    def _take_message(self) -> Optional[bytes]:
+        """Split off the next complete message from the buffered bytes, if any."""
+        newline = self._chunk.find(b"\n", self._pos)
+        if newline < 0:
+            # Keep the unread end of the chunk for the message in progress
+            if self._pos < len(self._chunk):
+                self._parts.append(self._chunk[self._pos:])
+                self._size += len(self._chunk) - self._pos
+            self._chunk, self._pos = b"", 0
+            if self._parts and (self._skipping or self._size > self.max_message_bytes):
+                self._start_skipping()
+            return None
+
+        piece = self._chunk[self._pos:newline]
+        self._pos = newline + 1
+        if self._parts:
+            self._parts.append(piece)
+            message = b"".join(self._parts)
+            self._parts, self._size = [], 0
+        else:
+            message = piece
+
+        if self._skipping:
+            self._skipping = False
+            self._skipped += len(message)
+            self._tail = (self._tail + message[-_EDGE_BYTES:])[-_EDGE_BYTES:]
+            raise MessageTooLargeError(
+                self._skipped, self.max_message_bytes, _find_id(self._head, self._tail)
+            )
+        if len(message) > self.max_message_bytes:
+            raise MessageTooLargeError(
+                len(message), self.max_message_bytes,
+                _find_id(message[:_EDGE_BYTES], message[-_EDGE_BYTES:])
+            )
+        return message
+
+    def _start_skipping(self) -> None:
+        """Drop the buffered start of an oversized message, keeping its edges."""
+        data = b"".join(self._parts)
+        if not self._skipping:
+            self._skipping = True
+            self._head = data[:_EDGE_BYTES]
+            self._tail = b""
+            self._skipped = 0
+        self._tail = (self._tail + data[-_EDGE_BYTES:])[-_EDGE_BYTES:]
+        self._skipped += len(data)
+        self._parts, self._size = [], 0
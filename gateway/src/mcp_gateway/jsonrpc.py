@@ -0,0 +1,161 @@
+"""JSON-RPC envelope parsing.
+
+Tool results can be many megabytes, while the gateway only needs a
+response's id and whether it failed. ``parse_message`` reads the small
+envelope members around a response's ``result`` and returns the result as
+the raw bytes the server sent, so it can be forwarded to HTTP clients
+without being decoded and encoded again. Anything else falls back to a
+full parse with orjson.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+_WHITESPACE = b" \t\r\n"
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+_SCALAR = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null')
+# The next string or bracket in a value
+_STRUCTURE = re.compile(rb'["\[\]{}]')
+_CLOSING = {ord("{"): ord("}"), ord("["): ord("]")}
+# Strings and brackets in a raw value beyond which it is left to a full parse
+MAX_VALUE_TOKENS = 10_000
+
+@dataclass
+class Message:
+    """A message from a server: a response, or a request or notification."""
+    id: Any = None
+    method: Optional[str] = None
+    params: Optional[Dict[str, Any]] = None
+    error: Optional[Any] = None
+    # A response's result as raw JSON bytes
+    result: Optional[bytes] = None
+
+
+def parse_message(data: bytes) -> Message:
+    """Parse a message, leaving a response's result undecoded.
+
+    Raises:
+        ValueError: If the message is not a JSON object
+    """
+    split = split_object(data, "result")
+    if split is not None:
+        members, result = split
+        return Message(id=members.get("id"), result=result)
+
+    message = orjson.loads(data)
+    if not isinstance(message, dict):
+        raise ValueError("Message is not a JSON object")
+    return Message(
+        id=message.get("id"),
+        method=message.get("method"),
+        params=message.get("params"),
+        error=message.get("error"),
+        result=orjson.dumps(message["result"]) if "result" in message else None
+    )
+
+
+def split_object(data: bytes, key: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+    """Split a JSON object into its scalar members and one raw member value.
+
+    The value of ``key`` is skipped over rather than decoded, finding each
+    string's end with a byte search, so the cost depends on how many strings
+    and brackets it holds rather than on their length.
+
+    Returns:
+        (other members, raw value of key), or None if the object has other
+        non-scalar members, lacks the key, has a value of key with more than
+        ``MAX_VALUE_TOKENS`` strings and brackets, or is not in a shape this
+        handles, in which case the caller should parse it in full
+    """
+    members: Dict[str, Any] = {}
+    pos = _skip_whitespace(data, 0)
+    if data[pos:pos + 1] != b"{":
+        return None
+    pos += 1
+    start: Optional[int] = None
+    end = 0
+    while True:
+        pos = _skip_whitespace(data, pos)
+        name = _STRING.match(data, pos)
+        if name is None:
+            return None
+        pos = _skip_whitespace(data, name.end())
+        if data[pos:pos + 1] != b":":
+            return None
+        pos = _skip_whitespace(data, pos + 1)
+        if start is None and orjson.loads(name.group()) == key:
+            start = pos
+            value_end = _value_end(data, pos)
+            if value_end is None:
+                return None
+            end = pos = value_end
+        else:
+            value = _SCALAR.match(data, pos)
+            if value is None:
+                return None
+            members[orjson.loads(name.group())] = orjson.loads(value.group())
+            pos = value.end()
+        pos = _skip_whitespace(data, pos)
+        if data[pos:pos + 1] == b",":
+            pos += 1
+            continue
+        if data[pos:pos + 1] != b"}" or _skip_whitespace(data, pos + 1) != len(data):
+            return None
+        break
+
+    if start is None:
+        return None
+    return members, data[start:end]
+
+
+def _skip_whitespace(data: bytes, pos: int) -> int:
+    while pos < len(data) and data[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _value_end(data: bytes, start: int) -> Optional[int]:
+    """Find the end of the object or array that starts at start.
+
+    Returns None if there is none there, it is malformed, or it holds more
+    than ``MAX_VALUE_TOKENS`` strings and brackets.
+    """
+    if data[start:start + 1] not in (b"{", b"["):
+        return None
+    # Blank out escaped backslashes and quotes, keeping offsets, so every
+    # quote left delimits a string and each string is skipped with one find
+    if b"\\" in data:
+        if b"\\\\" in data:
+            data = data.replace(b"\\\\", b"__")
+        data = data.replace(b'\\"', b"__")
+    expected: List[int] = []
+    pos = start
+    for _ in range(MAX_VALUE_TOKENS):
+        token = _STRUCTURE.search(data, pos)
+        if token is None:
+            return None
+        char = data[token.start()]
+        pos = token.end()
+        if char == ord('"'):
+            pos = data.find(b'"', pos) + 1
+            if not pos:
+                return None
+        elif char in _CLOSING:
+            expected.append(_CLOSING[char])
+        elif not expected or expected.pop() != char:
+            return None
+        elif not expected:
+            return pos
+    return None
+
+
+def is_error_result(result: bytes) -> bool:
+    """Whether a raw tools/call result reports a tool error."""
+    split = split_object(result, "content")
+    if split is not None:
+        return split[0].get("isError") is True
+    parsed = orjson.loads(result)
+    return not isinstance(parsed, dict) or parsed.get("isError") is True
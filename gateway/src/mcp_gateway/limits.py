@@ -0,0 +1,75 @@
+"""Resource limits for MCP server processes.
+
+Limits are applied by the gateway to a server's process as soon as it is
+spawned, so everything it starts inherits them: the CPUs it may run on, its
+nice level, and its address-space and open-file rlimits. They are not set in
+a ``preexec_fn``, which may deadlock the child when the gateway runs threads.
+Linux ignores ``RLIMIT_RSS``, so resident memory is capped by sampling it
+instead (see ``Gateway._watch_limits``). Limits are only applied on Linux.
+"""
+
+import os
+import sys
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None  # type: ignore[assignment]
+
+SUPPORTED = sys.platform.startswith("linux")
+
+
+def _set_limit(pid: int, kind: int, value: int) -> None:
+    """Set a process's soft and hard rlimit, never above its current hard limit."""
+    hard = resource.prlimit(pid, kind)[1]
+    if hard != resource.RLIM_INFINITY:
+        value = min(value, hard)
+    resource.prlimit(pid, kind, (value, value))
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    """Limits on a server's processes; unset fields are not limited."""
+    cpu_affinity: Tuple[int, ...] = ()
+    nice: Optional[int] = None
+    max_address_space_bytes: Optional[int] = None
+    max_rss_bytes: Optional[int] = None
+    max_open_files: Optional[int] = None
+
+    def validate(self) -> None:
+        """Reject out-of-range limits.
+
+        Raises:
+            ValueError: If a limit is out of range
+        """
+        if self.nice is not None and not -20 <= self.nice <= 19:
+            raise ValueError(f"nice must be between -20 and 19, not {self.nice}")
+        if any(cpu < 0 for cpu in self.cpu_affinity):
+            raise ValueError(f"cpu_affinity must list CPU numbers, not {list(self.cpu_affinity)}")
+        for name in ("max_address_space_bytes", "max_rss_bytes", "max_open_files"):
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive, not {value}")
+
+    @property
+    def configured(self) -> bool:
+        """Whether any limit is set."""
+        return self != ResourceLimits()
+
+    def apply(self, pid: int) -> None:
+        """Apply the limits to a process that was just spawned.
+
+        Raises:
+            OSError: If a limit can't be set, e.g. a negative nice level
+                without the privilege to raise priority
+        """
+        if self.cpu_affinity:
+            os.sched_setaffinity(pid, self.cpu_affinity)
+        if self.nice is not None:
+            os.setpriority(os.PRIO_PROCESS, pid, self.nice)
+        if self.max_address_space_bytes:
+            _set_limit(pid, resource.RLIMIT_AS, self.max_address_space_bytes)
+        if self.max_open_files:
+            _set_limit(pid, resource.RLIMIT_NOFILE, self.max_open_files)
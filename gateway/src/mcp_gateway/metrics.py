@@ -0,0 +1,201 @@
+"""Prometheus metrics for the gateway.
+
+Counters and histograms are plain dicts keyed by label values, so recording
+on the request path is a dict lookup and an addition with no locking (the
+gateway runs on one event loop). Gauges such as queue depth are read from
+the gateway's own state when ``/metrics`` is scraped, so they cost nothing
+between scrapes. Output is the Prometheus text exposition format.
+"""
+
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple, TypeVar
+
+Labels = Tuple[str, ...]
+
+# Seconds; tool calls range from cache hits to minute-long searches
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Bytes, from small JSON replies to whole files
+SIZE_BUCKETS = tuple(float(4 ** i * 256) for i in range(10))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """Base class holding a metric's name, help text and label names."""
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Create a metric; ``documentation`` becomes its HELP text."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> List[str]:
+        """Return the HELP and TYPE lines."""
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> Iterable[str]:
+        """Yield one exposition line per sample."""
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """A monotonically increasing count per label set."""
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Create a counter with no label sets recorded yet."""
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Add ``amount`` to the count for ``labels``."""
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        """Yield the count for each label set."""
+        for labels, value in self.values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+class Histogram(Metric):
+    """Observations counted into fixed buckets per label set."""
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        """Create a histogram counting into ``buckets`` (upper bounds, ascending)."""
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: a count per bucket (the last is +Inf) and the sum
+        self.counts: Dict[Labels, List[int]] = {}
+        self.sums: Dict[Labels, float] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Count ``value`` into its bucket for ``labels``."""
+        counts = self.counts.get(labels)
+        if counts is None:
+            counts = self.counts[labels] = [0] * (len(self.buckets) + 1)
+            self.sums[labels] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self.sums[labels] += value
+
+    def samples(self) -> Iterable[str]:
+        """Yield the cumulative buckets, sum and count for each label set."""
+        for labels, counts in self.counts.items():
+            total = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                total += count
+                le = f'le="{_format_value(float(bound))}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {total}"
+            formatted = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{formatted} {_format_value(self.sums[labels])}"
+            yield f"{self.name}_count{formatted} {total}"
+
+
+class Gauge(Metric):
+    """A value per label set, read from a callback at scrape time."""
+    kind = "gauge"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str],
+        collect: Callable[[], Dict[Labels, float]]
+    ):
+        """Create a gauge whose values ``collect`` returns at scrape time."""
+        super().__init__(name, documentation, labelnames)
+        self.collect = collect
+
+    def samples(self) -> Iterable[str]:
+        """Yield the collected value for each label set."""
+        for labels, value in self.collect().items():
+            yield f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+
+
+MetricType = TypeVar("MetricType", bound=Metric)
+
+
+class Registry:
+    """A set of metrics rendered together."""
+
+    def __init__(self) -> None:
+        """Create an empty registry."""
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: MetricType) -> MetricType:
+        """Add ``metric`` to the registry and return it."""
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text format."""
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+class GatewayMetrics(Registry):
+    """The metrics recorded by the gateway on its request and startup paths."""
+
+    def __init__(self) -> None:
+        """Register the gateway's counters and histograms."""
+        super().__init__()
+        self.tool_calls = self.register(Counter(
+            "mcp_gateway_tool_calls_total",
+            "Tool calls by outcome (ok, error, timeout, rejected, cancelled or cached).",
+            ("server", "tool", "status")
+        ))
+        self.tool_latency = self.register(Histogram(
+            "mcp_gateway_tool_call_duration_seconds",
+            "Tool call latency, including time queued for a slot.",
+            ("server", "tool")
+        ))
+        self.coalesced_calls = self.register(Counter(
+            "mcp_gateway_coalesced_calls_total",
+            "Tool calls that shared an identical call already in flight instead of sending their own.",
+            ("server", "tool")
+        ))
+        self.response_bytes = self.register(Histogram(
+            "mcp_gateway_tool_response_bytes",
+            "Size of tool results as sent by the server.",
+            ("server", "tool"),
+            buckets=SIZE_BUCKETS
+        ))
+        self.startup_duration = self.register(Histogram(
+            "mcp_gateway_startup_duration_seconds",
+            "Time from spawning a server process until its handshake completed.",
+            ("server",)
+        ))
+        self.crashes = self.register(Counter(
+            "mcp_gateway_server_crashes_total",
+            "Server processes that exited while serving requests.",
+            ("server",)
+        ))
+        self.limit_breaches = self.register(Counter(
+            "mcp_gateway_limit_breaches_total",
+            "Times a server process reached a resource limit (rss, address_space or open_files).",
+            ("server", "limit")
+        ))
+        self.restarts = self.register(Counter(
+            "mcp_gateway_server_restarts_total",
+            "Server processes respawned after a failed start or a crash.",
+            ("server",)
+        ))
@@ -0,0 +1,151 @@
+"""In-process Python tool providers.
+
+A config entry with ``module`` or ``callables`` instead of ``command``
+registers Python functions as MCP tools. They are called directly, with no
+process, pipes or JSON-RPC in between, either on the gateway's event loop
+or in a thread or process pool.
+
+A module provides its tools as a ``TOOLS`` list; ``callables`` names
+functions as ``"package.module:function"``. Each function's name, docstring
+and signature become the tool's name, description and input schema, unless
+overridden with the ``tool`` decorator.
+"""
+
+import asyncio
+import functools
+import importlib
+import inspect
+import logging
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+EXECUTORS = ("loop", "thread", "process")
+
+# A function served as a tool, called with its arguments as keywords
+ToolFunction = Callable[..., Any]
+
+_JSON_TYPES = {str: "string", int: "integer", float: "number", bool: "boolean", list: "array", dict: "object"}
+
+
+def tool(
+    name: Optional[str] = None,
+    description: Optional[str] = None,
+    input_schema: Optional[Dict[str, Any]] = None
+) -> Callable[[ToolFunction], ToolFunction]:
+    """Override the tool definition derived from a function."""
+    def decorate(func: ToolFunction) -> ToolFunction:
+        setattr(func, "__mcp_tool__", {"name": name, "description": description, "inputSchema": input_schema})
+        return func
+    return decorate
+
+
+def _input_schema(func: ToolFunction) -> Dict[str, Any]:
+    """Build a JSON schema for a function's parameters."""
+    properties: Dict[str, Any] = {}
+    required: List[str] = []
+    for param in inspect.signature(func).parameters.values():
+        if param.kind in (param.VAR_POSITIONAL, param.VAR_KEYWORD):
+            continue
+        annotation = getattr(param.annotation, "__origin__", param.annotation)
+        properties[param.name] = {"type": _JSON_TYPES[annotation]} if annotation in _JSON_TYPES else {}
+        if param.default is param.empty:
+            required.append(param.name)
+    return {"type": "object", "properties": properties, "required": required}
+
+
+def describe(func: ToolFunction) -> Dict[str, Any]:
+    """Build the MCP tool definition for a function."""
+    overrides = getattr(func, "__mcp_tool__", {})
+    doc = inspect.getdoc(func) or ""
+    return {
+        "name": overrides.get("name") or func.__name__,
+        "description": overrides.get("description") or doc.split("\n\n")[0],
+        "inputSchema": overrides.get("inputSchema") or _input_schema(func),
+    }
+
+
+def _resolve(target: str) -> ToolFunction:
+    """Import a "package.module:function" reference."""
+    module_name, _, attr = target.partition(":")
+    if not attr:
+        raise ValueError(f"Callable {target} must be given as module:function")
+    func: ToolFunction = getattr(importlib.import_module(module_name), attr)
+    return func
+
+
+def _to_result(value: Any) -> Dict[str, Any]:
+    """Wrap a function's return value as an MCP tool result."""
+    if isinstance(value, dict) and "content" in value:
+        return value
+    text = value if isinstance(value, str) else orjson.dumps(value).decode()
+    return {"content": [{"type": "text", "text": text}]}
+
+
+class PythonToolProvider:
+    """Serves tools/call for Python functions registered in the config."""
+
+    def __init__(self, name: str, functions: List[ToolFunction], executor: str = "loop", max_workers: Optional[int] = None):
+        """Register ``functions`` as tools run by ``executor`` ("loop", "thread" or "process")."""
+        if executor not in EXECUTORS:
+            raise ValueError(f"Unknown executor {executor} for {name}; expected one of {EXECUTORS}")
+        self.name = name
+        self.executor = executor
+        self.functions: Dict[str, ToolFunction] = {}
+        self.tools: List[Dict[str, Any]] = []
+        for func in functions:
+            definition = describe(func)
+            self.functions[definition["name"]] = func
+            self.tools.append(definition)
+        self._pool: Optional[Executor] = None
+        if executor == "thread":
+            self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix=f"tools-{name}")
+        elif executor == "process":
+            self._pool = ProcessPoolExecutor(max_workers)
+
+    @classmethod
+    def load(
+        cls,
+        name: str,
+        module: Optional[str] = None,
+        callables: Optional[List[str]] = None,
+        executor: str = "loop",
+        max_workers: Optional[int] = None
+    ) -> "PythonToolProvider":
+        """Import the functions named by a config entry."""
+        functions = list(getattr(importlib.import_module(module), "TOOLS")) if module else []
+        functions.extend(_resolve(target) for target in callables or [])
+        if not functions:
+            raise ValueError(f"No tools found for Python provider {name}")
+        return cls(name, functions, executor, max_workers)
+
+    async def call(self, tool_name: str, arguments: Dict[str, Any]) -> bytes:
+        """Run a tool and return its result as JSON bytes.
+
+        Exceptions raised by the tool are reported as an error result, as an
+        MCP server would.
+        """
+        func = self.functions.get(tool_name)
+        if func is None:
+            raise Exception(f"Unknown tool {tool_name} for provider {self.name}")
+        try:
+            if inspect.iscoroutinefunction(func):
+                value = await func(**arguments)
+            elif self._pool is None:
+                value = func(**arguments)
+            else:
+                loop = asyncio.get_running_loop()
+                value = await loop.run_in_executor(self._pool, functools.partial(func, **arguments))
+            result = _to_result(value)
+        except Exception as e:
+            logger.warning(f"Python tool {tool_name} on {self.name} failed: {str(e)}")
+            result = {"content": [{"type": "text", "text": str(e)}], "isError": True}
+        return orjson.dumps(result)
+
+    def shutdown(self) -> None:
+        """Stop the worker pool without waiting for running calls."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
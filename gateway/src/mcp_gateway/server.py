@@ -1,23 +1,43 @@
 """MCP Gateway Server.
 
 This module implements a gateway server that:
-1. Exposes an SSE endpoint for clients to connect
+1. Exposes HTTP endpoints for clients, including an SSE endpoint that
+   streams tool progress and results
 2. Reads MCP server configurations
 3. Forwards requests to appropriate MCP servers
 4. Aggregates responses back to clients
 """
 
 import asyncio
+import contextlib
+import functools
+import hashlib
+import itertools
 import json
 import os
 import logging
 import signal
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+import time
+from dataclasses import asdict, dataclass, field
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Any, Set, Tuple, Union
 
+import orjson
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from mcp.types import Tool
+from sse_starlette.sse import EventSourceResponse
+
+from mcp_gateway.admission import AdmissionQueue, ServerBusyError
+from mcp_gateway.cache import ToolResultCache, cache_key
+from mcp_gateway.catalog import CatalogStore, config_fingerprint
+from mcp_gateway.diagnostics import ProcessGroupUsage, StderrBuffer, process_group_usage
+from mcp_gateway.framing import READ_CHUNK_SIZE, MessageReader, MessageTooLargeError
+from mcp_gateway.jsonrpc import Message, is_error_result, parse_message
+from mcp_gateway.limits import SUPPORTED as LIMITS_SUPPORTED, ResourceLimits
+from mcp_gateway.metrics import Gauge, GatewayMetrics
+from mcp_gateway.plugins import PythonToolProvider
+from mcp_gateway.singleflight import SingleFlight
+from mcp_gateway.tracing import Span, Tracer
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -25,13 +45,115 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
+# Receives the params of each notifications/progress message for a request
+ProgressHandler = Callable[[Dict[str, Any]], None]
+
 
 @dataclass
 class MCPServerConfig:
-    """Configuration for an MCP server."""
-    command: str
-    args: List[str]
+    """Configuration for an MCP server.
+
+    A server is either a process started with ``command``, or in-process
+    Python tools registered with ``module`` and/or ``callables``.
+    """
+    command: str = ""
+    args: List[str] = field(default_factory=list)
     env: Dict[str, str] = field(default_factory=dict)
+    # Either a fixed replica count or {"min": n, "max": m}
+    replicas: Union[int, Dict[str, int]] = 1
+    # Seconds allowed for the initialize handshake, and how often to respawn
+    startup_timeout: float = 30.0
+    startup_retries: int = 2
+    # Seconds before respawning a crashed process, doubled for each crash or
+    # failed restart in a row up to restart_backoff_max
+    restart_backoff: float = 0.5
+    restart_backoff_max: float = 30.0
+    # Lazy servers start on their first tool call and stop after idle_timeout;
+    # replicas added under load are stopped after idle_timeout without calls
+    lazy: bool = False
+    idle_timeout: float = 300.0
+    # Read-only tools whose results may be cached: {tool: {"ttl": seconds}}
+    cache: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Read-only tools whose identical concurrent calls share one upstream call
+    coalesce: List[str] = field(default_factory=list)
+    # Most tool calls sent to the server at once, across all replicas, and
+    # most calls left waiting for a slot before new ones are turned away
+    max_concurrency: Optional[int] = None
+    max_queue: Optional[int] = None
+    # Seconds a queued call waits before its priority rises by one level
+    priority_aging: float = 5.0
+    # Seconds a tool call may take, by default and for specific tools
+    call_timeout: Optional[float] = 60.0
+    tool_timeouts: Dict[str, float] = field(default_factory=dict)
+    # Longest message accepted from the server; longer ones fail their request
+    max_message_bytes: int = 256 * 1024 * 1024
+    # Recent stderr lines kept per process, and most lines logged per second
+    stderr_lines: int = 200
+    stderr_log_rate: float = 10.0
+    # Limits on the server's processes, applied at spawn on Linux: the CPUs
+    # they may run on, their nice level, and each process's address space
+    # and open files. A replica whose resident memory, summed over its
+    # processes, exceeds max_rss_bytes is killed and restarted
+    cpu_affinity: List[int] = field(default_factory=list)
+    nice: Optional[int] = None
+    max_address_space_bytes: Optional[int] = None
+    max_rss_bytes: Optional[int] = None
+    max_open_files: Optional[int] = None
+    # In-process Python tools: a module with a TOOLS list and/or
+    # "module:function" references, run on the event loop or in a pool
+    module: Optional[str] = None
+    callables: List[str] = field(default_factory=list)
+    executor: str = "loop"
+    max_workers: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        """Validate the config."""
+        if not self.command and not self.is_python:
+            raise ValueError("Server config needs a command, module or callables")
+        # Reject invalid limits with the config rather than at spawn
+        self.limits.validate()
+
+    @property
+    def is_python(self) -> bool:
+        """Whether the server's tools are Python functions run in the gateway."""
+        return bool(self.module or self.callables)
+
+    @property
+    def longest_call_timeout(self) -> Optional[float]:
+        """Seconds the slowest tool call may take, or None if some have no limit."""
+        if self.call_timeout is None:
+            return None
+        return max([self.call_timeout, *self.tool_timeouts.values()])
+
+    @property
+    def limits(self) -> ResourceLimits:
+        """The resource limits for the server's processes."""
+        return ResourceLimits(
+            tuple(self.cpu_affinity),
+            self.nice,
+            self.max_address_space_bytes,
+            self.max_rss_bytes,
+            self.max_open_files
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        """Hash of the settings that determine the server's tools."""
+        return config_fingerprint(self.command, self.args, self.env)
+
+    @property
+    def min_replicas(self) -> int:
+        """Number of replicas started with the gateway."""
+        if isinstance(self.replicas, dict):
+            return max(1, int(self.replicas.get("min", 1)))
+        return max(1, int(self.replicas))
+
+    @property
+    def max_replicas(self) -> int:
+        """Upper bound on replicas started under load."""
+        if isinstance(self.replicas, dict):
+            return max(self.min_replicas, int(self.replicas.get("max", self.min_replicas)))
+        return self.min_replicas
 
 
 @dataclass
@@ -40,282 +162,1727 @@ class MCPServer:
     name: str
     config: MCPServerConfig
     process: asyncio.subprocess.Process
-    tools: List[Dict] = field(default_factory=list)
+    tools: List[Dict[str, Any]] = field(default_factory=list)
+    replica: int = 0
+    # In-flight requests keyed by JSON-RPC id, resolved by the reader task
+    pending: Dict[int, asyncio.Future[Message]] = field(default_factory=dict)
+    progress_handlers: Dict[int, ProgressHandler] = field(default_factory=dict)
+    request_ids: Iterator[int] = field(default_factory=lambda: itertools.count(1))
+    reader_task: Optional[asyncio.Task[None]] = None
+    stderr_task: Optional[asyncio.Task[None]] = None
+    exit_task: Optional[asyncio.Task[None]] = None
+    stderr: StderrBuffer = field(default_factory=StderrBuffer)
+    started_at: float = field(default_factory=time.monotonic)
+    startup_duration: Optional[float] = None
+    # When the replica was last picked for a request
+    last_used: float = field(default_factory=time.monotonic)
+    # Last sampled resource use, and the limits it had reached, for servers
+    # with limits
+    usage: Optional[ProcessGroupUsage] = None
+    limits_hit: Set[str] = field(default_factory=set)
+
+    @property
+    def alive(self) -> bool:
+        """Whether the process is running and its responses are being read."""
+        return (
+            self.process.returncode is None
+            and self.reader_task is not None
+            and not self.reader_task.done()
+        )
+
+
+@dataclass
+class MCPServerPool:
+    """All running replicas of one configured MCP server."""
+    name: str
+    config: MCPServerConfig
+    replicas: List[MCPServer] = field(default_factory=list)
+    tools: List[Dict[str, Any]] = field(default_factory=list)
+    # Replicas currently being spawned, and the tasks spawning them under load
+    starting: int = 0
+    scale_tasks: Set[asyncio.Task[None]] = field(default_factory=set)
+    status: str = "starting"
+    error: Optional[str] = None
+    last_used: float = field(default_factory=time.monotonic)
+    # Set once the pool's startup is over, whether or not it succeeded;
+    # calls to tools served from a snapshot wait for it
+    ready: asyncio.Event = field(default_factory=asyncio.Event)
+    # Shared by concurrent calls that wake a lazy pool
+    wake_task: Optional[asyncio.Task[MCPServer]] = None
+    reaper_task: Optional[asyncio.Task[None]] = None
+    # Respawns crashed replicas; runs only while the pool is short of them
+    supervisor_task: Optional[asyncio.Task[None]] = None
+    replica_ids: Iterator[int] = field(default_factory=itertools.count)
+    admission: Optional[AdmissionQueue] = None
+    # Set instead of replicas for in-process Python tools
+    provider: Optional[PythonToolProvider] = None
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    # Calls routed to this pool that have not finished, including queued ones
+    in_flight: int = 0
+    # Replicas respawned after a crash, and crashes or failed restarts in a
+    # row, which set the restart backoff
+    restarts: int = 0
+    crash_streak: int = 0
+    # When a crash left the pool with no running replica, and the seconds
+    # spent that way before
+    down_since: Optional[float] = None
+    downtime: float = 0.0
+    # Times a replica reached each resource limit
+    limit_breaches: Dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self) -> None:
+        """Create the admission queue when the server's concurrency is limited."""
+        if self.config.max_concurrency:
+            self.admission = AdmissionQueue(
+                self.name, self.config.max_concurrency, self.config.max_queue, self.config.priority_aging
+            )
+
+    def pick_replica(self) -> MCPServer:
+        """Pick the live replica with the fewest outstanding requests."""
+        live = [replica for replica in self.replicas if replica.alive]
+        if not live:
+            raise Exception(f"No running replicas for server {self.name}")
+        return min(live, key=lambda replica: len(replica.pending))
+
+    def total_downtime(self) -> float:
+        """Seconds the pool has had no running replica after a crash."""
+        if self.down_since is None:
+            return self.downtime
+        return self.downtime + time.monotonic() - self.down_since
+
+
+@dataclass(frozen=True)
+class ToolRoute:
+    """Where a tool name exposed by the gateway is dispatched to."""
+    server: str
+    tool: str
+    # Seconds to cache results for, or None if the tool is not cached
+    cache_ttl: Optional[float] = None
+    # Seconds a call may take, or None for no limit
+    timeout: Optional[float] = None
+    # Whether identical concurrent calls share one upstream call
+    coalesce: bool = False
+
+
+class ToolNotFoundError(ValueError):
+    """Raised when no server provides the requested tool."""
+
+
+class ToolsPendingError(ToolNotFoundError):
+    """Raised for an unknown tool while servers that may provide it are starting."""
+
+    def __init__(self, message: str, retry_after: int):
+        """Create the error; ``retry_after`` is a hint in seconds for the client."""
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ToolTimeoutError(TimeoutError):
+    """Raised when a tool call misses its deadline."""
+
+
+# Sent in the initialize handshake
+PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "mcp-gateway", "version": "0.1.0"}
+# Joins a server and tool name for namespaced tools; model APIs only accept
+# tool names of letters, digits, underscores and dashes
+NAMESPACE_SEPARATOR = "__"
+# Seconds a client should wait before retrying a tool that may belong to a
+# server still starting
+STARTUP_RETRY_AFTER = 1
+# Seconds a crashed server's remaining output is read before its requests fail
+EXIT_GRACE = 0.5
+# How often to check for a process exit where pidfds are unavailable
+EXIT_POLL_INTERVAL = 0.1
+# Seconds a retired pool waits past its calls' deadlines before it is stopped
+DRAIN_GRACE = 1.0
+# How often servers' resource use is compared with their limits, and the
+# share of an address-space or open-file limit that counts as reaching it
+LIMIT_CHECK_INTERVAL = 1.0
+LIMIT_HIT_RATIO = 0.95
 
 
 def get_schema(tool: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Get the input schema from a tool definition, handling both naming conventions."""
     # Try both input_schema and inputSchema
     schema = tool.get("input_schema") or tool.get("inputSchema")
-    if schema:
-        logger.info(f"Found schema for tool {tool['name']}: {json.dumps(schema, indent=2)}")
-    else:
-        logger.info(f"No schema found for tool {tool['name']}")
+    if not schema:
+        logger.debug(f"No schema found for tool {tool['name']}")
     return schema
 
 
+async def _process_exit(process: asyncio.subprocess.Process) -> int:
+    """Wait for a process to exit and return its exit code.
+
+    Unlike ``Process.wait``, this does not also wait for the process's pipes
+    to close, which they don't while anything it started is still running.
+    """
+    try:
+        fd = os.pidfd_open(process.pid)
+    except (AttributeError, OSError):
+        # Not Linux, or already exited and reaped
+        fd = None
+    if fd is not None:
+        loop = asyncio.get_running_loop()
+        exited: asyncio.Future[None] = loop.create_future()
+
+        def on_exit() -> None:
+            if not exited.done():
+                exited.set_result(None)
+        loop.add_reader(fd, on_exit)
+        try:
+            await exited
+        finally:
+            loop.remove_reader(fd)
+            os.close(fd)
+    # The event loop's child watcher records the exit code once it reaps it
+    while process.returncode is None:
+        await asyncio.sleep(0.01 if fd is not None else EXIT_POLL_INTERVAL)
+    return process.returncode
+
+
 class Gateway:
     """MCP Gateway that manages server connections and forwards requests."""
     
-    def __init__(self):
-        self.servers: Dict[str, MCPServer] = {}
+    def __init__(
+        self,
+        catalog_dir: Optional[str] = None,
+        cache_max_bytes: int = 64 * 1024 * 1024,
+        trace_file: Optional[str] = None
+    ):
+        self.servers: Dict[str, MCPServerPool] = {}
+        self.cache = ToolResultCache(cache_max_bytes)
+        # Tool catalog snapshots are only persisted when a directory is given
+        self.snapshots = CatalogStore(catalog_dir) if catalog_dir else None
+        # Exposed tool name -> server and upstream tool name
+        self.routes: Dict[str, ToolRoute] = {}
+        # Bumped whenever the set of tools changes
+        self.catalog_version = 0
+        self._catalog: Optional[Tuple[str, bytes]] = None
+        # Servers being started whose tools are not known yet; the catalog is
+        # incomplete until they are
+        self.pending: Set[str] = set()
+        self.metrics = GatewayMetrics()
+        self._register_gauges()
+        # Spans are only exported when a trace file is given
+        self.tracer = Tracer(trace_file)
+        # Upstream calls of coalesced tools in flight, keyed like the cache
+        self.flights = SingleFlight()
+        self._reload_lock = asyncio.Lock()
+        # Pools retired by a reload, stopped once their calls finish
+        self._drain_tasks: Set[asyncio.Task[None]] = set()
+        # Started with the first server that has resource limits
+        self._limits_task: Optional[asyncio.Task[None]] = None
+
+    def _register_gauges(self) -> None:
+        """Add the metrics read from server state at scrape time."""
+        def per_pool(value: Callable[[MCPServerPool], float]) -> Callable[[], Dict[Tuple[str, ...], float]]:
+            return lambda: {(pool.name,): value(pool) for pool in self.servers.values()}
+
+        self.metrics.register(Gauge(
+            "mcp_gateway_in_flight_requests",
+            "Requests sent to a server and awaiting a response.",
+            ("server",),
+            per_pool(lambda pool: sum(len(server.pending) for server in pool.replicas))
+        ))
+        self.metrics.register(Gauge(
+            "mcp_gateway_queue_depth",
+            "Tool calls waiting for a concurrency slot.",
+            ("server",),
+            per_pool(lambda pool: pool.admission.depth if pool.admission else 0)
+        ))
+        self.metrics.register(Gauge(
+            "mcp_gateway_replicas",
+            "Running server processes.",
+            ("server",),
+            per_pool(lambda pool: sum(1 for server in pool.replicas if server.alive))
+        ))
+        self.metrics.register(Gauge(
+            "mcp_gateway_server_downtime_seconds",
+            "Time a server has had no running replica after a crash.",
+            ("server",),
+            per_pool(lambda pool: pool.total_downtime())
+        ))
+
+    def _rebuild_routes(self) -> None:
+        """Rebuild the tool routing table from the running servers.
+
+        Every tool is routable as ``server__tool``. Tools whose name is unique
+        across servers are also routable by their bare name; colliding names
+        are only exposed in namespaced form.
+        """
+        providers: Dict[str, List[ToolRoute]] = {}
+        for pool in self.servers.values():
+            for tool in pool.tools:
+                route = ToolRoute(
+                    pool.name,
+                    tool["name"],
+                    cache_ttl=self._cache_ttl(pool, tool),
+                    timeout=pool.config.tool_timeouts.get(tool["name"], pool.config.call_timeout),
+                    coalesce=tool["name"] in pool.config.coalesce and self._read_only(pool, tool, "coalescing")
+                )
+                providers.setdefault(tool["name"], []).append(route)
+
+        routes: Dict[str, ToolRoute] = {}
+        for tool_name, tool_routes in providers.items():
+            if len(tool_routes) > 1:
+                servers = [route.server for route in tool_routes]
+                logger.warning(f"Tool {tool_name} is provided by {servers}; use server{NAMESPACE_SEPARATOR}tool to call it")
+            else:
+                routes[tool_name] = tool_routes[0]
+            for route in tool_routes:
+                routes[f"{route.server}{NAMESPACE_SEPARATOR}{tool_name}"] = route
+
+        # Swap in the new table in one assignment
+        self.routes = routes
+        self.catalog_version += 1
+        self._catalog = None
+
+    def _tools_listed(self, name: str) -> None:
+        """Stop listing a server as pending once its tools are known."""
+        if name in self.pending:
+            self.pending.discard(name)
+            self.catalog_version += 1
+            self._catalog = None
+
+    def _cache_ttl(self, pool: MCPServerPool, tool: Dict[str, Any]) -> Optional[float]:
+        """Get the cache TTL configured for a tool, unless it may have side effects."""
+        policy = pool.config.cache.get(tool["name"])
+        if not policy or not self._read_only(pool, tool, "caching"):
+            return None
+        return float(policy.get("ttl", 60))
+
+    def _read_only(self, pool: MCPServerPool, tool: Dict[str, Any], feature: str) -> bool:
+        """Check that the server doesn't mark a tool as mutating before sharing its results."""
+        annotations = tool.get("annotations") or {}
+        if annotations.get("readOnlyHint") is False or annotations.get("destructiveHint"):
+            logger.warning(f"Not {feature} {pool.name}.{tool['name']}: the server marks it as mutating")
+            return False
+        return True
+
+    def _exposed_name(self, server: str, tool_name: str) -> str:
+        """Name under which a server's tool is listed in the catalog."""
+        route = self.routes.get(tool_name)
+        if route and route.server == server and route.tool == tool_name:
+            return tool_name
+        return f"{server}{NAMESPACE_SEPARATOR}{tool_name}"
         
-    async def _communicate_with_server(self, server: MCPServer, method: str, params: dict = None) -> Any:
-        """Send a request to a server and get the response."""
+    async def _communicate_with_server(
+        self,
+        server: MCPServer,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        progress: Optional[ProgressHandler] = None,
+        raw: bool = False,
+        trace: Union[Span, str, None] = None
+    ) -> Any:
+        """Send a request to a server and get the response.
+
+        Each request gets its own JSON-RPC id, so any number of requests can be
+        in flight on one server; the reader task matches responses back by id.
+        If a progress handler is given, the request id is also sent as the MCP
+        progress token and the server's progress notifications are passed on.
+        With raw set, the result is returned as the JSON bytes the server sent.
+        A trace parent (span or traceparent header) gets a child span for the
+        round trip, which is passed to the server in ``_meta.traceparent``.
+        """
         if not server.process.stdin or not server.process.stdout:
             raise Exception("Server process pipes not available")
-            
+        if server.reader_task is None or server.reader_task.done():
+            raise Exception(f"Server {server.name} is not reading responses")
+
+        request_id = next(server.request_ids)
+        sent = False
+        future = asyncio.get_running_loop().create_future()
+        server.pending[request_id] = future
+        meta: Dict[str, Any] = {}
+        if progress:
+            meta["progressToken"] = request_id
+            server.progress_handlers[request_id] = progress
+        span = None
+        if trace is not None:
+            span = self.tracer.start(
+                "server_request", trace,
+                **{"mcp.server": server.name, "mcp.replica": server.replica, "mcp.method": method}
+            )
+            # Without our own span, pass the caller's context through unchanged
+            meta["traceparent"] = span.traceparent if span else trace
+        if meta:
+            params = {**(params or {}), "_meta": meta}
+        error: Optional[str] = None
         try:
             # Prepare request
             request = {
                 "jsonrpc": "2.0",
                 "method": method,
                 "params": params or {},
-                "id": 1
+                "id": request_id
             }
-            request_str = json.dumps(request) + "\n"
-            logger.info(f"Sending request to {server.name}: {request_str.strip()}")
+            logger.info(f"Sending {method} request {request_id} to {server.name}")
             
             # Send request
-            server.process.stdin.write(request_str.encode())
+            server.process.stdin.write(orjson.dumps(request) + b"\n")
+            sent = True
             await server.process.stdin.drain()
             
-            # Read response
-            response_line = await server.process.stdout.readline()
-            if not response_line:
-                raise Exception("Empty response")
-                
-            response_str = response_line.decode().strip()
-            logger.info(f"Received response from {server.name}: {response_str}")
-            
-            response = json.loads(response_str)
-            if "error" in response:
-                raise Exception(response["error"])
-                
-            return response.get("result")
+            # Wait for the reader task to deliver the matching response
+            response: Message = await future
+            if response.error is not None:
+                raise Exception(response.error)
+            if raw or response.result is None:
+                return response.result
+            return orjson.loads(response.result)
             
+        except asyncio.CancelledError:
+            # The caller gave up (e.g. deadline or disconnect); tell the server
+            error = "cancelled"
+            if sent:
+                self._send_cancelled(server, request_id)
+            raise
         except Exception as e:
+            error = str(e)
             logger.error(f"Error communicating with {server.name}: {str(e)}")
             raise
+        finally:
+            server.pending.pop(request_id, None)
+            server.progress_handlers.pop(request_id, None)
+            self.tracer.end(span, error)
+
+    async def _read_responses(self, server: MCPServer) -> None:
+        """Read server's stdout and resolve pending requests by JSON-RPC id."""
+        error = Exception(f"Server {server.name} closed its stdout")
+        # Always set, as servers are spawned with pipes
+        assert server.process.stdout is not None
+        messages = MessageReader(server.process.stdout, server.config.max_message_bytes)
+        try:
+            while True:
+                try:
+                    message = await messages.read_message()
+                except MessageTooLargeError as e:
+                    logger.error(f"Dropping oversized message from {server.name}: {str(e)}")
+                    future = server.pending.get(e.request_id)
+                    if future is not None and not future.done():
+                        future.set_exception(e)
+                    continue
+                if message is None:
+                    break
+
+                if not message.strip():
+                    continue
+                logger.info(f"Received {len(message)} byte message from {server.name}")
+
+                try:
+                    response = parse_message(message)
+                except ValueError:
+                    logger.warning(f"Ignoring non-JSON output from {server.name}")
+                    continue
+
+                # Server-initiated requests and notifications carry a method
+                if response.method is not None:
+                    if response.method == "notifications/progress":
+                        self._dispatch_progress(server, response.params or {})
+                    continue
+
+                future = server.pending.get(response.id)
+                if future is None:
+                    logger.warning(f"Dropping response with unknown id from {server.name}: {response.id}")
+                elif not future.done():
+                    future.set_result(response)
+        except Exception as e:
+            logger.error(f"Error reading responses from {server.name}: {str(e)}")
+            error = e
+        finally:
+            # Nothing else will answer these requests, so fail them now
+            for future in server.pending.values():
+                if not future.done():
+                    future.set_exception(error)
         
-    async def start_server(self, name: str, config: MCPServerConfig) -> MCPServer:
-        """Start an MCP server and initialize its client session."""
+    def _send_cancelled(self, server: MCPServer, request_id: int) -> None:
+        """Tell a server to stop working on a request nobody is waiting for."""
+        stdin = server.process.stdin
+        if not server.alive or stdin is None or stdin.is_closing():
+            return
+        notification = {
+            "jsonrpc": "2.0",
+            "method": "notifications/cancelled",
+            "params": {"requestId": request_id, "reason": "Request cancelled by gateway"}
+        }
+        stdin.write(orjson.dumps(notification) + b"\n")
+
+    def _dispatch_progress(self, server: MCPServer, params: Dict[str, Any]) -> None:
+        """Pass a progress notification to the request that asked for it."""
+        token = params.get("progressToken")
+        handler = server.progress_handlers.get(token) if isinstance(token, int) else None
+        if handler is None:
+            return
         try:
-            logger.info(f"Starting MCP server: {name}")
-            logger.info(f"Server config: command={config.command}, args={config.args}")
-            
-            # Construct command
-            cmd = f"{config.command} {' '.join(config.args)}"
-            logger.info(f"Running command: {cmd}")
-            
-            # Get current environment and update with server-specific env vars
-            env = os.environ.copy()
-            env.update(config.env)
-            
-            # Start the server process in the background
-            process = await asyncio.create_subprocess_shell(
-                cmd,
-                stdin=asyncio.subprocess.PIPE,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                env=env,
-                preexec_fn=os.setsid  # Create new process group
+            handler(params)
+        except Exception as e:
+            logger.error(f"Error handling progress from {server.name}: {str(e)}")
+
+    async def start_server(self, name: str, config: MCPServerConfig) -> MCPServerPool:
+        """Start the configured number of replicas of an MCP server.
+
+        The pool is registered right away and its tools become routable as
+        soon as the first replica is ready, so other servers are not held up.
+        """
+        pool = MCPServerPool(name=name, config=config)
+        self.servers[name] = pool
+        return await self._start_pool(pool)
+
+    async def _start_pool(self, pool: MCPServerPool) -> MCPServerPool:
+        """Start a pool's replicas, or load its Python tools.
+
+        A server's tools are served from its catalog snapshot, if one was
+        saved for the same config, while its processes start; calls to them
+        wait until the first replica is ready. If the server then reports a
+        different tool set, the routes and snapshot are updated.
+
+        Routes are rebuilt as tools arrive only if the pool is registered in
+        ``servers``; a reload starts new pools before swapping them in.
+        """
+        name = pool.name
+        config = pool.config
+        try:
+            if config.is_python:
+                return self._start_provider(pool)
+
+            tools = self.snapshots.load(name, config.fingerprint) if self.snapshots else None
+            if tools is not None:
+                pool.tools = tools
+                if self.servers.get(name) is pool:
+                    self._rebuild_routes()
+                self._tools_listed(name)
+
+            if config.lazy or config.max_replicas > config.min_replicas:
+                pool.reaper_task = asyncio.create_task(self._reap_idle(pool))
+            if config.lazy:
+                if tools is not None:
+                    logger.info(f"Server {name} is lazy; serving {len(tools)} tools from snapshot")
+                    pool.status = "idle"
+                    return pool
+                # Without a snapshot, start it once to learn its tools
+            elif tools is not None:
+                logger.info(f"Serving {len(tools)} tools of {name} from snapshot while it starts")
+
+            logger.info(f"Starting MCP server: {name} ({config.min_replicas} replica(s))")
+            results = await asyncio.gather(
+                *(self._start_replica(pool) for _ in range(config.min_replicas)),
+                return_exceptions=True
             )
-            
-            # Create server object
-            server = MCPServer(
-                name=name,
-                config=config,
-                process=process
+            if not pool.replicas:
+                error = next(r for r in results if isinstance(r, BaseException))
+                pool.status = "failed"
+                pool.error = str(error)
+                if pool.tools and not config.lazy:
+                    # Stop listing snapshot tools that nothing can serve
+                    pool.tools = []
+                    if self.servers.get(name) is pool:
+                        self._rebuild_routes()
+                raise error
+
+            pool.status = "ready"
+            return pool
+        finally:
+            pool.ready.set()
+            self._tools_listed(name)
+
+    def _start_provider(self, pool: MCPServerPool) -> MCPServerPool:
+        """Load a pool's in-process Python tools and make them routable."""
+        config = pool.config
+        try:
+            pool.provider = PythonToolProvider.load(
+                pool.name, config.module, config.callables, config.executor, config.max_workers
             )
-            
-            # Wait a bit for server to initialize
-            await asyncio.sleep(2)
-            
-            # Query available tools
+        except Exception as e:
+            pool.status = "failed"
+            pool.error = str(e)
+            raise
+        logger.info(
+            f"Loaded Python tools for {pool.name} ({config.executor}): "
+            f"{[t['name'] for t in pool.provider.tools]}"
+        )
+        pool.tools = pool.provider.tools
+        pool.status = "ready"
+        if self.servers.get(pool.name) is pool:
+            self._rebuild_routes()
+        return pool
+
+    async def _spawn_process(self, pool: MCPServerPool, replica: int) -> MCPServer:
+        """Spawn a server process and start reading its output."""
+        config = pool.config
+        logger.info(f"Starting replica {replica} of MCP server: {pool.name}")
+        logger.info(f"Server config: command={config.command}, args={config.args}")
+        
+        # Construct command
+        cmd = f"{config.command} {' '.join(config.args)}"
+        logger.info(f"Running command: {cmd}")
+        
+        # Get current environment and update with server-specific env vars
+        env = os.environ.copy()
+        env.update(config.env)
+
+        limits = config.limits
+        if limits.configured and not LIMITS_SUPPORTED:
+            logger.warning(f"Resource limits for {pool.name} are only applied on Linux")
+        limited = limits.configured and LIMITS_SUPPORTED
+        
+        # Start the server process in the background
+        process = await asyncio.create_subprocess_shell(
+            cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+            limit=READ_CHUNK_SIZE,
+            # Create new process group
+            start_new_session=True
+        )
+        if limited:
             try:
-                logger.info(f"Querying tools from {name}")
-                result = await self._communicate_with_server(server, "tools/list")
-                server.tools = result.get("tools", [])
-                logger.info(f"Server {name} tools response: {json.dumps(result, indent=2)}")
-                logger.info(f"Server {name} provides tools: {[t['name'] for t in server.tools]}")
-                for tool in server.tools:
-                    logger.info(f"Tool details for {tool['name']}:")
-                    logger.info(f"  Description: {tool.get('description', 'No description')}")
-                    schema = get_schema(tool)
-                    if schema:
-                        logger.info(f"  Schema: {json.dumps(schema, indent=2)}")
+                limits.apply(process.pid)
+            except OSError as e:
+                with contextlib.suppress(ProcessLookupError):
+                    os.killpg(process.pid, signal.SIGKILL)
+                await process.wait()
+                raise Exception(f"Could not apply resource limits to {pool.name}: {str(e)}")
+        
+        # Create server object
+        server = MCPServer(
+            name=pool.name,
+            config=config,
+            process=process,
+            replica=replica,
+            stderr=StderrBuffer(config.stderr_lines, config.stderr_log_rate)
+        )
+        server.reader_task = asyncio.create_task(self._read_responses(server))
+        
+        # Start monitoring stderr in background
+        server.stderr_task = asyncio.create_task(self._monitor_stderr(server))
+        server.exit_task = asyncio.create_task(self._watch_exit(pool, server))
+        if limits.configured and self._limits_task is None:
+            self._limits_task = asyncio.create_task(self._watch_limits())
+        return server
+
+    async def _notify(self, server: MCPServer, method: str, params: Optional[Dict[str, Any]] = None) -> None:
+        """Send a JSON-RPC notification, which gets no response."""
+        stdin = server.process.stdin
+        if stdin is None:
+            raise Exception("Server process pipes not available")
+        notification: Dict[str, Any] = {"jsonrpc": "2.0", "method": method}
+        if params:
+            notification["params"] = params
+        stdin.write(orjson.dumps(notification) + b"\n")
+        await stdin.drain()
+
+    async def _handshake(self, server: MCPServer) -> None:
+        """Run the MCP initialize handshake and fetch the server's tools."""
+        await self._communicate_with_server(server, "initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": CLIENT_INFO
+        })
+        await self._notify(server, "notifications/initialized")
+        result = await self._communicate_with_server(server, "tools/list")
+        server.tools = result.get("tools", [])
+
+    async def _start_replica(self, pool: MCPServerPool) -> MCPServer:
+        """Start one process for a server pool and wait until it is ready.
+
+        The process is respawned if the handshake fails or misses the
+        configured startup deadline.
+        """
+        name = pool.name
+        config = pool.config
+        replica = next(pool.replica_ids)
+        attempts = config.startup_retries + 1
+        for attempt in range(1, attempts + 1):
+            try:
+                server = await self._spawn_process(pool, replica)
             except Exception as e:
-                logger.error(f"Error querying tools from {name}: {str(e)}")
-                server.tools = []
-            
-            self.servers[name] = server
-            
-            # Start monitoring stderr in background
-            asyncio.create_task(self._monitor_stderr(server))
-            
+                logger.error(f"Error starting server {name}: {str(e)}")
+                raise
+
+            try:
+                await asyncio.wait_for(self._handshake(server), timeout=config.startup_timeout)
+            except asyncio.CancelledError:
+                await self._stop_process(server)
+                raise
+            except Exception as e:
+                reason = "timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+                logger.warning(f"Server {name} replica {replica} not ready (attempt {attempt}/{attempts}): {reason}")
+                await self._stop_process(server)
+                if attempt < attempts:
+                    self.metrics.restarts.inc(name)
+                continue
+
+            if pool.status == "stopped":
+                # The pool was retired by a reload while this replica started
+                await self._stop_process(server)
+                raise Exception(f"Server {name} was stopped while starting")
+
+            server.startup_duration = time.monotonic() - server.started_at
+            self.metrics.startup_duration.observe(server.startup_duration, name)
+            logger.info(
+                f"Server {name} replica {replica} ready in {server.startup_duration:.2f}s "
+                f"with tools: {[t['name'] for t in server.tools]}"
+            )
+            pool.replicas.append(server)
+            pool.ready.set()
+            if server.tools != pool.tools:
+                if pool.tools:
+                    logger.info(f"Server {name} reports different tools than its snapshot; updating routes")
+                pool.tools = server.tools
+                if self.snapshots:
+                    self.snapshots.save(name, config.fingerprint, server.tools)
+                if self.servers.get(name) is pool:
+                    self._rebuild_routes()
+            self._tools_listed(name)
             return server
-            
+        raise Exception(f"Server {name} failed to start after {attempts} attempt(s): {reason}")
+
+    async def _scale_up(self, pool: MCPServerPool) -> None:
+        """Add a replica to a pool in the background."""
+        try:
+            await self._start_replica(pool)
+        except Exception as e:
+            logger.error(f"Error adding replica to {pool.name}: {str(e)}")
+        finally:
+            pool.starting -= 1
+
+    async def _wake(self, pool: MCPServerPool) -> None:
+        """Start a stopped lazy pool, sharing the start among concurrent callers."""
+        if pool.wake_task is None or pool.wake_task.done():
+            logger.info(f"Waking lazy server {pool.name}")
+            pool.status = "starting"
+            pool.wake_task = asyncio.create_task(self._start_replica(pool))
+        try:
+            await asyncio.shield(pool.wake_task)
         except Exception as e:
-            logger.error(f"Error starting server {name}: {str(e)}")
+            pool.status = "failed"
+            pool.error = str(e)
             raise
+        pool.status = "ready"
+
+    async def _reap_idle(self, pool: MCPServerPool) -> None:
+        """Stop processes that have been idle for the pool's idle_timeout.
+
+        A lazy pool's processes are all stopped once the pool is idle. Other
+        pools shrink back to min_replicas as replicas added under load go
+        without calls, least recently used first.
+        """
+        interval = max(0.05, min(pool.config.idle_timeout / 2, 30.0))
+        while True:
+            await asyncio.sleep(interval)
+            if not pool.config.lazy:
+                await self._retire_idle_replicas(pool)
+                continue
+            if not pool.replicas or any(server.pending for server in pool.replicas):
+                continue
+            if time.monotonic() - pool.last_used < pool.config.idle_timeout:
+                continue
+            if pool.wake_task and not pool.wake_task.done():
+                continue
+
+            logger.info(f"Stopping idle lazy server {pool.name}")
+            replicas, pool.replicas = pool.replicas, []
+            pool.status = "idle"
+            for server in replicas:
+                await self._stop_process(server)
+
+    async def _retire_idle_replicas(self, pool: MCPServerPool) -> None:
+        """Stop replicas beyond min_replicas that have gone idle_timeout without calls."""
+        now = time.monotonic()
+        idle = sorted(
+            (
+                server for server in pool.replicas
+                if not server.pending and now - server.last_used >= pool.config.idle_timeout
+            ),
+            key=lambda server: server.last_used
+        )
+        surplus = len(pool.replicas) - pool.config.min_replicas
+        retired = idle[:max(surplus, 0)]
+        for server in retired:
+            # Removed first, so no new request is routed to it
+            pool.replicas.remove(server)
+        for server in retired:
+            logger.info(f"Stopping idle replica {server.replica} of server {pool.name}")
+            await self._stop_process(server)
+
+    async def _watch_exit(self, pool: MCPServerPool, server: MCPServer) -> None:
+        """Notice a replica's process exiting, and have it respawned if it crashed.
+
+        Requests in flight on the replica fail as soon as it exits rather than
+        waiting out their timeouts. Lazy pools are left to start again on
+        their next call.
+        """
+        returncode = await _process_exit(server.process)
+        if server not in pool.replicas:
+            # Stopped by the gateway, or exited before it finished starting
+            return
+        message = f"Server {pool.name} replica {server.replica} exited with code {returncode}"
+        logger.error(message)
+        self.metrics.crashes.inc(pool.name)
+        pool.replicas.remove(server)
+
+        # Stop anything it left running in its process group, which may be
+        # holding its pipes open, and let the reader pass on responses
+        # written before the exit
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(server.process.pid, signal.SIGTERM)
+        reader = server.reader_task
+        if reader is not None:
+            await asyncio.wait({reader}, timeout=EXIT_GRACE)
+        error = Exception(message)
+        for future in server.pending.values():
+            if not future.done():
+                future.set_exception(error)
+        if reader is not None:
+            reader.cancel()
+
+        if time.monotonic() - server.started_at >= pool.config.restart_backoff_max:
+            # It ran long enough that this is not part of a crash loop
+            pool.crash_streak = 0
+        if pool.status in ("draining", "stopped"):
+            return
+        running = any(replica.alive for replica in pool.replicas)
+        if pool.config.lazy:
+            if not running:
+                pool.status = "idle"
+            return
+        if not running and pool.down_since is None:
+            pool.down_since = time.monotonic()
+            pool.status = "restarting"
+        if pool.supervisor_task is None or pool.supervisor_task.done():
+            pool.supervisor_task = asyncio.create_task(self._supervise(pool))
+
+    async def _supervise(self, pool: MCPServerPool) -> None:
+        """Respawn a pool's crashed replicas until it has its minimum again.
+
+        Each respawn waits ``restart_backoff`` seconds, doubled for every
+        crash or failed restart in a row, up to ``restart_backoff_max``. A
+        respawned server's tools replace the pool's if they changed.
+        """
+        config = pool.config
+        while pool.status not in ("draining", "stopped"):
+            if sum(1 for server in pool.replicas if server.alive) >= config.min_replicas:
+                return
+            delay = min(config.restart_backoff * 2 ** min(pool.crash_streak, 32), config.restart_backoff_max)
+            pool.crash_streak += 1
+            logger.info(f"Restarting server {pool.name} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+            self.metrics.restarts.inc(pool.name)
+            try:
+                await self._start_replica(pool)
+            except Exception as e:
+                logger.error(f"Error restarting server {pool.name}: {str(e)}")
+                pool.error = str(e)
+                continue
+            pool.restarts += 1
+            if pool.down_since is not None:
+                pool.downtime += time.monotonic() - pool.down_since
+                pool.down_since = None
+                pool.status = "ready"
+
+    async def _watch_limits(self) -> None:
+        """Sample the resource use of servers with limits.
+
+        The /proc scan runs in a thread so it doesn't hold up the event loop.
+        """
+        while True:
+            await asyncio.sleep(LIMIT_CHECK_INTERVAL)
+            replicas = {
+                server.process.pid: (pool, server)
+                for pool in self.servers.values() if pool.config.limits.configured
+                for server in pool.replicas if server.alive
+            }
+            if not replicas:
+                continue
+            usage = await asyncio.to_thread(process_group_usage, set(replicas))
+            if usage is None:
+                continue
+            for pid, (pool, server) in replicas.items():
+                if pid in usage:
+                    self._check_limits(pool, server, usage[pid])
+
+    def _check_limits(self, pool: MCPServerPool, server: MCPServer, usage: ProcessGroupUsage) -> None:
+        """Record a replica's resource use, and kill it if it is over its memory cap.
+
+        Past an address-space or open-file limit the server's own allocations
+        or opens fail, so reaching one is counted and logged. A replica over
+        ``max_rss_bytes`` is killed, and restarted like any crashed replica.
+        """
+        limits = pool.config.limits
+        server.usage = usage
+        hit = set()
+        if limits.max_rss_bytes and usage.rss_bytes > limits.max_rss_bytes:
+            hit.add("rss")
+        if limits.max_address_space_bytes and usage.max_vm_bytes >= limits.max_address_space_bytes * LIMIT_HIT_RATIO:
+            hit.add("address_space")
+        if limits.max_open_files and usage.max_open_files >= limits.max_open_files * LIMIT_HIT_RATIO:
+            hit.add("open_files")
+
+        # Count each limit once per time it is reached
+        for limit in sorted(hit - server.limits_hit):
+            pool.limit_breaches[limit] = pool.limit_breaches.get(limit, 0) + 1
+            self.metrics.limit_breaches.inc(pool.name, limit)
+            logger.warning(f"Server {pool.name} replica {server.replica} reached its {limit} limit: {usage}")
+        server.limits_hit = hit
+
+        if "rss" in hit:
+            logger.error(
+                f"Killing server {pool.name} replica {server.replica}: {usage.rss_bytes} bytes resident, "
+                f"over its max_rss_bytes of {limits.max_rss_bytes}"
+            )
+            with contextlib.suppress(ProcessLookupError):
+                os.killpg(server.process.pid, signal.SIGKILL)
+
+    async def _get_replica(self, pool: MCPServerPool) -> MCPServer:
+        """Get a replica for a request, starting a lazy pool if needed."""
+        pool.last_used = time.monotonic()
+        if not pool.ready.is_set():
+            # Routed from a snapshot before the pool finished starting
+            await pool.ready.wait()
+        if pool.config.lazy and not any(server.alive for server in pool.replicas):
+            await self._wake(pool)
+        return self._pick_replica(pool)
+
+    def _pick_replica(self, pool: MCPServerPool) -> MCPServer:
+        """Pick a replica for a request, growing the pool if all are busy."""
+        replica = pool.pick_replica()
+        replica.last_used = time.monotonic()
+        if replica.pending and len(pool.replicas) + pool.starting < pool.config.max_replicas:
+            pool.starting += 1
+            task = asyncio.create_task(self._scale_up(pool))
+            pool.scale_tasks.add(task)
+            task.add_done_callback(pool.scale_tasks.discard)
+        return replica
     
-    async def _monitor_stderr(self, server: MCPServer):
-        """Monitor server's stderr output."""
+    async def _monitor_stderr(self, server: MCPServer) -> None:
+        """Buffer a server's stderr output, logging it at a limited rate."""
+        stream = server.process.stderr
+        if stream is None:
+            return
         while True:
-            if server.process.stderr:
-                try:
-                    line = await server.process.stderr.readline()
-                    if line:
-                        logger.info(f"[{server.name}] {line.decode().strip()}")
-                    else:
-                        break
-                except Exception as e:
-                    logger.error(f"Error reading stderr from {server.name}: {str(e)}")
-                    break
+            try:
+                line = await stream.readline()
+            except ValueError:
+                # A line longer than the read limit; the stream skips past it
+                server.stderr.append("<line too long>")
+                continue
+            except Exception as e:
+                logger.error(f"Error reading stderr from {server.name}: {str(e)}")
+                return
+            if not line:
+                return
+            text = line.decode(errors="replace").rstrip()
+            if server.stderr.append(text):
+                held_back = server.stderr.take_unreported()
+                if held_back:
+                    logger.info(f"[{server.name}] {held_back} stderr line(s) not logged; see diagnostics")
+                logger.info(f"[{server.name}] {text}")
     
-    async def start_all_servers(self, config_path: str) -> None:
-        """Start all configured MCP servers."""
+    def load_config(self, config_path: str) -> Dict[str, MCPServerConfig]:
+        """Read server configurations from a config file."""
+        logger.info(f"Loading config from: {config_path}")
+        with open(config_path) as f:
+            config = json.load(f)
+        
+        if not config.get('mcp', {}).get('servers'):
+            raise ValueError("No MCP servers configured in config file")
+        
+        return {
+            name: MCPServerConfig(**server_config)
+            for name, server_config in config['mcp']['servers'].items()
+        }
+
+    async def start_servers(self, configs: Dict[str, MCPServerConfig]) -> None:
+        """Start servers in parallel; each is usable as soon as it is ready.
+
+        Until a server's tools are known, from its snapshot or its first
+        replica, it is listed as pending in the catalog.
+        """
+        started = time.monotonic()
+        self.pending.update(configs)
+        self.catalog_version += 1
+        self._catalog = None
+        results = await asyncio.gather(
+            *(self.start_server(name, config) for name, config in configs.items()),
+            return_exceptions=True
+        )
+        for name, result in zip(configs, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Server {name} failed to start: {str(result)}")
+        logger.info(f"All servers started in {time.monotonic() - started:.2f}s")
+
+    async def reload(
+        self, configs: Dict[str, MCPServerConfig], drain_timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Reconcile the running servers with a new set of configs.
+
+        Servers whose config is unchanged keep running untouched. Added and
+        changed servers are started alongside the running ones, and once
+        they are ready the server table and routes are swapped in one step,
+        so each call goes wholly to an old pool or wholly to a new one.
+        Removed and replaced pools are stopped when their in-flight calls
+        have finished. By default they wait as long as their slowest tool
+        call may take, so no call is dropped; ``drain_timeout`` sets a
+        shorter wait. A changed server that fails to start keeps serving from
+        its old pool.
+
+        Returns:
+            The added, changed, removed and unchanged server names, and the
+            error of each server that failed to start
+        """
+        async with self._reload_lock:
+            added = [name for name in configs if name not in self.servers]
+            changed = [
+                name for name in configs
+                if name in self.servers and self.servers[name].config != configs[name]
+            ]
+            removed = [name for name in self.servers if name not in configs]
+            unchanged = [name for name in configs if name not in added and name not in changed]
+            logger.info(f"Reloading config: added {added}, changed {changed}, removed {removed}")
+
+            pools = {name: MCPServerPool(name=name, config=configs[name]) for name in added + changed}
+            results = await asyncio.gather(
+                *(self._start_pool(pool) for pool in pools.values()),
+                return_exceptions=True
+            )
+            failed: Dict[str, str] = {}
+            for name, result in zip(pools, results):
+                if isinstance(result, BaseException):
+                    logger.error(f"Server {name} failed to start on reload: {str(result)}")
+                    failed[name] = str(result)
+
+            # New servers are listed even if they failed, like at startup
+            replaced = [name for name in changed if name not in failed]
+            servers = {name: pool for name, pool in self.servers.items() if name not in removed}
+            servers.update({name: pools[name] for name in added + replaced})
+            retired = [self.servers[name] for name in removed + replaced]
+            self.servers = servers
+            self._rebuild_routes()
+
+            for pool in retired:
+                self.cache.clear(pool.name)
+                timeout = drain_timeout
+                if timeout is None and pool.config.longest_call_timeout is not None:
+                    # A call that reached its deadline finishes just after it
+                    timeout = pool.config.longest_call_timeout + DRAIN_GRACE
+                task = asyncio.create_task(self._drain(pool, timeout))
+                self._drain_tasks.add(task)
+                task.add_done_callback(self._drain_tasks.discard)
+            for name in changed:
+                if name in failed:
+                    await self._stop_pool(pools[name])
+
+            return {
+                "added": added,
+                "changed": changed,
+                "removed": removed,
+                "unchanged": unchanged,
+                "failed": failed
+            }
+
+    async def _drain(self, pool: MCPServerPool, timeout: Optional[float]) -> None:
+        """Stop a retired pool once the calls already routed to it finish.
+
+        Calls still running after timeout seconds are dropped; with no
+        timeout, the pool waits for all of them.
+        """
+        pool.status = "draining"
         try:
-            logger.info(f"Loading config from: {config_path}")
-            # Read config file
-            with open(config_path) as f:
-                config = json.load(f)
-            logger.info(f"Loaded config: {json.dumps(config, indent=2)}")
-            
-            if not config.get('mcp', {}).get('servers'):
-                raise ValueError("No MCP servers configured in config file")
-                
-            # Start each configured server in parallel
-            tasks = []
-            for name, server_config in config['mcp']['servers'].items():
-                logger.info(f"Creating start task for server: {name}")
-                task = asyncio.create_task(
-                    self.start_server(
-                        name,
-                        MCPServerConfig(**server_config)
-                    )
-                )
-                tasks.append(task)
-            
-            # Wait for all servers to start
-            logger.info("Waiting for all servers to start")
-            await asyncio.gather(*tasks, return_exceptions=True)
-            logger.info("All servers started")
-            
-        except Exception as e:
-            logger.error(f"Error starting servers: {str(e)}")
-            raise
+            async with asyncio.timeout(timeout):
+                while pool.in_flight:
+                    await asyncio.sleep(0.05)
+        except TimeoutError:
+            logger.warning(f"Stopping {pool.name} with {pool.in_flight} call(s) unfinished after {timeout}s")
+        finally:
+            logger.info(f"Stopping retired pool of server {pool.name}")
+            await self._stop_pool(pool)
+
+    async def _stop_pool(self, pool: MCPServerPool) -> None:
+        """Stop a pool's processes, idle reaper, scale-ups and Python tool executor."""
+        pool.status = "stopped"
+        if pool.reaper_task:
+            pool.reaper_task.cancel()
+        for task in pool.scale_tasks:
+            task.cancel()
+        await asyncio.gather(*pool.scale_tasks, return_exceptions=True)
+        if pool.supervisor_task:
+            # Stops a respawn in progress, along with its process
+            pool.supervisor_task.cancel()
+            await asyncio.gather(pool.supervisor_task, return_exceptions=True)
+        if pool.provider:
+            pool.provider.shutdown()
+        replicas, pool.replicas = pool.replicas, []
+        for server in replicas:
+            await self._stop_process(server)
     
     async def list_all_tools(self) -> List[Dict[str, Any]]:
         """Get all available tools from all servers."""
         tools = []
-        for server in self.servers.values():
-            for tool in server.tools:
+        # One catalog entry per pool, however many replicas it runs
+        for pool in self.servers.values():
+            for tool in pool.tools:
                 tool_dict = {
-                    "name": tool["name"],
+                    "name": self._exposed_name(pool.name, tool["name"]),
                     "description": tool.get("description", ""),
-                    "server": server.name
+                    "server": pool.name
                 }
                 schema = get_schema(tool)
                 if schema:
                     tool_dict["input_schema"] = schema
                 tools.append(tool_dict)
-        logger.info(f"All available tools: {json.dumps(tools, indent=2)}")
         return tools
+
+    async def catalog(self) -> Tuple[str, bytes]:
+        """Get the serialized tools/list response and its ETag.
+
+        The body is built once per catalog version. The ETag is a hash of the
+        body, so it stays the same across gateway restarts with the same tools.
+        While servers are starting, their names are listed under "pending".
+        """
+        if self._catalog is None:
+            version = self.catalog_version
+            catalog: Dict[str, Any] = {"tools": await self.list_all_tools()}
+            if self.pending:
+                catalog["pending"] = sorted(self.pending)
+            body = orjson.dumps(catalog)
+            etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+            # Don't cache a body that went stale while it was being built
+            if version == self.catalog_version:
+                self._catalog = (etag, body)
+            logger.info(f"Built tool catalog version {version} ({len(body)} bytes)")
+            return etag, body
+        return self._catalog
     
-    async def call_tool(self, tool_name: str, arguments: dict) -> Any:
-        """Call a tool on the appropriate server."""
-        # Find server that has this tool
-        for server in self.servers.values():
-            if any(t["name"] == tool_name for t in server.tools):
-                try:
-                    logger.info(f"Calling tool {tool_name} on server {server.name}")
-                    logger.info(f"Tool arguments: {json.dumps(arguments, indent=2)}")
-                    
-                    result = await self._communicate_with_server(
-                        server,
-                        "tools/call",
-                        {
-                            "name": tool_name,
-                            "arguments": arguments
-                        }
-                    )
-                    
-                    logger.info(f"Tool call result: {json.dumps(result, indent=2)}")
-                    return result
-                except Exception as e:
-                    logger.error(f"Error calling tool {tool_name}: {str(e)}")
-                    raise
-        raise ValueError(f"Tool {tool_name} not found")
+    async def call_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        progress: Optional[ProgressHandler] = None,
+        timeout: Optional[float] = None,
+        raw: bool = False,
+        traceparent: Optional[str] = None,
+        priority: Optional[str] = None
+    ) -> Any:
+        """Call a tool on the appropriate server.
+
+        The call is bounded by the tighter of the tool's configured timeout
+        and the caller's timeout, including time spent waiting for a slot.
+        On expiry the server is sent a cancellation notification.
+
+        For tools configured to coalesce, a call made while an identical one
+        is in flight waits for that call's result instead of sending its
+        own; only the first caller receives progress notifications.
+
+        Args:
+            tool_name: Exposed name of the tool
+            arguments: Arguments to pass to the tool
+            progress: Optional callback for the server's progress notifications
+            timeout: Optional seconds the caller is willing to wait
+            raw: Return the result as the JSON bytes the server sent, without
+                decoding it
+            traceparent: Optional W3C trace context of the caller; the call's
+                spans are recorded as its children
+            priority: high, medium (the default) or low; decides the order
+                in which calls waiting for a slot on a busy server go next
+
+        Raises:
+            ToolNotFoundError: If no server provides the tool
+            ToolsPendingError: If no server provides the tool yet, but some
+                are still starting
+            ToolTimeoutError: If the call misses its deadline
+            ServerBusyError: If the server's wait queue is full
+        """
+        route = self.routes.get(tool_name)
+        pool = self.servers.get(route.server) if route else None
+        if route is None or pool is None:
+            if self.pending:
+                raise ToolsPendingError(
+                    f"Tool {tool_name} not found; servers still starting: {sorted(self.pending)}",
+                    STARTUP_RETRY_AFTER
+                )
+            raise ToolNotFoundError(f"Tool {tool_name} not found")
+
+        key = cache_key(route.server, route.tool, arguments) if route.cache_ttl is not None or route.coalesce else None
+        if key is not None and route.cache_ttl is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.info(f"Cache hit for tool {route.tool} on server {pool.name}")
+                self.metrics.tool_calls.inc(pool.name, route.tool, "cached")
+                return cached if raw else orjson.loads(cached)
+
+        deadline = min((t for t in (route.timeout, timeout) if t is not None), default=None)
+        pool.calls += 1
+        pool.in_flight += 1
+        started = time.perf_counter()
+        status = "error"
+        span = self.tracer.start("call_tool", traceparent, **{"mcp.server": pool.name, "mcp.tool": route.tool})
+        try:
+            logger.info(f"Calling tool {route.tool} on server {pool.name}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Tool arguments: {orjson.dumps(arguments).decode()}")
+            
+            upstream = functools.partial(
+                self._dispatch, pool, route.tool, arguments, progress, span, traceparent, priority
+            )
+            try:
+                async with asyncio.timeout(deadline):
+                    if key is not None and route.coalesce:
+                        if key in self.flights:
+                            self.metrics.coalesced_calls.inc(pool.name, route.tool)
+                            if span is not None:
+                                span.attributes["mcp.coalesced"] = True
+                        result = await self.flights.do(key, upstream)
+                    else:
+                        result = await upstream()
+            except TimeoutError:
+                pool.timeouts += 1
+                status = "timeout"
+                raise ToolTimeoutError(f"Tool {tool_name} timed out after {deadline}s")
+            
+            status = "ok"
+            self.metrics.response_bytes.observe(len(result), pool.name, route.tool)
+            logger.info(f"Tool {tool_name} returned {len(result)} bytes")
+            # A pool retired by a reload may have a different config
+            current = self.servers.get(pool.name) is pool
+            if key is not None and route.cache_ttl is not None and current and not is_error_result(result):
+                self.cache.put(key, result, route.cache_ttl, len(result))
+            return result if raw else orjson.loads(result)
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        except ServerBusyError as e:
+            status = "rejected"
+            logger.warning(f"Rejected call to tool {tool_name}: {str(e)}")
+            raise
+        except Exception as e:
+            pool.errors += 1
+            logger.error(f"Error calling tool {tool_name}: {str(e)}")
+            raise
+        finally:
+            pool.in_flight -= 1
+            pool.last_used = time.monotonic()
+            self.metrics.tool_calls.inc(pool.name, route.tool, status)
+            self.metrics.tool_latency.observe(time.perf_counter() - started, pool.name, route.tool)
+            if span is not None:
+                span.attributes["mcp.status"] = status
+                self.tracer.end(span, None if status == "ok" else status)
     
+    async def _dispatch(
+        self,
+        pool: MCPServerPool,
+        tool: str,
+        arguments: Dict[str, Any],
+        progress: Optional[ProgressHandler],
+        span: Optional[Span],
+        traceparent: Optional[str],
+        priority: Optional[str] = None
+    ) -> bytes:
+        """Send a tool call to a pool once it has a free slot; returns the raw result."""
+        queued = time.perf_counter()
+        async with pool.admission.slot(priority) if pool.admission else contextlib.nullcontext():
+            if span is not None:
+                span.attributes["mcp.queue_wait_ms"] = (time.perf_counter() - queued) * 1000
+            if pool.provider:
+                return await pool.provider.call(tool, arguments)
+            result: bytes = await self._communicate_with_server(
+                await self._get_replica(pool),
+                "tools/call",
+                {
+                    "name": tool,
+                    "arguments": arguments
+                },
+                progress,
+                raw=True,
+                trace=span or traceparent
+            )
+            return result
+
+    async def _stop_process(self, server: MCPServer) -> None:
+        """Terminate a server's process group and reap it."""
+        try:
+            # Kill entire process group (its id is the leader's pid
+            # because of setsid, even if the leader already exited)
+            os.killpg(server.process.pid, signal.SIGTERM)
+            await server.process.wait()
+        except ProcessLookupError:
+            # Already exited; reap it so its pipes are closed
+            await server.process.wait()
+        except Exception as e:
+            logger.error(f"Error shutting down server {server.name}: {str(e)}")
+            try:
+                os.killpg(server.process.pid, signal.SIGKILL)
+            except:
+                pass
+
+    def server_status(self) -> Dict[str, Any]:
+        """Describe each server's state and startup timings."""
+        return {
+            pool.name: {
+                "status": pool.status,
+                "lazy": pool.config.lazy,
+                "executor": pool.config.executor if pool.provider else None,
+                "calls": pool.calls,
+                "errors": pool.errors,
+                "timeouts": pool.timeouts,
+                "queue": pool.admission.stats() if pool.admission else None,
+                "restarts": pool.restarts,
+                "downtime": pool.total_downtime(),
+                "error": pool.error,
+                "tools": [tool["name"] for tool in pool.tools],
+                "replicas": [
+                    {
+                        "replica": server.replica,
+                        "pid": server.process.pid,
+                        "alive": server.alive,
+                        "startup_duration": server.startup_duration,
+                        "in_flight": len(server.pending)
+                    }
+                    for server in pool.replicas
+                ]
+            }
+            for pool in self.servers.values()
+        }
+
+    async def diagnostics(self, name: str, stderr_lines: Optional[int] = None) -> Dict[str, Any]:
+        """Describe one server's processes, recent stderr and request counts.
+
+        The replicas' resource use is read in one /proc scan, in a thread so
+        it doesn't hold up the event loop.
+
+        Raises:
+            KeyError: If no server has this name
+        """
+        pool = self.servers[name]
+        pids = {server.process.pid for server in pool.replicas if server.alive}
+        usage = await asyncio.to_thread(process_group_usage, pids) if pids else {}
+        now = time.monotonic()
+        return {
+            "name": pool.name,
+            "status": pool.status,
+            "error": pool.error,
+            "command": pool.config.command or None,
+            "executor": pool.config.executor if pool.provider else None,
+            "tools": len(pool.tools),
+            "requests": {
+                "calls": pool.calls,
+                "errors": pool.errors,
+                "timeouts": pool.timeouts,
+                "in_flight": pool.in_flight,
+                "queue": pool.admission.stats() if pool.admission else None,
+            },
+            "restarts": {
+                "count": pool.restarts,
+                "crash_streak": pool.crash_streak,
+                "downtime": pool.total_downtime(),
+                "down_for": now - pool.down_since if pool.down_since is not None else None,
+            },
+            "limits": {
+                **asdict(pool.config.limits),
+                "applied": pool.config.limits.configured and LIMITS_SUPPORTED,
+                "breaches": pool.limit_breaches,
+            },
+            "replicas": [
+                {
+                    "replica": server.replica,
+                    "pid": server.process.pid,
+                    "alive": server.alive,
+                    "returncode": server.process.returncode,
+                    "uptime": now - server.started_at,
+                    "startup_duration": server.startup_duration,
+                    "in_flight": len(server.pending),
+                    **self._replica_usage(server, usage),
+                    "stderr": server.stderr.snapshot(stderr_lines),
+                }
+                for server in pool.replicas
+            ]
+        }
+
+    def _replica_usage(
+        self, server: MCPServer, usage: Optional[Dict[int, ProcessGroupUsage]]
+    ) -> Dict[str, Any]:
+        """Pick a replica's resource use for diagnostics out of a /proc scan."""
+        group = None
+        if server.alive and usage is not None:
+            group = usage.get(server.process.pid, ProcessGroupUsage())
+        return {
+            "rss_bytes": group.rss_bytes if group else None,
+            "resources": asdict(group) if group else None,
+            "limits_hit": sorted(server.limits_hit),
+        }
+
     async def shutdown(self) -> None:
         """Shutdown all MCP servers."""
-        for server in self.servers.values():
-            if server.process:
-                try:
-                    # Kill entire process group
-                    os.killpg(os.getpgid(server.process.pid), signal.SIGTERM)
-                    await server.process.wait()
-                except Exception as e:
-                    logger.error(f"Error shutting down server {server.name}: {str(e)}")
-                    try:
-                        os.killpg(os.getpgid(server.process.pid), signal.SIGKILL)
-                    except:
-                        pass
+        if self._limits_task:
+            self._limits_task.cancel()
+        # Draining pools are stopped as their drain tasks are cancelled
+        for task in self._drain_tasks:
+            task.cancel()
+        await asyncio.gather(*self._drain_tasks, return_exceptions=True)
+        for pool in self.servers.values():
+            await self._stop_pool(pool)
         self.servers.clear()
+        # Waits for the writer thread to flush the spans still queued
+        await asyncio.to_thread(self.tracer.close)
 
 
 # Global gateway instance
-gateway = Gateway()
+gateway = Gateway(
+    catalog_dir=os.environ.get("MCP_CATALOG_DIR", ".mcp_catalog"),
+    cache_max_bytes=int(os.environ.get("MCP_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    trace_file=os.environ.get("MCP_TRACE_FILE")
+)
+
+
+def _config_path() -> str:
+    return os.environ.get("MCP_CONFIG", "config.json")
+
+
+async def _reload_config() -> Dict[str, Any]:
+    """Re-read the config file and reconcile the running servers with it."""
+    logger.info("Reloading MCP Gateway config")
+    return await gateway.reload(gateway.load_config(_config_path()))
+
+
+async def _reload_on_signal() -> None:
+    try:
+        await _reload_config()
+    except Exception as e:
+        logger.error(f"Error reloading config: {str(e)}")
 
 
 @app.on_event("startup")
-async def startup():
+async def startup() -> None:
     """Initialize the gateway on startup."""
-    config_path = os.environ.get("MCP_CONFIG", "config.json")
     logger.info("Starting MCP Gateway Server")
-    await gateway.start_all_servers(config_path)
+    configs = gateway.load_config(_config_path())
+    # Serve requests for servers that are ready while slower ones still boot
+    app.state.startup_task = asyncio.create_task(gateway.start_servers(configs))
+    if hasattr(signal, "SIGHUP"):
+        def on_sighup() -> None:
+            app.state.reload_task = asyncio.create_task(_reload_on_signal())
+        # Not available off the main thread, e.g. under some test runners
+        with contextlib.suppress(NotImplementedError, RuntimeError, ValueError):
+            asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, on_sighup)
 
 
 @app.on_event("shutdown")
-async def shutdown():
+async def shutdown() -> None:
     """Cleanup on shutdown."""
     logger.info("Shutting down MCP Gateway Server")
+    startup_task = getattr(app.state, "startup_task", None)
+    if startup_task:
+        startup_task.cancel()
     await gateway.shutdown()
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+async def _catalog_response(request: Request) -> Response:
+    """Serve the tool catalog, or 304 if the client already has it."""
+    etag, body = await gateway.catalog()
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(body, media_type="application/json", headers={"ETag": etag})
+
+
+@app.get("/servers")
+async def servers_endpoint() -> Response:
+    """Return each server's status and startup timings."""
+    return JSONResponse(gateway.server_status())
+
+
+@app.get("/servers/{name}/diagnostics")
+async def diagnostics_endpoint(name: str, stderr_lines: Optional[int] = None) -> Response:
+    """Return a server's processes, recent stderr and request stats."""
+    try:
+        return JSONResponse(await gateway.diagnostics(name, stderr_lines))
+    except KeyError:
+        return JSONResponse({"error": f"Server {name} not found"}, status_code=404)
+
+
+@app.get("/metrics")
+async def metrics_endpoint() -> Response:
+    """Expose gateway metrics in the Prometheus text format."""
+    return Response(gateway.metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.post("/admin/reload")
+async def reload_endpoint() -> Response:
+    """Reload config.json without restarting unchanged servers."""
+    try:
+        return JSONResponse(await _reload_config())
+    except (OSError, ValueError, TypeError) as e:
+        # A missing, malformed or invalid config leaves the servers as they are
+        return JSONResponse({"error": f"Invalid config: {str(e)}"}, status_code=400)
+
+
+@app.get("/cache")
+async def cache_endpoint() -> Response:
+    """Return tool result cache statistics."""
+    return JSONResponse(gateway.cache.stats())
+
+
+@app.get("/tools")
+async def tools_endpoint(request: Request) -> Response:
+    """Return the tool catalog."""
+    return await _catalog_response(request)
+
+
+async def _batch_reply(
+    msg: Any,
+    timeout: Optional[float] = None,
+    traceparent: Optional[str] = None,
+    priority: Optional[str] = None
+) -> Dict[str, Any]:
+    """Run one request from a batch and build its JSON-RPC style reply.
+
+    A request may carry its own "timeout" in seconds, "traceparent" and
+    "priority"; otherwise the batch's apply. Tool results are embedded as the raw bytes the server
+    sent.
+    """
+    reply: Dict[str, Any] = {"id": msg.get("id") if isinstance(msg, dict) else None}
+    try:
+        if not isinstance(msg, dict):
+            reply["error"] = {"code": -32600, "message": "Invalid request"}
+        elif msg.get("method") == "tools/list":
+            reply["result"] = {"tools": await gateway.list_all_tools()}
+        elif msg.get("method") == "tools/call":
+            params = msg.get("params", {})
+            reply["result"] = orjson.Fragment(await gateway.call_tool(
+                params.get("name"),
+                params.get("arguments", {}),
+                timeout=msg.get("timeout", timeout),
+                raw=True,
+                traceparent=msg.get("traceparent", traceparent),
+                priority=msg.get("priority", priority)
+            ))
+        else:
+            reply["error"] = {"code": -32601, "message": "Unknown method"}
+    except ToolsPendingError as e:
+        reply["error"] = {"code": -32002, "message": str(e), "data": {"retry_after": e.retry_after}}
+    except ToolNotFoundError as e:
+        reply["error"] = {"code": -32602, "message": str(e)}
+    except ToolTimeoutError as e:
+        reply["error"] = {"code": -32001, "message": str(e)}
+    except ServerBusyError as e:
+        reply["error"] = {"code": -32002, "message": str(e), "data": {"retry_after": e.retry_after}}
+    except Exception as e:
+        reply["error"] = {"code": -32603, "message": str(e)}
+    return reply
+
+
+async def _batch_endpoint(
+    msgs: List[Any],
+    timeout: Optional[float] = None,
+    traceparent: Optional[str] = None,
+    priority: Optional[str] = None
+) -> Response:
+    """Run a batch of requests concurrently, replying in request order."""
+    if not msgs:
+        return JSONResponse({"error": "Empty batch"}, status_code=400)
+    logger.info(f"Received batch of {len(msgs)} messages")
+    replies = await asyncio.gather(*(_batch_reply(msg, timeout, traceparent, priority) for msg in msgs))
+    return Response(orjson.dumps(replies), media_type="application/json")
+
+
+def _parse_request(body: bytes, batch: bool = False) -> Any:
+    """Decode a request body: a JSON object, or with ``batch`` also an array.
+
+    Raises:
+        ValueError: If the body is not JSON of that shape, or its params are
+            not an object
+    """
+    try:
+        msg = orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON body: {str(e)}")
+    if batch and isinstance(msg, list):
+        return msg
+    if not isinstance(msg, dict):
+        raise ValueError("Request body must be a JSON object" + (" or array" if batch else ""))
+    if not isinstance(msg.get("params", {}), dict):
+        raise ValueError("Request params must be a JSON object")
+    return msg
+
+
+def _request_timeout(request: Request) -> Optional[float]:
+    """Read the client's deadline, in seconds from now, from its headers."""
+    value = request.headers.get("x-request-timeout")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def _dumps(value: Any) -> str:
+    """Serialize an SSE event's data."""
+    return orjson.dumps(value).decode()
+
+
+async def _tool_events(
+    name: str,
+    arguments: Dict[str, Any],
+    timeout: Optional[float] = None,
+    traceparent: Optional[str] = None,
+    priority: Optional[str] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """Run a tool call and yield server-sent events for it.
+
+    Progress notifications are sent as they arrive, followed by one event per
+    content part and a final result event with the remaining result fields.
+    """
+    progress: asyncio.Queue[Dict[str, Any]] = asyncio.Queue()
+    call = asyncio.create_task(gateway.call_tool(
+        name, arguments, progress.put_nowait, timeout, traceparent=traceparent, priority=priority
+    ))
+    try:
+        while not call.done():
+            next_progress = asyncio.create_task(progress.get())
+            await asyncio.wait({next_progress, call}, return_when=asyncio.FIRST_COMPLETED)
+            if next_progress.done():
+                yield {"event": "progress", "data": _dumps(next_progress.result())}
+            else:
+                next_progress.cancel()
+        while not progress.empty():
+            yield {"event": "progress", "data": _dumps(progress.get_nowait())}
+
+        try:
+            result = call.result()
+        except ServerBusyError as e:
+            yield {"event": "error", "data": _dumps({"message": str(e), "retry_after": e.retry_after})}
+            return
+        except Exception as e:
+            yield {"event": "error", "data": _dumps({"message": str(e)})}
+            return
+
+        if not isinstance(result, dict):
+            result = {"content": result}
+        for part in result.get("content") or []:
+            yield {"event": "content", "data": _dumps(part)}
+        yield {"event": "result", "data": _dumps({k: v for k, v in result.items() if k != "content"})}
+    finally:
+        # Stop the call if the client went away
+        call.cancel()
+
+
+@app.post("/stream")
+async def stream_endpoint(request: Request) -> Response:
+    """Call a tool and stream its progress and content as server-sent events."""
+    try:
+        msg = _parse_request(await request.body())
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    if msg.get("method") != "tools/call":
+        return JSONResponse({"error": "Unknown method"}, status_code=400)
+    params = msg.get("params", {})
+    if params.get("name") not in gateway.routes:
+        if gateway.pending:
+            return JSONResponse(
+                {"error": f"Tool {params.get('name')} not found; servers still starting: {sorted(gateway.pending)}"},
+                status_code=503,
+                headers={"Retry-After": str(STARTUP_RETRY_AFTER)}
+            )
+        return JSONResponse({"error": f"Tool {params.get('name')} not found"}, status_code=404)
+    return EventSourceResponse(
+        _tool_events(
+            params.get("name"),
+            params.get("arguments", {}),
+            _request_timeout(request),
+            request.headers.get("traceparent"),
+            request.headers.get("x-priority")
+        )
+    )
+
+
 @app.post("/message")
-async def message_endpoint(request: Request):
-    """Handle incoming messages from clients."""
+async def message_endpoint(request: Request) -> Response:
+    """Handle incoming messages from clients.
+
+    The body is either a single request or a JSON array of requests, which
+    are run concurrently and answered with an array in the same order.
+    """
     try:
-        msg = await request.json()
-        logger.info(f"Received message: {json.dumps(msg, indent=2)}")
+        msg = _parse_request(await request.body(), batch=True)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    try:
+        if isinstance(msg, list):
+            return await _batch_endpoint(
+                msg, _request_timeout(request), request.headers.get("traceparent"), request.headers.get("x-priority")
+            )
+        logger.info(f"Received message: {msg.get('method')}")
         
         if msg.get("method") == "tools/list":
-            tools = await gateway.list_all_tools()
-            response = {"tools": tools}
-            logger.info(f"Returning tools: {json.dumps(response, indent=2)}")
-            return JSONResponse(response)
+            return await _catalog_response(request)
         
         elif msg.get("method") == "tools/call":
             params = msg.get("params", {})
-            logger.info(f"Tool call parameters: {json.dumps(params, indent=2)}")
             
+            # The result is passed through as the bytes the server sent
             result = await gateway.call_tool(
                 params.get("name"),
-                params.get("arguments", {})
+                params.get("arguments", {}),
+                timeout=_request_timeout(request),
+                raw=True,
+                traceparent=request.headers.get("traceparent"),
+                priority=request.headers.get("x-priority")
             )
-            logger.info(f"Tool call result: {json.dumps(result, indent=2)}")
-            return JSONResponse(result)
+            return Response(result, media_type="application/json")
         
         return JSONResponse({"error": "Unknown method"}, status_code=400)
+    except ToolsPendingError as e:
+        return JSONResponse({"error": str(e)}, status_code=503, headers={"Retry-After": str(e.retry_after)})
+    except ToolNotFoundError as e:
+        return JSONResponse({"error": str(e)}, status_code=404)
+    except ToolTimeoutError as e:
+        return JSONResponse({"error": str(e)}, status_code=504)
+    except ServerBusyError as e:
+        return JSONResponse(
+            {"error": str(e)}, status_code=429, headers={"Retry-After": str(e.retry_after)}
+        )
     except Exception as e:
         logger.error(f"Error handling message: {str(e)}")
         return JSONResponse({"error": str(e)}, status_code=500)
 
 
-if __name__ == "__main__":
-    import uvicorn
+def main() -> None:
+    """Serve the gateway.
+
+    It listens on TCP port MCP_PORT, or on the Unix domain socket MCP_UDS
+    when that is set. With MCP_HTTP2=1 it is served by Hypercorn, which
+    speaks HTTP/2 without TLS (with prior knowledge) as well as HTTP/1.1, so
+    clients can multiplex concurrent calls over one connection.
+    """
     port = int(os.environ.get("MCP_PORT", "8808"))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    uds = os.environ.get("MCP_UDS")
+    if os.environ.get("MCP_HTTP2", "").lower() in ("1", "true", "yes"):
+        # Optional dependency: pip install mcp-gateway[http2]
+        from hypercorn.asyncio import serve
+        from hypercorn.config import Config
+
+        config = Config()
+        config.bind = [f"unix:{uds}" if uds else f"0.0.0.0:{port}"]
+        asyncio.run(serve(app, config))
+        return
+
+    import uvicorn
+    if uds:
+        uvicorn.run(app, uds=uds)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Single-flight deduplication of concurrent calls.
+
+Concurrent calls with the same key share one run of the underlying call and
+all receive its result or exception. The shared run belongs to no single
+caller: a caller that times out or is cancelled stops waiting without
+affecting the others, and the run is only cancelled once every caller has
+given up on it.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Callable, Coroutine, Dict
+
+
+@dataclass
+class _Flight:
+    task: asyncio.Task[Any]
+    waiters: int = 0
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time, sharing it among callers."""
+
+    def __init__(self) -> None:
+        """Start with no calls in flight."""
+        self._flights: Dict[str, _Flight] = {}
+        # Calls answered by joining another caller's run
+        self.shared = 0
+
+    def __contains__(self, key: str) -> bool:
+        """Return whether a call for ``key`` is in flight."""
+        return key in self._flights
+
+    def __len__(self) -> int:
+        """Return the number of calls in flight."""
+        return len(self._flights)
+
+    async def do(self, key: str, call: Callable[[], Coroutine[Any, Any, Any]]) -> Any:
+        """Await the run in flight for key, starting call() if there is none."""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.create_task(call()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda task: self._finish(key, flight))
+        else:
+            self.shared += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if not flight.waiters and not flight.task.done():
+                # Later callers start a new run rather than join this one
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+
+    def _finish(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Mark the outcome as retrieved when every caller has gone
+        if not flight.task.cancelled():
+            flight.task.exception()
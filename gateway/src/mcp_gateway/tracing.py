@@ -0,0 +1,183 @@
+"""Trace spans for tool calls.
+
+Callers pass a W3C ``traceparent`` header; the gateway's spans for the call
+become its children, and the span of the request to the MCP server is sent
+on as ``params._meta.traceparent`` so servers that trace can join in.
+Finished spans are appended to a file as OTLP/JSON lines, one export
+request per span, as written by the OpenTelemetry Collector file exporter.
+Lines are queued as spans end and written in batches by a background
+thread, so tracing never blocks the event loop on the file.
+"""
+
+import logging
+import queue
+import re
+import secrets
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import IO, Any, Dict, List, Optional, Union
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "mcp-gateway"
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+    name: str
+    trace_id: str
+    parent_id: Optional[str] = None
+    span_id: str = field(default_factory=lambda: secrets.token_hex(8))
+    start_ns: int = field(default_factory=time.time_ns)
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def traceparent(self) -> str:
+        """The W3C trace context header value for this span."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class SpanWriter:
+    """Appends lines to a file in batches from a background thread."""
+
+    def __init__(self, path: str):
+        """Start the writer thread for ``path``, opened on the first batch."""
+        self.path = path
+        # Lines to write, events to set once the lines before them are
+        # written, and None to stop
+        self._queue: queue.SimpleQueue[Union[bytes, threading.Event, None]] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="span-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, line: bytes) -> None:
+        """Queue a line to be written."""
+        self._queue.put(line)
+
+    def flush(self) -> None:
+        """Wait until the lines queued so far are written."""
+        written = threading.Event()
+        self._queue.put(written)
+        written.wait()
+
+    def close(self) -> None:
+        """Write the lines queued so far and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        file: Optional[IO[bytes]] = None
+        stopped = False
+        while not stopped:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines: List[bytes] = []
+            for item in batch:
+                if isinstance(item, bytes):
+                    lines.append(item)
+                    continue
+                # Write what came before a flush or stop first
+                file = self._write(file, lines)
+                lines = []
+                if item is None:
+                    stopped = True
+                    break
+                item.set()
+            file = self._write(file, lines)
+        if file is not None:
+            file.close()
+
+    def _write(self, file: Optional[IO[bytes]], lines: List[bytes]) -> Optional[IO[bytes]]:
+        if not lines:
+            return file
+        try:
+            if file is None:
+                file = open(self.path, "ab")
+            file.write(b"".join(lines))
+            file.flush()
+        except OSError as e:
+            logger.warning(f"Could not write {len(lines)} trace spans to {self.path}: {str(e)}")
+        return file
+
+
+class Tracer:
+    """Creates spans and exports them to a file; a no-op without a path."""
+
+    def __init__(self, path: Optional[str] = None):
+        """Create a tracer exporting to ``path``, opened on the first span."""
+        self.path = path
+        self._writer: Optional[SpanWriter] = None
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are exported."""
+        return self.path is not None
+
+    def start(self, name: str, parent: Any = None, **attributes: Any) -> Optional[Span]:
+        """Start a span under a parent Span or traceparent header.
+
+        Returns None when tracing is off. A missing or malformed parent
+        starts a new trace.
+        """
+        if self.path is None:
+            return None
+        if isinstance(parent, Span):
+            return Span(name, parent.trace_id, parent.span_id, attributes=attributes)
+        match = _TRACEPARENT.match(parent) if isinstance(parent, str) else None
+        if match:
+            return Span(name, match.group(1), match.group(2), attributes=attributes)
+        return Span(name, secrets.token_hex(16), attributes=attributes)
+
+    def end(self, span: Optional[Span], error: Optional[str] = None) -> None:
+        """Finish a span and queue it to be written out."""
+        if span is None or self.path is None:
+            return
+        otlp_span: Dict[str, Any] = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 2,
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(time.time_ns()),
+            "attributes": [_attribute(k, v) for k, v in span.attributes.items()],
+            "status": {"code": 2, "message": error} if error else {"code": 1},
+        }
+        if span.parent_id:
+            otlp_span["parentSpanId"] = span.parent_id
+        line = orjson.dumps({"resourceSpans": [{
+            "resource": {"attributes": [_attribute("service.name", SERVICE_NAME)]},
+            "scopeSpans": [{"scope": {"name": __name__}, "spans": [otlp_span]}],
+        }]})
+        if self._writer is None:
+            self._writer = SpanWriter(self.path)
+        self._writer.write(line + b"\n")
+
+    def flush(self) -> None:
+        """Wait until the spans ended so far are written."""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """Write out the remaining spans and close the export file."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
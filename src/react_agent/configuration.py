@@ -65,7 +65,23 @@ class Configuration:
     mcp_gateway_url: str = field(
         default="http://localhost:8808",
         metadata={
-            "description": "URL of the MCP gateway server that provides tools."
+            "description": "URL of the MCP gateway server that provides tools. Use "
+            "unix:///path/to/socket for a gateway listening on a Unix domain socket."
+        },
+    )
+
+    mcp_call_timeout: float = field(
+        default=60.0,
+        metadata={
+            "description": "Seconds an MCP tool call may take before the gateway cancels it."
+        },
+    )
+
+    mcp_http2: bool = field(
+        default=False,
+        metadata={
+            "description": "Use HTTP/2 to multiplex concurrent tool calls over one connection "
+            "to the gateway. Requires the http2 extra and a gateway started with MCP_HTTP2=1."
         },
     )
 
@@ -102,5 +118,7 @@ class Configuration:
         # Load MCP gateway URL if present
         if 'mcp' in config_data:
             config.mcp_gateway_url = config_data['mcp'].get('gateway_url', config.mcp_gateway_url)
+            config.mcp_call_timeout = config_data['mcp'].get('call_timeout', config.mcp_call_timeout)
+            config.mcp_http2 = config_data['mcp'].get('http2', config.mcp_http2)
 
         return config
@@ -4,7 +4,7 @@ Works with a chat model with tool calling support.
 """
 
 from datetime import datetime, timezone
-from typing import Dict, List, Literal, cast
+from typing import Any, Dict, List, Literal, Optional, cast
 import asyncio
 
 from langchain_core.messages import AIMessage
@@ -12,9 +12,10 @@ from langchain_core.runnables import RunnableConfig
 from langgraph.graph import StateGraph
 from langgraph.prebuilt import ToolNode
 
+from react_agent import mcp_client, tracing
 from react_agent.configuration import Configuration
 from react_agent.state import InputState, State
-from react_agent.tools import TOOLS, initialize_tools
+from react_agent.tools import TOOLS, initialize_tools, refresh_tools
 from react_agent.utils import load_chat_model
 
 
@@ -37,6 +38,7 @@ async def call_model(
         dict: A dictionary containing the model's response message.
     """
     configuration = Configuration.from_runnable_config(config)
+    await _refresh_tools()
 
     # Initialize the model with tool binding. Change the model or add more tools here.
     model = load_chat_model(
@@ -53,12 +55,13 @@ async def call_model(
     )
 
     # Get the model's response
-    response = cast(
-        AIMessage,
-        await model.ainvoke(
-            [{"role": "system", "content": system_message}, *state["messages"]], config
-        ),
-    )
+    with tracing.span("call_model", config, model=configuration.model):
+        response = cast(
+            AIMessage,
+            await model.ainvoke(
+                [{"role": "system", "content": system_message}, *state["messages"]], config
+            ),
+        )
 
     # Handle the case when it's the last step and the model still wants to use a tool
     if state.get("is_last_step") and response.tool_calls:
@@ -75,12 +78,40 @@ async def call_model(
     return {"messages": [response]}
 
 
+def _urgency(state: State) -> Optional[str]:
+    """Get the escalation's urgency, whether the context is a dict or an EscalationContext."""
+    context = state.get("escalation_context")
+    if isinstance(context, dict):
+        return context.get("urgency")
+    return getattr(context, "urgency", None)
+
+
+tool_node = ToolNode(TOOLS)
+
+
+async def _refresh_tools() -> None:
+    """Pick up tools the gateway added or removed since the last model call."""
+    global tool_node
+    if await refresh_tools():
+        tool_node = ToolNode(TOOLS)
+
+
+async def call_tools(state: State, config: RunnableConfig) -> Any:
+    """Run the tools the model requested.
+
+    MCP tool calls are sent with the escalation's urgency as their priority,
+    so the gateway serves urgent conversations first when it is saturated.
+    """
+    with mcp_client.priority(_urgency(state)):
+        return await tool_node.ainvoke(state, config)
+
+
 # Define a new graph
 builder = StateGraph(State, input=InputState, config_schema=Configuration)
 
 # Define the two nodes we will cycle between
 builder.add_node(call_model)
-builder.add_node("tools", ToolNode(TOOLS))
+builder.add_node("tools", call_tools)
 
 # Set the entrypoint as `call_model`
 # This means that this node is the first one called
@@ -126,5 +157,5 @@ builder.add_edge("tools", "call_model")
 graph = builder.compile(
     interrupt_before=[],  # Add node names here to update state before they're called
     interrupt_after=[],  # Add node names here to update state after they're called
-)
+).with_config(callbacks=[tracing.RUN_TRACER])  # Gives each run's spans one trace
 graph.name = "ReAct Agent"  # This customizes the name in LangSmith
@@ -3,34 +3,151 @@
 This module handles communication with the MCP gateway server.
 """
 
+import asyncio
 import json
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
 import httpx
 
+from react_agent import tracing
+
 logger = logging.getLogger(__name__)
 
+# Extra seconds the HTTP request may take beyond the gateway-side deadline,
+# so the gateway's timeout error arrives before the client gives up
+TIMEOUT_GRACE = 2.0
+
+# JSON-RPC error code the gateway returns for an unknown tool in a batch
+TOOL_NOT_FOUND = -32602
+
+# Priority hints understood by the gateway, most urgent first
+PRIORITIES = ("high", "medium", "low")
+
+_priority: ContextVar[Optional[str]] = ContextVar("mcp_priority", default=None)
+
+
+@contextmanager
+def priority(level: Optional[str]) -> Iterator[None]:
+    """Send tool calls made within the block with a priority hint.
+
+    The gateway serves waiting calls to a busy server in priority order.
+    Unknown levels are ignored.
+    """
+    level = level.lower() if isinstance(level, str) else None
+    token = _priority.set(level if level in PRIORITIES else None)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def _transport(gateway_url: str, http2: bool) -> Tuple[str, Optional[httpx.AsyncHTTPTransport]]:
+    """Pick the base URL and HTTP transport for a gateway URL.
+
+    A ``unix://`` URL names the gateway's socket path; requests then go over
+    that socket to a placeholder host.
+    """
+    if gateway_url.startswith("unix://"):
+        socket_path = gateway_url[len("unix://"):]
+        return "http://localhost", httpx.AsyncHTTPTransport(uds=socket_path, http1=not http2, http2=http2)
+    if http2:
+        # Plain-text HTTP/2 with prior knowledge, as no TLS negotiates it
+        return gateway_url, httpx.AsyncHTTPTransport(http1=False, http2=True)
+    return gateway_url, None
+
 
 class MCPGatewayClient:
     """Client for communicating with the MCP gateway server."""
     
-    def __init__(self, gateway_url: str = "http://localhost:8808"):
+    def __init__(
+        self,
+        gateway_url: str = "http://localhost:8808",
+        batch_window: Optional[float] = 0.002,
+        call_timeout: Optional[float] = 60.0,
+        http2: bool = False,
+        catalog_max_age: Optional[float] = 60.0
+    ):
         """Initialize the client.
         
         Args:
-            gateway_url: URL of the MCP gateway server
+            gateway_url: URL of the MCP gateway server, either http(s)://
+                or unix:///path/to/socket for a gateway listening on a Unix
+                domain socket
+            batch_window: Seconds to wait for more tool calls to send in the
+                same batch request. Calls made concurrently, such as the
+                tool calls of one model message, then share one round trip.
+                None sends every call as its own request.
+            call_timeout: Default seconds a request may take. It is sent to
+                the gateway, which enforces it and cancels the call upstream.
+            http2: Speak HTTP/2 to the gateway, so concurrent calls are
+                multiplexed over one connection. Needs the ``h2`` package and
+                a gateway started with MCP_HTTP2=1.
+            catalog_max_age: Seconds the cached tool catalog is used before
+                it is revalidated with the gateway. None keeps it until a
+                tool call finds a tool missing.
         """
-        self.gateway_url = gateway_url
-        self.client = httpx.AsyncClient()
+        self.gateway_url, transport = _transport(gateway_url, http2)
+        self.batch_window = batch_window
+        self.call_timeout = call_timeout
+        self.client = httpx.AsyncClient(transport=transport)
         self._tools: Optional[List[Dict[str, Any]]] = None
+        self._tools_etag: Optional[str] = None
+        # Whether every server had listed its tools when the catalog was fetched
+        self._tools_complete = False
+        self.catalog_max_age = catalog_max_age
+        self._tools_checked_at = 0.0
+        # Set when the gateway didn't know a tool from the cached catalog
+        self._tools_stale = False
+        self._queued_calls: List[
+            Tuple[Dict[str, Any], Optional[float], Optional[str], Optional[str], asyncio.Future[Any]]
+        ] = []
+        self._flush_task: Optional[asyncio.Task[None]] = None
     
-    async def _send_request(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    async def _post_message(
+        self,
+        request: Any,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None
+    ) -> httpx.Response:
+        """Post a message to the gateway and return the raw HTTP response.
+        
+        The timeout is sent to the gateway as the request's deadline, and the
+        request is traced as a child of the current span.
+        """
+        headers = {"Content-Type": "application/json", **(headers or {})}
+        if timeout is not None:
+            headers["X-Request-Timeout"] = str(timeout)
+        with tracing.span("gateway_request", batch=isinstance(request, list)) as current:
+            if current is not None:
+                headers["traceparent"] = current.traceparent
+            response = await self.client.post(
+                f"{self.gateway_url}/message",
+                json=request,
+                headers=headers,
+                timeout=None if timeout is None else timeout + TIMEOUT_GRACE
+            )
+            if current is not None:
+                current.attributes["http.status_code"] = response.status_code
+            return response
+
+    async def _send_request(
+        self,
+        method: str,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        priority: Optional[str] = None
+    ) -> Any:
         """Send a request to the gateway server.
         
         Args:
             method: The method to call (e.g., "tools/list", "tools/call")
             params: Optional parameters for the method
+            timeout: Seconds the request may take; defaults to call_timeout
+            priority: Optional priority hint sent as the X-Priority header
             
         Returns:
             The response from the server
@@ -46,34 +163,83 @@ class MCPGatewayClient:
         # Log the request being sent
         logger.info(f"Sending request to gateway: {json.dumps(request, indent=2)}")
         
-        response = await self.client.post(
-            f"{self.gateway_url}/message",
-            json=request,
-            headers={"Content-Type": "application/json"}
-        )
+        headers = {"X-Priority": priority} if priority else None
+        response = await self._post_message(request, headers, timeout or self.call_timeout)
         
+        if response.status_code == 404:
+            # The tool was removed or renamed since the catalog was fetched
+            self._tools_stale = True
         if response.status_code != 200:
             raise Exception(f"Request failed with status {response.status_code}: {response.text}")
             
         return response.json()
     
-    async def list_tools(self) -> List[Dict[str, Any]]:
+    async def list_tools(self, refresh: bool = False) -> List[Dict[str, Any]]:
         """Get list of available tools from the gateway.
         
+        The catalog is cached along with its ETag. A refresh sends the ETag
+        back, so the gateway only returns a body when the catalog changed.
+        The cached catalog is revalidated once it is older than
+        ``catalog_max_age``, after a tool call found a tool missing, and on
+        every call while the gateway lists servers as still starting.
+        
+        Args:
+            refresh: Revalidate the cached catalog with the gateway
+            
         Returns:
             List of tool definitions
         """
-        if self._tools is None:
-            response = await self._send_request("tools/list")
-            self._tools = response.get("tools", [])
+        if self._tools is not None and not refresh and not self._catalog_outdated():
+            return self._tools
+        
+        headers = {}
+        if self._tools is not None and self._tools_etag:
+            headers["If-None-Match"] = self._tools_etag
+        response = await self._post_message(
+            {"method": "tools/list", "params": {}}, headers, self.call_timeout
+        )
+        
+        if response.status_code == 304 and self._tools is not None:
+            logger.info("Tool catalog unchanged")
+            self._tools_checked_at = time.monotonic()
+            self._tools_stale = False
+            return self._tools
+        if response.status_code != 200:
+            raise Exception(f"Request failed with status {response.status_code}: {response.text}")
+        
+        catalog = response.json()
+        self._tools = catalog.get("tools", [])
+        self._tools_etag = response.headers.get("ETag")
+        self._tools_checked_at = time.monotonic()
+        self._tools_stale = False
+        self._tools_complete = not catalog.get("pending")
+        if not self._tools_complete:
+            logger.info(f"Tool catalog incomplete; servers still starting: {catalog['pending']}")
         return self._tools
     
-    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+    def _catalog_outdated(self) -> bool:
+        """Check whether the cached tool catalog should be revalidated."""
+        if self._tools_stale or not self._tools_complete:
+            return True
+        if self.catalog_max_age is None:
+            return False
+        return time.monotonic() - self._tools_checked_at > self.catalog_max_age
+    
+    async def call_tool(
+        self,
+        name: str,
+        arguments: Dict[str, Any],
+        timeout: Optional[float] = None,
+        priority: Optional[str] = None
+    ) -> Any:
         """Call a tool through the gateway.
         
         Args:
             name: Name of the tool to call
             arguments: Arguments to pass to the tool
+            timeout: Seconds the call may take; defaults to call_timeout
+            priority: high, medium or low; defaults to the level set with
+                ``priority()``, if any
             
         Returns:
             The tool's response
@@ -106,9 +272,176 @@ class MCPGatewayClient:
         # Log the actual parameters being sent
         logger.info(f"Sending parameters to gateway: {json.dumps(params, indent=2)}")
         
-        response = await self._send_request("tools/call", params)
+        timeout = timeout or self.call_timeout
+        priority = priority or _priority.get()
+        if self.batch_window is None:
+            response = await self._send_request("tools/call", params, timeout, priority)
+        else:
+            response = await self._queue_call(params, timeout, priority)
+        return self._extract_text(response)
+    
+    async def call_tools(
+        self, calls: List[Tuple[str, Dict[str, Any]]], timeout: Optional[float] = None
+    ) -> List[Any]:
+        """Call several tools through the gateway in one batch request.
         
-        # Extract text content from response
+        Args:
+            calls: (name, arguments) pairs to call
+            timeout: Seconds each call may take; defaults to call_timeout
+            
+        Returns:
+            One entry per call, in order: the tool's response, or the
+            Exception it failed with
+        """
+        timeout = timeout or self.call_timeout
+        responses = await self._send_batch([
+            ({"name": name, "arguments": arguments}, timeout, tracing.traceparent(), _priority.get())
+            for name, arguments in calls
+        ])
+        return [
+            r if isinstance(r, Exception) else self._extract_text(r)
+            for r in responses
+        ]
+    
+    async def _send_batch(
+        self, calls: List[Tuple[Dict[str, Any], Optional[float], Optional[str], Optional[str]]]
+    ) -> List[Any]:
+        """Send tools/call requests as one batch.
+        
+        Args:
+            calls: (params, timeout, traceparent of the caller, priority)
+                for each call
+            
+        Returns:
+            The result of each call, or an Exception for calls that failed
+        """
+        batch = []
+        for i, (params, timeout, traceparent, priority) in enumerate(calls):
+            msg = {"id": i, "method": "tools/call", "params": params}
+            if timeout is not None:
+                msg["timeout"] = timeout
+            if traceparent is not None:
+                msg["traceparent"] = traceparent
+            if priority is not None:
+                msg["priority"] = priority
+            batch.append(msg)
+        # The batch may take as long as its slowest call, or has no limit
+        # if any call has none
+        timeouts = [call[1] for call in calls if call[1] is not None]
+        logger.info(f"Sending batch of {len(batch)} tool calls to gateway")
+        response = await self._post_message(
+            batch, timeout=max(timeouts) if len(timeouts) == len(calls) else None
+        )
+        if response.status_code != 200:
+            raise Exception(f"Request failed with status {response.status_code}: {response.text}")
+        
+        results: List[Any] = []
+        for reply in response.json():
+            if "error" in reply:
+                if reply["error"].get("code") == TOOL_NOT_FOUND:
+                    self._tools_stale = True
+                results.append(Exception(f"Tool call failed: {reply['error'].get('message')}"))
+            else:
+                results.append(reply.get("result"))
+        return results
+    
+    async def _queue_call(
+        self, params: Dict[str, Any], timeout: Optional[float], priority: Optional[str] = None
+    ) -> Any:
+        """Queue a tool call to be sent with others made in the batch window."""
+        future = asyncio.get_running_loop().create_future()
+        self._queued_calls.append((params, timeout, tracing.traceparent(), priority, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_calls())
+        return await future
+    
+    async def _flush_calls(self) -> None:
+        """Send the queued tool calls, as a batch if there is more than one."""
+        # Only scheduled when batching, so batch_window is set
+        await asyncio.sleep(self.batch_window or 0)
+        queued, self._queued_calls = self._queued_calls, []
+        self._flush_task = None
+        
+        try:
+            if len(queued) == 1:
+                # A lone call goes out as a plain request
+                params, timeout, _, priority, _ = queued[0]
+                results: List[Any] = [await self._send_request("tools/call", params, timeout, priority)]
+            else:
+                results = await self._send_batch([call[:4] for call in queued])
+        except Exception as e:
+            results = [e] * len(queued)
+        
+        for (*_, future), result in zip(queued, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+    
+    async def stream_tool(
+        self, name: str, arguments: Dict[str, Any], timeout: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Call a tool and yield its events as the gateway streams them.
+        
+        Events are dicts with an "event" name and decoded "data":
+        "progress" for each progress notification, "content" for each
+        content part of the result, and a final "result" with any other
+        result fields.
+        
+        Args:
+            name: Name of the tool to call
+            arguments: Arguments to pass to the tool
+            timeout: Seconds the call may take; defaults to call_timeout
+            
+        Yields:
+            Events in the order they arrive
+            
+        Raises:
+            Exception: If the tool call fails
+        """
+        request = {"method": "tools/call", "params": {"name": name, "arguments": arguments}}
+        timeout = timeout or self.call_timeout
+        headers = {} if timeout is None else {"X-Request-Timeout": str(timeout)}
+        parent = tracing.traceparent()
+        if parent:
+            headers["traceparent"] = parent
+        priority = _priority.get()
+        if priority:
+            headers["X-Priority"] = priority
+        async with self.client.stream(
+            "POST",
+            f"{self.gateway_url}/stream",
+            json=request,
+            headers=headers,
+            timeout=None if timeout is None else timeout + TIMEOUT_GRACE
+        ) as response:
+            if response.status_code == 404:
+                self._tools_stale = True
+            if response.status_code != 200:
+                await response.aread()
+                raise Exception(f"Request failed with status {response.status_code}: {response.text}")
+            
+            event, data = "message", []
+            async for line in response.aiter_lines():
+                if line.startswith(":"):
+                    # Comment, e.g. a keep-alive ping
+                    continue
+                if line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:"):
+                    data.append(line[len("data:"):].removeprefix(" "))
+                elif not line and data:
+                    payload = json.loads("\n".join(data))
+                    if event == "error":
+                        raise Exception(f"Tool call failed: {payload.get('message')}")
+                    yield {"event": event, "data": payload}
+                    event, data = "message", []
+    
+    @staticmethod
+    def _extract_text(response: Any) -> Any:
+        """Return the text of a single-text-content tool response."""
         if isinstance(response, dict):
             content = response.get("content", [])
             if content and isinstance(content, list):
@@ -123,28 +456,39 @@ class MCPGatewayClient:
 _client: Optional[MCPGatewayClient] = None
 
 
-def get_client(gateway_url: Optional[str] = None) -> MCPGatewayClient:
+def get_client(
+    gateway_url: Optional[str] = None,
+    call_timeout: Optional[float] = None,
+    http2: bool = False
+) -> MCPGatewayClient:
     """Get or create the global client instance.
     
     Args:
         gateway_url: Optional URL for the gateway server
+        call_timeout: Optional default seconds a tool call may take
+        http2: Whether a new client should speak HTTP/2 to the gateway
         
     Returns:
         The global client instance
     """
     global _client
     if _client is None:
-        _client = MCPGatewayClient(gateway_url or "http://localhost:8808")
+        _client = MCPGatewayClient(gateway_url or "http://localhost:8808", http2=http2)
+    if call_timeout is not None:
+        _client.call_timeout = call_timeout
     return _client
 
 
-async def list_tools() -> List[Dict[str, Any]]:
+async def list_tools(refresh: bool = False) -> List[Dict[str, Any]]:
     """Get list of available tools.
     
+    Args:
+        refresh: Revalidate the cached catalog with the gateway
+        
     Returns:
         List of tool definitions
     """
-    return await get_client().list_tools()
+    return await get_client().list_tools(refresh)
 
 
 async def call_tool(name: str, arguments: Dict[str, Any]) -> Any:
@@ -8,13 +8,14 @@ import logging
 from typing import Annotated, Any, Dict, List, Literal, Optional, Type
 
 from langchain_core.messages import ToolMessage
+from langchain_core.runnables import ensure_config
 from langchain_core.tools import BaseTool, StructuredTool, Tool, tool
 from langchain_core.tools.base import InjectedToolCallId
 from langgraph.prebuilt import InjectedState
 from langgraph.types import Command
 from pydantic import BaseModel, create_model
 
-from react_agent import mcp_client
+from react_agent import mcp_client, tracing
 
 logger = logging.getLogger(__name__)
 
@@ -84,7 +85,8 @@ def _create_tool_wrapper(tool_def: Dict[str, Any]) -> BaseTool:
                 logger.info(f"Merged dict arg with kwargs: {args[0]}")
         
         logger.info(f"Tool wrapper calling with kwargs: {kwargs}")
-        result = await mcp_client.call_tool(tool_def["name"], kwargs)
+        with tracing.span("tool", ensure_config(), tool=tool_def["name"]):
+            result = await mcp_client.call_tool(tool_def["name"], kwargs)
         return result
     
     # Create Pydantic model for schema validation
@@ -316,8 +318,11 @@ def submit_response(
     )
 
 
-async def _load_tools() -> List[BaseTool]:
-    """Load all available tools from the MCP gateway.
+def _load_tools(catalog: List[Dict[str, Any]]) -> List[BaseTool]:
+    """Create LangChain tools for the MCP gateway's tools.
+    
+    Args:
+        catalog: Tool definitions listed by the gateway
     
     Returns:
         List of LangChain tools
@@ -325,7 +330,7 @@ async def _load_tools() -> List[BaseTool]:
     logger.info("Loading tools from gateway")
     tools = []
     tool_names = []
-    for tool_def in await mcp_client.list_tools():
+    for tool_def in catalog:
         logger.info(f"Loading tool: {tool_def['name']}")
         if tool_def['name'] in tool_names:
             continue
@@ -338,8 +343,37 @@ async def _load_tools() -> List[BaseTool]:
     return tools
 
 
-# Initial empty tools list - will be populated during startup
+# Local state management tools (consolidated from 4 to 2)
+LOCAL_TOOLS: List[BaseTool] = [
+    retrieve_context,
+    submit_response
+]
+
+# Initial empty tools list - will be populated during startup and updated
+# in place as the gateway's catalog changes
 TOOLS: List[BaseTool] = []
+# The catalog the MCP tools in TOOLS were created from
+_catalog: Optional[List[Dict[str, Any]]] = None
+
+
+async def refresh_tools() -> bool:
+    """Update TOOLS if the gateway's tool catalog changed.
+    
+    The client keeps the catalog cached and only asks the gateway again
+    while it may be out of date, e.g. while servers are still starting.
+    
+    Returns:
+        Whether TOOLS changed
+    """
+    global _catalog
+    catalog = await mcp_client.list_tools()
+    if catalog is _catalog:
+        return False
+    _catalog = catalog
+    mcp_tools = _load_tools(catalog)
+    TOOLS[:] = LOCAL_TOOLS + mcp_tools
+    logger.info(f"Loaded {len(LOCAL_TOOLS)} local tools and {len(mcp_tools)} MCP tools")
+    return True
 
 
 async def initialize_tools(config) -> List[BaseTool]:
@@ -353,25 +387,16 @@ async def initialize_tools(config) -> List[BaseTool]:
     Returns:
         List of available tools
     """
-    global TOOLS
-    
     logger.info("Initializing tools")
     
-    # Local state management tools (consolidated from 4 to 2)
-    local_tools = [
-        retrieve_context,
-        submit_response
-    ]
-    
     # Configure MCP client with gateway URL from config
     if hasattr(config, "mcp_gateway_url"):
-        mcp_client.get_client(config.mcp_gateway_url)
+        mcp_client.get_client(
+            config.mcp_gateway_url,
+            getattr(config, "mcp_call_timeout", None),
+            getattr(config, "mcp_http2", False)
+        )
     
     # Load MCP tools from gateway
-    mcp_tools = await _load_tools()
-    
-    # Merge local and MCP tools
-    TOOLS = local_tools + mcp_tools
-
-    logger.info(f"Initialized {len(local_tools)} local tools and {len(mcp_tools)} MCP tools")
+    await refresh_tools()
     return TOOLS
@@ -0,0 +1,312 @@
+"""Lightweight tracing for agent runs.
+
+Spans are timed with ``span()`` and written, one per line, to the file named
+by the ``TRACE_FILE`` environment variable in OTLP/JSON form (the format of
+the OpenTelemetry Collector's file exporter), so a run's latency can be
+broken down offline or loaded into any OTLP-compatible backend. Tracing is
+off when ``TRACE_FILE`` is unset. Lines are queued as spans end and written
+in batches by a background thread; ``flush()`` waits for them, and the rest
+are written when the interpreter exits.
+
+Each graph run is recorded as a ``graph_run`` span by ``RUN_TRACER``, a
+callback handler attached to the compiled graph, and the spans started in
+its nodes and tools become its children, so every span of a run shares its
+trace id. The current span is passed to the MCP gateway as a W3C
+``traceparent`` header so the gateway's spans join the same trace.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import IO, Any, Dict, Iterator, List, Optional, Set, Union
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.runnables import RunnableConfig
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "react-agent"
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+    name: str
+    trace_id: str
+    span_id: str = field(default_factory=lambda: secrets.token_hex(8))
+    parent_id: Optional[str] = None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def traceparent(self) -> str:
+        """The W3C trace context header value for this span."""
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+
+class _SpanWriter:
+    """Appends lines to a file in batches from a background thread."""
+
+    def __init__(self, path: str):
+        self.path = path
+        # Lines to write, events to set once the lines before them are
+        # written, and None to stop
+        self._queue: queue.SimpleQueue[Union[bytes, threading.Event, None]] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="span-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, line: bytes) -> None:
+        self._queue.put(line)
+
+    def flush(self) -> None:
+        written = threading.Event()
+        self._queue.put(written)
+        written.wait()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        file: Optional[IO[bytes]] = None
+        stopped = False
+        while not stopped:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines: List[bytes] = []
+            for item in batch:
+                if isinstance(item, bytes):
+                    lines.append(item)
+                    continue
+                # Write what came before a flush or stop first
+                file = self._write(file, lines)
+                lines = []
+                if item is None:
+                    stopped = True
+                    break
+                item.set()
+            file = self._write(file, lines)
+        if file is not None:
+            file.close()
+
+    def _write(self, file: Optional[IO[bytes]], lines: List[bytes]) -> Optional[IO[bytes]]:
+        if not lines:
+            return file
+        try:
+            if file is None:
+                file = open(self.path, "ab")
+            file.write(b"".join(lines))
+            file.flush()
+        except OSError as e:
+            logger.warning(f"Could not write {len(lines)} trace spans to {self.path}: {str(e)}")
+        return file
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_writer: Optional[_SpanWriter] = None
+# Guards replacing the writer, not writing to it
+_writer_lock = threading.Lock()
+
+
+def _trace_file() -> Optional[str]:
+    return os.environ.get("TRACE_FILE") or None
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def _span_writer(path: str) -> _SpanWriter:
+    """Return the writer for ``path``, replacing one for an old ``TRACE_FILE``."""
+    global _writer
+    writer = _writer
+    if writer is not None and writer.path == path:
+        return writer
+    with _writer_lock:
+        if _writer is None or _writer.path != path:
+            if _writer is not None:
+                _writer.close()
+            _writer = _SpanWriter(path)
+        return _writer
+
+
+def flush() -> None:
+    """Wait until the spans ended so far are written to the trace file."""
+    with _writer_lock:
+        if _writer is not None:
+            _writer.flush()
+
+
+@atexit.register
+def _close() -> None:
+    global _writer
+    with _writer_lock:
+        if _writer is not None:
+            _writer.close()
+            _writer = None
+
+
+def _export(span: Span, path: str) -> None:
+    """Queue a finished span to be appended to the trace file as an OTLP/JSON line."""
+    otlp_span: Dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [_attribute(k, v) for k, v in span.attributes.items()],
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        otlp_span["parentSpanId"] = span.parent_id
+    line = json.dumps({"resourceSpans": [{
+        "resource": {"attributes": [_attribute("service.name", SERVICE_NAME)]},
+        "scopeSpans": [{"scope": {"name": __name__}, "spans": [otlp_span]}],
+    }]})
+    _span_writer(path).write(line.encode() + b"\n")
+
+
+class RunTracer(BaseCallbackHandler):
+    """Records each graph run as a root span for the spans started within it.
+
+    LangGraph passes nodes and tools a callback manager whose parent run id
+    is their own run, not the graph's, so child runs are mapped to the span
+    of the run they belong to as they start.
+    """
+
+    # Called on the event loop in order, so a run is mapped before it runs
+    run_inline = True
+
+    def __init__(self) -> None:
+        """Start with no runs in progress."""
+        # Each run in progress, with the span of the graph run it is part of
+        self._runs: Dict[UUID, Span] = {}
+        self._graph_runs: Set[UUID] = set()
+
+    def run_span(self, run_id: Optional[UUID]) -> Optional[Span]:
+        """Return the root span of the graph run that a run belongs to, if any."""
+        return self._runs.get(run_id) if run_id is not None else None
+
+    def _start(self, run_id: UUID, parent_run_id: Optional[UUID], name: str) -> None:
+        if _trace_file() is None:
+            return
+        root = self.run_span(parent_run_id)
+        if root is None:
+            root = Span(
+                name="graph_run",
+                trace_id=hashlib.sha256(str(run_id).encode()).hexdigest()[:32],
+                attributes={"graph": name},
+            )
+            self._graph_runs.add(run_id)
+        self._runs[run_id] = root
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None) -> None:
+        root = self._runs.pop(run_id, None)
+        if run_id not in self._graph_runs:
+            return
+        self._graph_runs.discard(run_id)
+        path = _trace_file()
+        if root is None or path is None:
+            return
+        if error is not None:
+            root.error = str(error) or type(error).__name__
+        root.end_ns = time.time_ns()
+        _export(root, path)
+
+    def on_chain_start(
+        self, serialized: Optional[Dict[str, Any]], inputs: Any, *,
+        run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs: Any
+    ) -> None:
+        """Map a chain or graph node run to its graph run."""
+        self._start(run_id, parent_run_id, kwargs.get("name") or "graph")
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        """Forget a finished run, ending the graph run's span with it."""
+        self._end(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        """Forget a failed run, ending the graph run's span with it."""
+        self._end(run_id, error)
+
+    def on_tool_start(
+        self, serialized: Optional[Dict[str, Any]], input_str: str, *,
+        run_id: UUID, parent_run_id: Optional[UUID] = None, **kwargs: Any
+    ) -> None:
+        """Map a tool run to its graph run."""
+        self._start(run_id, parent_run_id, kwargs.get("name") or "tool")
+
+    def on_tool_end(self, output: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        """Forget a finished tool run."""
+        self._end(run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        """Forget a failed tool run."""
+        self._end(run_id, error)
+
+
+# Attached to the agent's compiled graph
+RUN_TRACER = RunTracer()
+
+
+@contextmanager
+def span(name: str, config: Optional[RunnableConfig] = None, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Time a block as a child of the current span.
+
+    With no current span, it becomes a child of the span of the graph run
+    that ``config`` belongs to, or starts a new trace outside of a run.
+    Yields None when tracing is off.
+    """
+    path = _trace_file()
+    if path is None:
+        yield None
+        return
+
+    parent = _current_span.get()
+    if parent is None:
+        # Set by LangGraph on the config of each node and tool
+        parent = RUN_TRACER.run_span(getattr((config or {}).get("callbacks"), "parent_run_id", None))
+    current = Span(
+        name=name,
+        trace_id=parent.trace_id if parent else secrets.token_hex(16),
+        parent_id=parent.span_id if parent else None,
+        attributes=attributes,
+    )
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = str(e) or type(e).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end_ns = time.time_ns()
+        _export(current, path)
+
+
+def traceparent() -> Optional[str]:
+    """Return the ``traceparent`` header value for the current span, if any."""
+    current = _current_span.get()
+    return current.traceparent if current else None
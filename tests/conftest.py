@@ -1,8 +1,18 @@
 """Pytest configuration and fixtures for ohl-agent tests."""
 
 import sys
+from pathlib import Path
+from typing import Any, Callable
 from unittest.mock import AsyncMock, patch
 
+import pytest
+
+# The gateway is a separate package; make it and the agent importable from
+# their source trees when they are not installed.
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(ROOT / "gateway" / "src"))
+
 # Mock MCP initialization BEFORE any imports of react_agent modules
 # This prevents the MCP gateway connection attempt during module import
 mock_init_tools = AsyncMock(return_value=None)
@@ -10,3 +20,20 @@ sys.modules.setdefault('react_agent.tools', type(sys)('react_agent.tools'))
 if 'react_agent.tools' in sys.modules:
     sys.modules['react_agent.tools'].initialize_tools = mock_init_tools
     sys.modules['react_agent.tools'].TOOLS = []
+    sys.modules['react_agent.tools'].refresh_tools = AsyncMock(return_value=False)
+
+
+@pytest.fixture
+def fake_config() -> Callable[..., Any]:
+    """Return a builder of configs that run the bundled fake MCP server.
+
+    Positional arguments are passed to the fake server; keyword arguments
+    set the config's fields.
+    """
+    # Imported here, once the gateway's source tree is on the path
+    from mcp_gateway import fake_server
+    from mcp_gateway.server import MCPServerConfig
+
+    def build(*args: str, **kwargs: Any) -> Any:
+        return MCPServerConfig(command=sys.executable, args=[fake_server.__file__, *args], **kwargs)
+    return build
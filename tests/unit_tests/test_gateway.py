@@ -0,0 +1,711 @@
+"""Tests for the MCP gateway server."""
+
+import asyncio
+import json
+import sys
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from mcp_gateway import fake_server
+from mcp_gateway import server as gateway_server
+from mcp_gateway.diagnostics import ProcessGroupUsage
+from mcp_gateway.server import (
+    Gateway,
+    MCPServerConfig,
+    MCPServerPool,
+    ToolNotFoundError,
+    ToolsPendingError,
+    ToolTimeoutError,
+    app,
+)
+
+FAKE_TOOLS = sorted(tool["name"] for tool in fake_server.TOOLS)
+
+
+@asynccontextmanager
+async def running_gateway(**servers: MCPServerConfig):
+    """Start a gateway with the given servers and shut it down afterwards."""
+    gateway = Gateway()
+    try:
+        for name, config in servers.items():
+            await gateway.start_server(name, config)
+        yield gateway
+    finally:
+        await gateway.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_get_their_own_responses(fake_config) -> None:
+    async with running_gateway(fake=fake_config()) as gateway:
+        # Slower calls are sent first, so responses arrive out of order
+        calls = [
+            gateway.call_tool("sleep", {"seconds": 0.05 * (5 - i), "text": f"call-{i}"})
+            for i in range(5)
+        ]
+        results = await asyncio.gather(*calls)
+
+        assert [r["content"][0]["text"] for r in results] == [f"call-{i}" for i in range(5)]
+        assert not gateway.servers["fake"].replicas[0].pending
+
+
+@pytest.mark.asyncio
+async def test_tool_error_does_not_affect_other_calls(fake_config) -> None:
+    async with running_gateway(fake=fake_config()) as gateway:
+        server = gateway.servers["fake"].replicas[0]
+        ok, failed = await asyncio.gather(
+            gateway.call_tool("echo", {"text": "hello"}),
+            gateway._communicate_with_server(server, "tools/call", {"name": "missing"}),
+            return_exceptions=True,
+        )
+
+        assert ok["content"][0]["text"] == "hello"
+        assert isinstance(failed, Exception)
+
+
+@pytest.mark.asyncio
+async def test_pending_requests_fail_when_server_exits(fake_config) -> None:
+    async with running_gateway(fake=fake_config()) as gateway:
+        server = gateway.servers["fake"].replicas[0]
+        call = asyncio.create_task(gateway.call_tool("sleep", {"seconds": 5}))
+        await asyncio.sleep(0.1)
+        server.process.kill()
+
+        with pytest.raises(Exception):
+            await asyncio.wait_for(call, timeout=2)
+
+
+async def wait_for_replica(pool: MCPServerPool, timeout: float = 5) -> None:
+    """Wait until a pool has a running replica again."""
+    async with asyncio.timeout(timeout):
+        while not any(server.alive for server in pool.replicas):
+            await asyncio.sleep(0.02)
+
+
+@pytest.mark.asyncio
+async def test_crashed_server_is_restarted(fake_config) -> None:
+    async with running_gateway(fake=fake_config(restart_backoff=0.05)) as gateway:
+        pool = gateway.servers["fake"]
+        crashed = pool.replicas[0]
+        call = asyncio.create_task(gateway.call_tool("sleep", {"seconds": 5}))
+        await asyncio.sleep(0.1)
+        crashed.process.kill()
+
+        with pytest.raises(Exception, match="exited with code|closed its stdout"):
+            await asyncio.wait_for(call, timeout=1)
+        await wait_for_replica(pool)
+
+        assert crashed not in pool.replicas
+        assert pool.status == "ready"
+        assert pool.restarts == 1
+        assert pool.down_since is None and pool.downtime > 0
+        assert pool.tools and sorted(gateway.routes) == sorted(FAKE_TOOLS + [f"fake__{t}" for t in FAKE_TOOLS])
+        result = await gateway.call_tool("echo", {"text": "back"})
+        assert result["content"][0]["text"] == "back"
+        assert gateway.server_status()["fake"]["restarts"] == 1
+        metrics = gateway.metrics.render()
+        assert 'mcp_gateway_server_crashes_total{server="fake"} 1' in metrics
+        assert 'mcp_gateway_server_restarts_total{server="fake"} 1' in metrics
+
+
+@pytest.mark.asyncio
+async def test_restarts_back_off_while_the_server_keeps_failing(fake_config) -> None:
+    config = fake_config(restart_backoff=0.02, restart_backoff_max=0.08, startup_retries=0)
+    async with running_gateway(fake=config) as gateway:
+        pool = gateway.servers["fake"]
+        args = config.args
+        config.args = ["-c", "'import sys; sys.exit(1)'"]
+        pool.replicas[0].process.kill()
+
+        # Each failed start takes an interpreter launch, so wait for the count
+        # rather than a fixed time
+        async with asyncio.timeout(10):
+            while pool.crash_streak < 4:
+                await asyncio.sleep(0.05)
+        assert pool.status == "restarting"
+        assert pool.restarts == 0
+        assert "failed to start" in pool.error
+        with pytest.raises(Exception, match="No running replicas"):
+            await gateway.call_tool("echo", {"text": "down"})
+
+        config.args = args
+        await wait_for_replica(pool)
+        assert pool.status == "ready"
+        assert pool.restarts == 1
+        assert pool.downtime > 0
+        diagnostics = await gateway.diagnostics("fake")
+        assert diagnostics["restarts"]["count"] == 1
+        assert diagnostics["restarts"]["down_for"] is None
+
+
+@pytest.mark.asyncio
+async def test_stopped_servers_are_not_restarted(fake_config) -> None:
+    async with running_gateway(fake=fake_config(restart_backoff=0)) as gateway:
+        pool = gateway.servers["fake"]
+        server = pool.replicas[0]
+        await gateway._stop_pool(pool)
+        await asyncio.wait_for(server.exit_task, 1)
+
+        assert pool.supervisor_task is None
+        assert pool.restarts == 0
+
+
+@pytest.mark.asyncio
+async def test_calls_spread_across_replicas(fake_config) -> None:
+    async with running_gateway(fake=fake_config(replicas=2)) as gateway:
+        pool = gateway.servers["fake"]
+        calls = [
+            asyncio.create_task(gateway.call_tool("sleep", {"seconds": 0.5}))
+            for _ in range(4)
+        ]
+        await asyncio.sleep(0.1)
+
+        assert [len(replica.pending) for replica in pool.replicas] == [2, 2]
+        await asyncio.gather(*calls)
+
+        # The catalog lists each tool once, not once per replica
+        tools = await gateway.list_all_tools()
+        assert sorted(tool["name"] for tool in tools) == FAKE_TOOLS
+
+
+@pytest.mark.asyncio
+async def test_pool_grows_to_max_replicas_when_busy(fake_config) -> None:
+    async with running_gateway(fake=fake_config(replicas={"min": 1, "max": 2})) as gateway:
+        pool = gateway.servers["fake"]
+        slow = asyncio.create_task(gateway.call_tool("sleep", {"seconds": 0.5}))
+        await asyncio.sleep(0.1)
+        await gateway.call_tool("echo", {"text": "hi"})
+        await slow
+
+        for _ in range(50):
+            if len(pool.replicas) == 2:
+                break
+            await asyncio.sleep(0.1)
+        assert len(pool.replicas) == 2
+        assert pool.starting == 0
+
+
+@pytest.mark.asyncio
+async def test_idle_replicas_added_under_load_are_stopped(fake_config) -> None:
+    config = fake_config(replicas={"min": 1, "max": 3}, idle_timeout=0.3)
+    async with running_gateway(fake=config) as gateway:
+        pool = gateway.servers["fake"]
+        first = pool.replicas[0]
+        await asyncio.gather(*(gateway.call_tool("sleep", {"seconds": 0.2}) for _ in range(3)))
+        async with asyncio.timeout(5):
+            while len(pool.replicas) < 3:
+                await asyncio.sleep(0.05)
+        assert not pool.scale_tasks
+        added = [server for server in pool.replicas if server is not first]
+
+        # Keep the first replica busy while the added ones go idle
+        async with asyncio.timeout(5):
+            while len(pool.replicas) > 1:
+                await gateway.call_tool("echo", {"text": "hi"})
+                await asyncio.sleep(0.05)
+        assert pool.replicas == [first]
+        assert all(server.process.returncode is not None for server in added)
+        assert (await gateway.call_tool("echo", {"text": "still up"}))["content"][0]["text"] == "still up"
+
+
+@pytest.mark.asyncio
+async def test_colliding_tools_are_namespaced(fake_config) -> None:
+    async with running_gateway(a=fake_config(), b=fake_config()) as gateway:
+        tools = await gateway.list_all_tools()
+        assert sorted(tool["name"] for tool in tools) == [f"{s}__{t}" for s in "ab" for t in FAKE_TOOLS]
+
+        result = await gateway.call_tool("b__echo", {"text": "from b"})
+        assert result["content"][0]["text"] == "from b"
+
+        with pytest.raises(ToolNotFoundError):
+            await gateway.call_tool("echo", {"text": "ambiguous"})
+
+
+def test_unknown_tool_returns_404() -> None:
+    client = TestClient(app)
+    response = client.post("/message", json={
+        "method": "tools/call",
+        "params": {"name": "missing", "arguments": {}},
+    })
+
+    assert response.status_code == 404
+    assert "missing" in response.json()["error"]
+
+
+@pytest.mark.parametrize("path", ["/message", "/stream"])
+@pytest.mark.parametrize("body", [b"{not json", b'"tools/call"', b'{"method": "tools/call", "params": []}'])
+def test_malformed_request_body_returns_400(path: str, body: bytes) -> None:
+    client = TestClient(app)
+    response = client.post(path, content=body)
+
+    assert response.status_code == 400
+    assert response.json()["error"]
+
+
+def test_tools_list_supports_conditional_requests() -> None:
+    client = TestClient(app)
+    first = client.post("/message", json={"method": "tools/list"})
+    etag = first.headers["ETag"]
+
+    assert first.status_code == 200
+    assert first.json() == {"tools": []}
+
+    second = client.post("/message", json={"method": "tools/list"}, headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.headers["ETag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_catalog_is_rebuilt_when_servers_change(fake_config) -> None:
+    async with running_gateway(a=fake_config()) as gateway:
+        etag, body = await gateway.catalog()
+        assert await gateway.catalog() == (etag, body)
+
+        await gateway.start_server("b", fake_config())
+        new_etag, new_body = await gateway.catalog()
+        assert new_etag != etag
+        assert b"b__echo" in new_body
+
+
+@pytest.mark.asyncio
+async def test_ready_servers_serve_while_slow_ones_boot(monkeypatch, fake_config) -> None:
+    gateway = Gateway()
+    monkeypatch.setattr(gateway_server, "gateway", gateway)
+    startup = asyncio.create_task(gateway.start_servers({
+        "fast": fake_config(),
+        "slow": fake_config("--startup-delay", "1.5"),
+    }))
+    try:
+        for _ in range(50):
+            if gateway.servers.get("fast") and gateway.servers["fast"].status == "ready":
+                break
+            await asyncio.sleep(0.05)
+
+        result = await gateway.call_tool("fast__echo", {"text": "early"})
+        assert result["content"][0]["text"] == "early"
+        assert gateway.servers["slow"].status == "starting"
+
+        # Until slow lists its tools the catalog is incomplete, and unknown
+        # tools may be its, so callers are told to retry
+        _, body = await gateway.catalog()
+        assert json.loads(body)["pending"] == ["slow"]
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gateway") as client:
+            response = await client.post("/message", json={
+                "method": "tools/call", "params": {"name": "slow__echo", "arguments": {"text": "hi"}}
+            })
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+        await startup
+        _, body = await gateway.catalog()
+        assert "pending" not in json.loads(body)
+        assert (await gateway.call_tool("slow__echo", {"text": "late"}))["content"][0]["text"] == "late"
+        with pytest.raises(ToolNotFoundError) as error:
+            await gateway.call_tool("missing", {})
+        assert not isinstance(error.value, ToolsPendingError)
+        status = gateway.server_status()
+        assert status["slow"]["status"] == "ready"
+        assert status["slow"]["replicas"][0]["startup_duration"] >= 1.5
+        assert status["fast"]["replicas"][0]["startup_duration"] < 1.5
+    finally:
+        await gateway.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_startup_deadline_retries_then_fails(fake_config) -> None:
+    config = fake_config("--startup-delay", "5", startup_timeout=0.2, startup_retries=1)
+    gateway = Gateway()
+    try:
+        with pytest.raises(Exception, match="after 2 attempt"):
+            await gateway.start_server("stuck", config)
+        assert gateway.servers["stuck"].status == "failed"
+    finally:
+        await gateway.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_lazy_server_starts_on_first_call_and_stops_when_idle(tmp_path, fake_config) -> None:
+    config = fake_config(lazy=True, idle_timeout=0.3)
+
+    # The first run has no snapshot, so it starts the server to learn its tools
+    first = Gateway(catalog_dir=str(tmp_path))
+    try:
+        await first.start_server("lazy", config)
+    finally:
+        await first.shutdown()
+
+    gateway = Gateway(catalog_dir=str(tmp_path))
+    try:
+        pool = await gateway.start_server("lazy", config)
+        assert pool.status == "idle"
+        assert not pool.replicas
+        assert sorted(tool["name"] for tool in await gateway.list_all_tools()) == FAKE_TOOLS
+
+        results = await asyncio.gather(*(gateway.call_tool("echo", {"text": "wake"}) for _ in range(3)))
+        assert all(r["content"][0]["text"] == "wake" for r in results)
+        assert len(pool.replicas) == 1
+
+        for _ in range(40):
+            if pool.status == "idle":
+                break
+            await asyncio.sleep(0.05)
+        assert pool.status == "idle"
+        assert not pool.replicas
+    finally:
+        await gateway.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_snapshot_tools_are_served_while_server_starts(tmp_path, fake_config) -> None:
+    config = fake_config("--startup-delay", "0.5")
+    first = Gateway(catalog_dir=str(tmp_path))
+    try:
+        await first.start_server("slow", config)
+    finally:
+        await first.shutdown()
+
+    gateway = Gateway(catalog_dir=str(tmp_path))
+    try:
+        start = asyncio.create_task(gateway.start_server("slow", config))
+        await asyncio.sleep(0)
+        pool = gateway.servers["slow"]
+        assert pool.status == "starting"
+        assert sorted(tool["name"] for tool in await gateway.list_all_tools()) == FAKE_TOOLS
+
+        # A call made before the server is up waits for it
+        result = await gateway.call_tool("echo", {"text": "early"})
+        assert result["content"][0]["text"] == "early"
+        await start
+    finally:
+        await gateway.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_is_reconciled_with_server_tools(tmp_path, fake_config) -> None:
+    config = fake_config()
+    gateway = Gateway(catalog_dir=str(tmp_path))
+    gateway.snapshots.save("fake", config.fingerprint, [{"name": "removed_tool"}])
+    try:
+        await gateway.start_server("fake", config)
+        assert "removed_tool" not in gateway.routes
+        assert "echo" in gateway.routes
+        saved = gateway.snapshots.load("fake", config.fingerprint)
+        assert sorted(tool["name"] for tool in saved) == FAKE_TOOLS
+    finally:
+        await gateway.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_only_opted_in_tools_are_cached(fake_config) -> None:
+    config = fake_config(cache={"echo": {"ttl": 60}})
+    async with running_gateway(fake=config) as gateway:
+        for _ in range(3):
+            await gateway.call_tool("echo", {"text": "cached"})
+            await gateway.call_tool("sleep", {"seconds": 0, "text": "not cached"})
+
+        stats = gateway.cache.stats()
+        assert stats["entries"] == 1
+        assert stats["hits"] == 2
+        assert stats["misses"] == 1
+
+
+def test_tools_marked_mutating_are_never_cached(fake_config) -> None:
+    gateway = Gateway()
+    pool = MCPServerPool(name="memory", config=fake_config(cache={"create_entities": {"ttl": 60}}))
+    tool = {"name": "create_entities", "annotations": {"readOnlyHint": False}}
+
+    assert gateway._cache_ttl(pool, tool) is None
+    assert gateway._cache_ttl(pool, {"name": "create_entities"}) == 60
+
+
+@pytest.mark.asyncio
+async def test_batch_requests_run_concurrently_in_order(monkeypatch, fake_config) -> None:
+    async with running_gateway(fake=fake_config(max_concurrency=4)) as gateway:
+        monkeypatch.setattr(gateway_server, "gateway", gateway)
+        batch = [
+            {"id": i, "method": "tools/call", "params": {"name": "sleep", "arguments": {"seconds": 0.3, "text": str(i)}}}
+            for i in range(4)
+        ]
+        batch.append({"id": "bad", "method": "tools/call", "params": {"name": "missing"}})
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gateway") as client:
+            started = asyncio.get_running_loop().time()
+            response = await client.post("/message", json=batch)
+            elapsed = asyncio.get_running_loop().time() - started
+
+        replies = response.json()
+        assert [reply["id"] for reply in replies] == [0, 1, 2, 3, "bad"]
+        assert [reply["result"]["content"][0]["text"] for reply in replies[:4]] == ["0", "1", "2", "3"]
+        assert replies[4]["error"]["code"] == -32602
+        assert elapsed < 1.0
+
+
+@pytest.mark.asyncio
+async def test_max_concurrency_bounds_calls_per_server(fake_config) -> None:
+    async with running_gateway(fake=fake_config(max_concurrency=1)) as gateway:
+        started = asyncio.get_running_loop().time()
+        await asyncio.gather(*(gateway.call_tool("sleep", {"seconds": 0.2}) for _ in range(3)))
+
+        assert asyncio.get_running_loop().time() - started >= 0.6
+
+
+@pytest.mark.asyncio
+async def test_slow_calls_time_out_and_are_cancelled(fake_config) -> None:
+    async with running_gateway(fake=fake_config(tool_timeouts={"sleep": 0.2})) as gateway:
+        pool = gateway.servers["fake"]
+        with pytest.raises(ToolTimeoutError):
+            await gateway.call_tool("sleep", {"seconds": 5})
+
+        # A tighter caller deadline wins over the configured one
+        with pytest.raises(ToolTimeoutError):
+            await gateway.call_tool("echo", {"text": "late"}, timeout=0)
+
+        assert pool.timeouts == 2
+        assert not pool.replicas[0].pending
+        result = await gateway.call_tool("echo", {"text": "still serving"})
+        assert result["content"][0]["text"] == "still serving"
+
+
+@pytest.mark.asyncio
+async def test_request_timeout_header_returns_504(monkeypatch, fake_config) -> None:
+    async with running_gateway(fake=fake_config()) as gateway:
+        monkeypatch.setattr(gateway_server, "gateway", gateway)
+        request = {"method": "tools/call", "params": {"name": "sleep", "arguments": {"seconds": 5}}}
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gateway") as client:
+            response = await client.post("/message", json=request, headers={"X-Request-Timeout": "0.2"})
+
+        assert response.status_code == 504
+        assert gateway.servers["fake"].timeouts == 1
+
+
+@pytest.mark.asyncio
+async def test_overload_is_shed_with_429(monkeypatch, fake_config) -> None:
+    async with running_gateway(fake=fake_config(max_concurrency=1, max_queue=1)) as gateway:
+        monkeypatch.setattr(gateway_server, "gateway", gateway)
+        request = {"method": "tools/call", "params": {"name": "sleep", "arguments": {"seconds": 0.3}}}
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gateway") as client:
+            responses = await asyncio.gather(*(client.post("/message", json=request) for _ in range(3)))
+
+        assert sorted(response.status_code for response in responses) == [200, 200, 429]
+        rejected = next(response for response in responses if response.status_code == 429)
+        assert int(rejected.headers["Retry-After"]) >= 1
+
+        queue = gateway.server_status()["fake"]["queue"]
+        assert queue["rejected"] == 1
+        assert queue["admitted"] == 2
+        assert queue["avg_wait"] > 0
+
+
+@pytest.mark.asyncio
+async def test_large_results_are_read_and_oversized_ones_fail_their_call(tmp_path, fake_config) -> None:
+    path = tmp_path / "big.txt"
+    path.write_text("x" * (3 * 1024 * 1024))
+
+    async with running_gateway(fake=fake_config(max_message_bytes=4 * 1024 * 1024)) as gateway:
+        result = await gateway.call_tool("read_file", {"path": str(path)})
+        assert len(result["content"][0]["text"]) == 3 * 1024 * 1024
+
+        path.write_text("x" * (5 * 1024 * 1024))
+        with pytest.raises(Exception, match="exceeds"):
+            await gateway.call_tool("read_file", {"path": str(path)})
+
+        # The server stays usable after the oversized response is discarded
+        result = await gateway.call_tool("echo", {"text": "after"})
+        assert result["content"][0]["text"] == "after"
+
+
+@pytest.mark.asyncio
+async def test_metrics_record_calls_latency_and_startup(monkeypatch, fake_config) -> None:
+    async with running_gateway(fake=fake_config(tool_timeouts={"sleep": 0.1})) as gateway:
+        monkeypatch.setattr(gateway_server, "gateway", gateway)
+        await gateway.call_tool("echo", {"text": "hi"})
+        with pytest.raises(ToolTimeoutError):
+            await gateway.call_tool("sleep", {"seconds": 1})
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gateway") as client:
+            response = await client.get("/metrics")
+
+    lines = response.text.splitlines()
+    assert 'mcp_gateway_tool_calls_total{server="fake",tool="echo",status="ok"} 1' in lines
+    assert 'mcp_gateway_tool_calls_total{server="fake",tool="sleep",status="timeout"} 1' in lines
+    assert 'mcp_gateway_tool_call_duration_seconds_count{server="fake",tool="echo"} 1' in lines
+    assert 'mcp_gateway_tool_response_bytes_bucket{server="fake",tool="echo",le="+Inf"} 1' in lines
+    assert 'mcp_gateway_startup_duration_seconds_count{server="fake"} 1' in lines
+    assert 'mcp_gateway_in_flight_requests{server="fake"} 0' in lines
+    assert 'mcp_gateway_replicas{server="fake"} 1' in lines
+
+
+@pytest.mark.asyncio
+async def test_reload_restarts_only_changed_servers_and_drains_removed_ones(fake_config) -> None:
+    async with running_gateway(keep=fake_config(), change=fake_config(), drop=fake_config()) as gateway:
+        kept = gateway.servers["keep"]
+        old = gateway.servers["change"]
+        dropped = gateway.servers["drop"]
+        # A call already routed to the removed server finishes normally
+        in_flight = asyncio.create_task(gateway.call_tool("drop__sleep", {"seconds": 0.3, "text": "done"}))
+        await asyncio.sleep(0.05)
+
+        summary = await gateway.reload({
+            "keep": fake_config(),
+            "change": fake_config(call_timeout=30.0),
+            "new": fake_config(),
+        })
+
+        assert summary == {
+            "added": ["new"], "changed": ["change"], "removed": ["drop"], "unchanged": ["keep"], "failed": {}
+        }
+        assert gateway.servers["keep"] is kept
+        assert gateway.servers["change"] is not old
+        assert gateway.routes["change__echo"].timeout == 30.0
+        assert "new__echo" in gateway.routes
+        assert "drop__echo" not in gateway.routes
+        with pytest.raises(ToolNotFoundError):
+            await gateway.call_tool("drop__echo", {"text": "hi"})
+
+        assert (await in_flight)["content"][0]["text"] == "done"
+        await asyncio.gather(*gateway._drain_tasks)
+        assert dropped.replicas == [] and old.status == "stopped"
+        assert kept.replicas[0].alive
+
+
+@pytest.mark.asyncio
+async def test_reload_drains_for_the_longest_call_deadline(monkeypatch, fake_config) -> None:
+    servers = {
+        "slow": fake_config(call_timeout=60.0, tool_timeouts={"sleep": 600.0}),
+        "unlimited": fake_config(call_timeout=None),
+    }
+    async with running_gateway(**servers) as gateway:
+        timeouts = {}
+
+        async def drain(pool: MCPServerPool, timeout) -> None:
+            timeouts[pool.name] = timeout
+            await gateway._stop_pool(pool)
+
+        monkeypatch.setattr(gateway, "_drain", drain)
+        await gateway.reload({})
+        await asyncio.gather(*gateway._drain_tasks)
+
+    assert timeouts == {"slow": 600.0 + gateway_server.DRAIN_GRACE, "unlimited": None}
+
+
+@pytest.mark.asyncio
+async def test_reload_keeps_old_pool_when_changed_server_fails(fake_config) -> None:
+    async with running_gateway(fake=fake_config()) as gateway:
+        old = gateway.servers["fake"]
+        summary = await gateway.reload({"fake": fake_config("--startup-delay", "5", startup_timeout=0.2, startup_retries=0)})
+
+        assert "fake" in summary["failed"]
+        assert gateway.servers["fake"] is old
+        result = await gateway.call_tool("echo", {"text": "still here"})
+        assert result["content"][0]["text"] == "still here"
+
+
+@pytest.mark.asyncio
+async def test_admin_reload_endpoint(monkeypatch, tmp_path, fake_config) -> None:
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"mcp": {"servers": {
+        "other": {"command": sys.executable, "args": [fake_server.__file__]}
+    }}}))
+    monkeypatch.setenv("MCP_CONFIG", str(config_path))
+    async with running_gateway(fake=fake_config()) as gateway:
+        monkeypatch.setattr(gateway_server, "gateway", gateway)
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gateway") as client:
+            response = await client.post("/admin/reload")
+            assert response.json()["added"] == ["other"]
+            assert response.json()["removed"] == ["fake"]
+
+            config_path.write_text("{not json")
+            response = await client.post("/admin/reload")
+            assert response.status_code == 400
+        assert list(gateway.servers) == ["other"]
+
+
+@pytest.mark.asyncio
+async def test_fake_server_injects_latency_and_errors(fake_config) -> None:
+    async with running_gateway(
+        slow=fake_config("--latency", "0.2"), failing=fake_config("--error-rate", "1")
+    ) as gateway:
+        result = await gateway.call_tool("slow__payload", {"size": 1000})
+        assert len(result["content"][0]["text"]) == 1000
+
+        started = asyncio.get_running_loop().time()
+        await gateway.call_tool("slow__echo", {"text": "hi"})
+        assert asyncio.get_running_loop().time() - started >= 0.2
+
+        with pytest.raises(Exception, match="Injected failure"):
+            await gateway.call_tool("failing__echo", {"text": "hi"})
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_calls_are_coalesced(fake_config) -> None:
+    config = fake_config(coalesce=["sleep"], max_concurrency=1)
+    async with running_gateway(fake=config) as gateway:
+        started = asyncio.get_running_loop().time()
+        results = await asyncio.gather(
+            *(gateway.call_tool("sleep", {"seconds": 0.3, "text": "shared"}) for _ in range(5))
+        )
+        # One upstream call, not five queued behind a single slot
+        assert asyncio.get_running_loop().time() - started < 1.0
+        assert all(r["content"][0]["text"] == "shared" for r in results)
+        assert gateway.metrics.coalesced_calls.values == {("fake", "sleep"): 4}
+
+        # Different arguments, and tools not opted in, are sent separately
+        await asyncio.gather(
+            gateway.call_tool("sleep", {"seconds": 0.01, "text": "a"}),
+            gateway.call_tool("sleep", {"seconds": 0.01, "text": "b"}),
+            gateway.call_tool("echo", {"text": "c"}),
+            gateway.call_tool("echo", {"text": "c"}),
+        )
+        assert gateway.metrics.coalesced_calls.values == {("fake", "sleep"): 4}
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_show_recent_stderr_and_process_stats(monkeypatch, fake_config) -> None:
+    config = fake_config(stderr_lines=5, stderr_log_rate=1)
+    async with running_gateway(fake=config) as gateway:
+        monkeypatch.setattr(gateway_server, "gateway", gateway)
+        await gateway.call_tool("log", {"text": "warning: chatty", "n": 20})
+        await gateway.call_tool("echo", {"text": "hi"})
+        await asyncio.sleep(0.1)
+
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gateway") as client:
+            response = await client.get("/servers/fake/diagnostics")
+            missing = await client.get("/servers/missing/diagnostics")
+
+        assert missing.status_code == 404
+        diagnostics = response.json()
+        assert diagnostics["requests"]["calls"] == 2
+        replica = diagnostics["replicas"][0]
+        assert replica["pid"] == gateway.servers["fake"].replicas[0].process.pid
+        assert replica["alive"] and replica["uptime"] > 0
+        assert replica["rss_bytes"] is None or replica["rss_bytes"] > 0
+        stderr = replica["stderr"]
+        assert [line["text"] for line in stderr["lines"]] == ["warning: chatty"] * 5
+        assert stderr["total"] == 20
+        assert stderr["not_logged"] == 19
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_read_all_replicas_in_one_scan(monkeypatch, fake_config) -> None:
+    scans = []
+
+    def process_group_usage(pgids):
+        scans.append(pgids)
+        return {pgid: ProcessGroupUsage(processes=1, rss_bytes=4096) for pgid in pgids}
+
+    monkeypatch.setattr(gateway_server, "process_group_usage", process_group_usage)
+    async with running_gateway(fake=fake_config(replicas=3)) as gateway:
+        diagnostics = await gateway.diagnostics("fake")
+
+        assert scans == [{server.process.pid for server in gateway.servers["fake"].replicas}]
+        assert [replica["rss_bytes"] for replica in diagnostics["replicas"]] == [4096] * 3
+
+
+@pytest.mark.asyncio
+async def test_monitor_stderr_returns_when_there_is_no_stderr() -> None:
+    server = SimpleNamespace(name="fake", process=SimpleNamespace(stderr=None))
+    await asyncio.wait_for(Gateway()._monitor_stderr(server), 1)
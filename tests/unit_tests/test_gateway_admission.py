@@ -0,0 +1,110 @@
+"""Tests for the gateway's admission control."""
+
+import asyncio
+
+import pytest
+from mcp_gateway.admission import AdmissionQueue, ServerBusyError
+
+
+@pytest.mark.asyncio
+async def test_waiting_calls_are_admitted_in_arrival_order() -> None:
+    queue = AdmissionQueue("fake", limit=1)
+    order = []
+
+    async def call(i: int) -> None:
+        async with queue.slot():
+            order.append(i)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(call(i) for i in range(4)))
+
+    assert order == [0, 1, 2, 3]
+    assert queue.stats()["admitted"] == 4
+    assert queue.stats()["max_wait"] > 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_with_retry_hint() -> None:
+    queue = AdmissionQueue("fake", limit=1, max_queue=1)
+    await queue.acquire()
+    waiting = asyncio.create_task(queue.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(ServerBusyError) as excinfo:
+        await queue.acquire()
+    assert excinfo.value.retry_after >= 1
+    assert queue.stats()["rejected"] == 1
+
+    # A waiter that gives up frees its place in the queue
+    waiting.cancel()
+    await asyncio.sleep(0)
+    assert queue.depth == 0
+    queue.release()
+    assert queue.active == 0
+
+
+async def _admission_order(queue: AdmissionQueue, priorities: list) -> list:
+    """Queue one call per priority behind a held slot and return the admission order."""
+    await queue.acquire()
+    order = []
+
+    async def call(i: int, priority: str) -> None:
+        async with queue.slot(priority):
+            order.append(i)
+
+    calls = [asyncio.create_task(call(i, p)) for i, p in enumerate(priorities)]
+    await asyncio.sleep(0.01)
+    queue.release()
+    await asyncio.gather(*calls)
+    return order
+
+
+@pytest.mark.asyncio
+async def test_urgent_calls_are_admitted_first() -> None:
+    queue = AdmissionQueue("fake", limit=1)
+    order = await _admission_order(queue, ["low", "medium", "high", "low", "high"])
+
+    assert order == [2, 4, 1, 0, 3]
+    assert queue.stats()["admitted_by_priority"] == {"high": 2, "medium": 2, "low": 2}
+
+
+@pytest.mark.asyncio
+async def test_waiting_low_priority_calls_age_past_new_urgent_ones() -> None:
+    queue = AdmissionQueue("fake", limit=1, aging=0.01)
+    await queue.acquire()
+    order = []
+
+    async def call(name: str, priority: str) -> None:
+        async with queue.slot(priority):
+            order.append(name)
+
+    # Having waited many aging periods, the low call outranks a new high one
+    low = asyncio.create_task(call("low", "low"))
+    await asyncio.sleep(0.1)
+    high = asyncio.create_task(call("high", "high"))
+    await asyncio.sleep(0)
+    queue.release()
+    await asyncio.gather(low, high)
+
+    assert order == ["low", "high"]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_displaces_lower_priority_waiters() -> None:
+    queue = AdmissionQueue("fake", limit=1, max_queue=1)
+    await queue.acquire()
+    low = asyncio.create_task(queue.acquire("low"))
+    await asyncio.sleep(0)
+
+    # A call of the same priority is turned away, a more urgent one is not
+    with pytest.raises(ServerBusyError):
+        await queue.acquire("low")
+    high = asyncio.create_task(queue.acquire("high"))
+    await asyncio.sleep(0)
+    with pytest.raises(ServerBusyError, match="displaced"):
+        await low
+
+    queue.release()
+    await high
+    assert queue.stats()["rejected"] == 2
+    queue.release()
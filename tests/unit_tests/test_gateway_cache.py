@@ -0,0 +1,50 @@
+"""Tests for the gateway's tool result cache."""
+
+import time
+
+from mcp_gateway.cache import ToolResultCache, cache_key
+
+
+def test_cache_key_ignores_argument_order() -> None:
+    assert cache_key("fs", "read_file", {"a": 1, "b": 2}) == cache_key("fs", "read_file", {"b": 2, "a": 1})
+    assert cache_key("fs", "read_file", {"a": 1}) != cache_key("fs", "write_file", {"a": 1})
+
+
+def test_cache_counts_hits_and_misses() -> None:
+    cache = ToolResultCache()
+    assert cache.get("k") is None
+    cache.put("k", {"v": 1}, ttl=60, size=10)
+
+    assert cache.get("k") == {"v": 1}
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_cache_entries_expire() -> None:
+    cache = ToolResultCache()
+    cache.put("k", "value", ttl=0.01, size=5)
+    time.sleep(0.02)
+
+    assert cache.get("k") is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = ToolResultCache(max_bytes=20)
+    cache.put("a", "a", ttl=60, size=10)
+    cache.put("b", "b", ttl=60, size=10)
+    cache.get("a")
+    cache.put("c", "c", ttl=60, size=10)
+
+    assert cache.get("a") == "a"
+    assert cache.get("b") is None
+    assert cache.get("c") == "c"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_cache_skips_values_larger_than_budget() -> None:
+    cache = ToolResultCache(max_bytes=10)
+    cache.put("big", "x" * 11, ttl=60, size=11)
+
+    assert cache.get("big") is None
+    assert cache.stats()["bytes"] == 0
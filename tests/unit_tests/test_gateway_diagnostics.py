@@ -0,0 +1,42 @@
+"""Tests for server process diagnostics."""
+
+import os
+
+import pytest
+from mcp_gateway.diagnostics import (
+    MAX_LINE_CHARS,
+    StderrBuffer,
+    process_group_usage,
+)
+
+
+def test_stderr_buffer_keeps_recent_lines_and_limits_logging() -> None:
+    buffer = StderrBuffer(max_lines=3, log_rate=2)
+
+    logged = [buffer.append(f"line {i}") for i in range(5)]
+
+    assert logged == [True, True, False, False, False]
+    assert buffer.take_unreported() == 3
+    assert buffer.take_unreported() == 0
+    snapshot = buffer.snapshot()
+    assert [line["text"] for line in snapshot["lines"]] == ["line 2", "line 3", "line 4"]
+    assert snapshot["total"] == 5
+    assert snapshot["not_logged"] == 3
+    assert [line["text"] for line in buffer.snapshot(limit=1)["lines"]] == ["line 4"]
+
+
+def test_long_stderr_lines_are_truncated() -> None:
+    buffer = StderrBuffer()
+    buffer.append("x" * (MAX_LINE_CHARS * 2))
+    assert len(buffer.lines[0][1]) == MAX_LINE_CHARS + 3
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="needs /proc")
+def test_process_group_usage_reads_each_group_once() -> None:
+    usage = process_group_usage({os.getpgrp(), 2 ** 22 + 12345})
+    group = usage[os.getpgrp()]
+    assert group.processes >= 1
+    assert group.rss_bytes > 0
+    assert group.max_vm_bytes >= group.rss_bytes
+    assert group.max_open_files >= 3
+    assert 2 ** 22 + 12345 not in usage
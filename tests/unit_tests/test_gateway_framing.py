@@ -0,0 +1,58 @@
+"""Tests for the gateway's stdio message framing."""
+
+import asyncio
+
+import pytest
+from mcp_gateway import framing
+from mcp_gateway.framing import MessageReader, MessageTooLargeError
+
+
+def reader_for(*chunks: bytes, max_message_bytes: int = 1024) -> MessageReader:
+    """Build a reader over a stream that yields the given chunks."""
+    stream = asyncio.StreamReader()
+    for chunk in chunks:
+        stream.feed_data(chunk)
+    stream.feed_eof()
+    return MessageReader(stream, max_message_bytes)
+
+
+@pytest.mark.asyncio
+async def test_messages_are_split_across_and_within_chunks(monkeypatch) -> None:
+    monkeypatch.setattr(framing, "READ_CHUNK_SIZE", 4)
+    reader = reader_for(b'{"id":1}\n{"id"', b':2}\n\n{"id":3}')
+
+    messages = []
+    while (message := await reader.read_message()) is not None:
+        messages.append(message)
+
+    assert messages == [b'{"id":1}', b'{"id":2}', b"", b'{"id":3}']
+
+
+@pytest.mark.asyncio
+async def test_oversized_message_reports_its_id_and_reading_continues(monkeypatch) -> None:
+    monkeypatch.setattr(framing, "READ_CHUNK_SIZE", 64)
+    big = b'{"jsonrpc":"2.0","result":{"text":"' + b"x" * 500 + b'"},"id":7}\n'
+    reader = reader_for(big, b'{"id":8}\n', max_message_bytes=100)
+
+    with pytest.raises(MessageTooLargeError) as excinfo:
+        await reader.read_message()
+    assert excinfo.value.request_id == 7
+    assert excinfo.value.size == len(big) - 1
+
+    assert await reader.read_message() == b'{"id":8}'
+    assert await reader.read_message() is None
+
+
+@pytest.mark.asyncio
+async def test_many_small_messages_in_one_chunk() -> None:
+    count = 50_000
+    data = b"".join(b'{"id":%d}\n' % i for i in range(count))
+    reader = reader_for(data[:-7], data[-7:])
+
+    messages = []
+    while (message := await reader.read_message()) is not None:
+        messages.append(message)
+
+    assert len(messages) == count
+    assert messages[0] == b'{"id":0}'
+    assert messages[-1] == b'{"id":%d}' % (count - 1)
@@ -0,0 +1,74 @@
+"""Tests for the gateway's JSON-RPC envelope parsing."""
+
+import orjson
+import pytest
+from mcp_gateway.jsonrpc import (
+    MAX_VALUE_TOKENS,
+    is_error_result,
+    parse_message,
+    split_object,
+)
+
+RESULT = b'{"content":[{"text":"a \\"quoted\\" }"}]}'
+
+
+@pytest.mark.parametrize("data", [
+    b'{"jsonrpc": "2.0", "id": 7, "result": ' + RESULT + b'}',
+    b'{"result":' + RESULT + b',"jsonrpc":"2.0","id":7}\r',
+])
+def test_result_is_kept_as_raw_bytes(data: bytes) -> None:
+    message = parse_message(data)
+
+    assert message.id == 7
+    assert message.error is None
+    assert message.result == RESULT
+
+
+def test_other_messages_are_parsed_in_full() -> None:
+    error = parse_message(b'{"jsonrpc":"2.0","id":"x","error":{"code":-32603,"message":"boom"}}')
+    assert error.id == "x"
+    assert error.error["message"] == "boom"
+    assert error.result is None
+
+    notification = parse_message(b'{"jsonrpc":"2.0","method":"notifications/progress","params":{"progress":1}}')
+    assert notification.method == "notifications/progress"
+    assert notification.params == {"progress": 1}
+
+    with pytest.raises(ValueError):
+        parse_message(b"[1, 2]")
+
+
+def test_is_error_result() -> None:
+    assert is_error_result(b'{"content":[{"type":"text","text":"no"}],"isError":true}')
+    assert is_error_result(b'{"isError": true, "content": []}')
+    assert not is_error_result(b'{"content":[{"type":"text","text":"\\"isError\\":true"}]}')
+
+
+@pytest.mark.parametrize("data", [
+    b'{"id":1,"result":{"a":1},"b":[2]}',
+    b'{"id":1,"result":{"a":1},"b":{"c":[3]}}',
+    b'{"id":1,"result":[1],"b":{"c":1},"d":2}',
+])
+def test_later_non_scalar_members_need_a_full_parse(data: bytes) -> None:
+    assert split_object(data, "result") is None
+
+    message = parse_message(data)
+    assert message.id == 1
+    assert message.result == orjson.dumps(orjson.loads(data)["result"])
+
+
+@pytest.mark.parametrize("trailing", [
+    b',"structuredContent":{"rows":[1,2]}',
+    b',"_meta":{"traceparent":"00-abc"}',
+])
+def test_error_results_with_later_members_are_detected(trailing: bytes) -> None:
+    assert is_error_result(b'{"content":[{"type":"text","text":"no"}],"isError":true' + trailing + b'}')
+    assert not is_error_result(b'{"content":[{"type":"text","text":"ok"}],"isError":false' + trailing + b'}')
+
+
+def test_values_with_many_tokens_are_parsed_in_full() -> None:
+    result = orjson.dumps({"content": [{"type": "text", "text": str(i)} for i in range(MAX_VALUE_TOKENS)]})
+    data = b'{"id":3,"result":' + result + b'}'
+
+    assert split_object(data, "result") is None
+    assert parse_message(data).result == result
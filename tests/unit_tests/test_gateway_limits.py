@@ -0,0 +1,105 @@
+"""Tests for server process resource limits."""
+
+import asyncio
+import os
+import resource
+
+import pytest
+from mcp_gateway import server as gateway_server
+from mcp_gateway.diagnostics import ProcessGroupUsage
+from mcp_gateway.limits import SUPPORTED, ResourceLimits
+from mcp_gateway.server import Gateway
+
+
+@pytest.mark.parametrize("limits", [
+    {"nice": 20},
+    {"cpu_affinity": [-1]},
+    {"max_rss_bytes": 0},
+    {"max_open_files": -5},
+])
+def test_invalid_limits_are_rejected_with_the_config(limits, fake_config) -> None:
+    with pytest.raises(ValueError):
+        fake_config(**limits)
+
+
+def test_limits_are_configured_only_when_set(fake_config) -> None:
+    assert not ResourceLimits().configured
+    assert fake_config(nice=5).limits == ResourceLimits(nice=5)
+    assert fake_config(cpu_affinity=[0]).limits.configured
+
+
+@pytest.mark.skipif(not SUPPORTED, reason="resource limits are only applied on Linux")
+@pytest.mark.asyncio
+async def test_limits_are_applied_at_spawn(fake_config) -> None:
+    gateway = Gateway()
+    config = fake_config(
+        cpu_affinity=[0], nice=5, max_address_space_bytes=4 * 1024 ** 3, max_open_files=64
+    )
+    try:
+        await gateway.start_server("fake", config)
+        pid = gateway.servers["fake"].replicas[0].process.pid
+        assert os.sched_getaffinity(pid) == {0}
+        assert os.getpriority(os.PRIO_PROCESS, pid) == 5
+        assert resource.prlimit(pid, resource.RLIMIT_NOFILE) == (64, 64)
+        assert resource.prlimit(pid, resource.RLIMIT_AS) == (4 * 1024 ** 3, 4 * 1024 ** 3)
+        # The server still works within them
+        result = await gateway.call_tool("echo", {"text": "limited"})
+        assert result["content"][0]["text"] == "limited"
+    finally:
+        await gateway.shutdown()
+
+
+@pytest.mark.skipif(not SUPPORTED, reason="resource limits are only applied on Linux")
+@pytest.mark.asyncio
+async def test_server_fails_to_start_when_its_limits_cant_be_applied(monkeypatch, fake_config) -> None:
+    pids = []
+
+    def apply(self, pid):
+        pids.append(pid)
+        raise PermissionError("Operation not permitted")
+
+    monkeypatch.setattr(ResourceLimits, "apply", apply)
+    gateway = Gateway()
+    try:
+        with pytest.raises(Exception, match="Could not apply resource limits"):
+            await gateway.start_server("fake", fake_config(nice=-5, startup_retries=0))
+        with pytest.raises(ProcessLookupError):
+            os.kill(pids[0], 0)
+    finally:
+        await gateway.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_replica_over_its_memory_cap_is_killed_and_reported(monkeypatch, fake_config) -> None:
+    monkeypatch.setattr(gateway_server, "LIMIT_CHECK_INTERVAL", 0.05)
+    gateway = Gateway()
+    try:
+        await gateway.start_server("fake", fake_config(max_rss_bytes=1024, restart_backoff=10))
+        pool = gateway.servers["fake"]
+        async with asyncio.timeout(5):
+            while pool.replicas:
+                await asyncio.sleep(0.02)
+
+        assert pool.status == "restarting"
+        assert pool.limit_breaches == {"rss": 1}
+        diagnostics = await gateway.diagnostics("fake")
+        assert diagnostics["limits"]["max_rss_bytes"] == 1024
+        assert diagnostics["limits"]["breaches"] == {"rss": 1}
+        metrics = gateway.metrics.render()
+        assert 'mcp_gateway_limit_breaches_total{server="fake",limit="rss"} 1' in metrics
+    finally:
+        await gateway.shutdown()
+
+
+def test_reaching_a_limit_is_counted_once_until_it_clears(fake_config) -> None:
+    gateway = Gateway()
+    config = fake_config(max_open_files=100)
+    pool = gateway_server.MCPServerPool("fake", config)
+    server = gateway_server.MCPServer("fake", config, process=None)
+
+    for open_files in (10, 96, 99, 10, 100):
+        gateway._check_limits(pool, server, ProcessGroupUsage(1, 1024, 4096, open_files))
+
+    assert pool.limit_breaches == {"open_files": 2}
+    assert server.limits_hit == {"open_files"}
+    assert server.usage.max_open_files == 100
@@ -0,0 +1,29 @@
+"""Tests for the gateway's Prometheus metrics."""
+
+from mcp_gateway.metrics import Counter, Histogram, Registry
+
+
+def test_histogram_buckets_are_cumulative() -> None:
+    registry = Registry()
+    latency = registry.register(Histogram("latency_seconds", "Latency.", ("tool",), buckets=(0.1, 1.0)))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, "echo")
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP latency_seconds Latency.", "# TYPE latency_seconds histogram"]
+    assert lines[2:] == [
+        'latency_seconds_bucket{tool="echo",le="0.1"} 2',
+        'latency_seconds_bucket{tool="echo",le="1.0"} 3',
+        'latency_seconds_bucket{tool="echo",le="+Inf"} 4',
+        'latency_seconds_sum{tool="echo"} 3.65',
+        'latency_seconds_count{tool="echo"} 4',
+    ]
+
+
+def test_label_values_are_escaped() -> None:
+    registry = Registry()
+    calls = registry.register(Counter("calls_total", "Calls.", ("tool",)))
+    calls.inc('say "hi"')
+    calls.inc('say "hi"', amount=2)
+
+    assert 'calls_total{tool="say \\"hi\\""} 3' in registry.render().splitlines()
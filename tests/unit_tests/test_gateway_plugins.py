@@ -0,0 +1,85 @@
+"""Tests for in-process Python tool providers."""
+
+import asyncio
+import os
+
+import pytest
+from mcp_gateway.plugins import describe, tool
+from mcp_gateway.server import Gateway, MCPServerConfig
+
+
+def add(a: int, b: int = 1) -> int:
+    """Add two numbers.
+
+    Extra detail that is not part of the description.
+    """
+    return a + b
+
+
+async def greet(name: str) -> str:
+    """Greet someone."""
+    await asyncio.sleep(0)
+    return f"hello {name}"
+
+
+@tool(name="pid", description="Report the worker's process id.")
+def worker_pid() -> dict:
+    return {"pid": os.getpid()}
+
+
+def fail() -> None:
+    """Always fail."""
+    raise RuntimeError("nope")
+
+
+def test_tool_definitions_come_from_signatures() -> None:
+    assert describe(add) == {
+        "name": "add",
+        "description": "Add two numbers.",
+        "inputSchema": {
+            "type": "object",
+            "properties": {"a": {"type": "integer"}, "b": {"type": "integer"}},
+            "required": ["a"],
+        },
+    }
+    assert describe(worker_pid)["name"] == "pid"
+
+
+@pytest.mark.asyncio
+async def test_python_tools_are_listed_and_routed() -> None:
+    gateway = Gateway()
+    try:
+        await gateway.start_server("py", MCPServerConfig(
+            callables=[f"{__name__}:{name}" for name in ("add", "greet", "fail")]
+        ))
+        tools = await gateway.list_all_tools()
+        assert sorted(t["name"] for t in tools) == ["add", "fail", "greet"]
+
+        result = await gateway.call_tool("add", {"a": 2, "b": 3})
+        assert result == {"content": [{"type": "text", "text": "5"}]}
+        result = await gateway.call_tool("py__greet", {"name": "ann"})
+        assert result["content"][0]["text"] == "hello ann"
+
+        failed = await gateway.call_tool("fail", {})
+        assert failed["isError"] is True
+        assert failed["content"][0]["text"] == "nope"
+    finally:
+        await gateway.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_executor_runs_tools_outside_the_gateway() -> None:
+    gateway = Gateway()
+    try:
+        await gateway.start_server("workers", MCPServerConfig(
+            callables=[f"{__name__}:worker_pid"], executor="process", max_workers=1
+        ))
+        result = await gateway.call_tool("pid", {})
+        assert result["content"][0]["text"] != f'{{"pid":{os.getpid()}}}'
+    finally:
+        await gateway.shutdown()
+
+
+def test_config_needs_a_command_or_python_tools() -> None:
+    with pytest.raises(ValueError):
+        MCPServerConfig()
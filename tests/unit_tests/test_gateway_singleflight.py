@@ -0,0 +1,72 @@
+"""Tests for single-flight deduplication of concurrent calls."""
+
+import asyncio
+
+import pytest
+from mcp_gateway.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_run() -> None:
+    flights = SingleFlight()
+    runs = []
+
+    async def call() -> str:
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return "result"
+
+    results = await asyncio.gather(*(flights.do("key", call) for _ in range(5)))
+
+    assert results == ["result"] * 5
+    assert len(runs) == 1
+    assert flights.shared == 4
+    assert len(flights) == 0
+
+    # Once finished, the next call runs again
+    await flights.do("key", call)
+    assert len(runs) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_not_remembered() -> None:
+    flights = SingleFlight()
+
+    async def fail() -> None:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(*(flights.do("key", fail) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert "key" not in flights
+
+
+@pytest.mark.asyncio
+async def test_run_outlives_a_caller_and_is_cancelled_when_all_leave() -> None:
+    flights = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def slow() -> str:
+        try:
+            await asyncio.sleep(0.2)
+            return "done"
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def impatient_call() -> str:
+        async with asyncio.timeout(0.05):
+            return await flights.do("key", slow)
+
+    # A caller giving up does not fail the others or restart the run
+    results = await asyncio.gather(impatient_call(), flights.do("key", slow), return_exceptions=True)
+    assert isinstance(results[0], TimeoutError)
+    assert results[1] == "done"
+    assert flights.shared == 1
+    assert not cancelled.is_set()
+
+    impatient = asyncio.create_task(flights.do("other", slow))
+    await asyncio.sleep(0.01)
+    impatient.cancel()
+    await asyncio.wait_for(cancelled.wait(), 1)
+    assert "other" not in flights
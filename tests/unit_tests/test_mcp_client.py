@@ -0,0 +1,311 @@
+"""Tests for the MCP gateway client."""
+
+import asyncio
+import importlib.util
+import json
+import re
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+import uvicorn
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig, ensure_config
+from langchain_core.tools import tool
+from langchain_openai import ChatOpenAI
+from langgraph.graph import MessagesState, StateGraph
+from langgraph.prebuilt import ToolNode
+from mcp_gateway import fake_server
+from mcp_gateway import server as gateway_server
+from mcp_gateway.server import Gateway, MCPServerConfig, app
+
+from react_agent import mcp_client, tracing
+from react_agent.mcp_client import MCPGatewayClient
+
+
+def gateway_client(requests: list = None) -> MCPGatewayClient:
+    """Create a client wired to the gateway app in-process."""
+    client = MCPGatewayClient("http://gateway")
+    client.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+    if requests is not None:
+        async def record(request: httpx.Request) -> None:
+            requests.append(request)
+
+        client.client.event_hooks["request"].append(record)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_list_tools_revalidates_with_etag() -> None:
+    requests = []
+    client = gateway_client(requests)
+
+    tools = await client.list_tools()
+    assert await client.list_tools() is tools
+    assert len(requests) == 1
+
+    assert await client.list_tools(refresh=True) is tools
+    assert requests[1].headers["If-None-Match"] == client._tools_etag
+
+
+@pytest.mark.asyncio
+async def test_catalog_is_revalidated_when_old_or_missing_a_tool(monkeypatch) -> None:
+    gateway = Gateway()
+    monkeypatch.setattr(gateway_server, "gateway", gateway)
+    await gateway.start_server("fake", MCPServerConfig(command=sys.executable, args=[fake_server.__file__]))
+    try:
+        requests = []
+        client = gateway_client(requests)
+        tools = await client.list_tools()
+        assert await client.list_tools() is tools
+
+        # A tool call that finds a tool missing marks the catalog stale
+        with pytest.raises(Exception, match="404"):
+            await client.call_tool("missing", {})
+        assert await client.list_tools() is tools
+        assert requests[-1].headers["If-None-Match"] == client._tools_etag
+        assert await client.list_tools() is tools
+        assert len(requests) == 3
+
+        # So does age; an unchanged catalog costs a 304
+        client.catalog_max_age = 0
+        assert await client.list_tools() is tools
+        assert len(requests) == 4
+        assert requests[-1].headers["If-None-Match"] == client._tools_etag
+    finally:
+        await gateway.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_incomplete_catalog_is_revalidated_until_servers_start(monkeypatch) -> None:
+    gateway = Gateway()
+    monkeypatch.setattr(gateway_server, "gateway", gateway)
+    startup = asyncio.create_task(gateway.start_servers({
+        "slow": MCPServerConfig(command=sys.executable, args=[fake_server.__file__, "--startup-delay", "0.5"])
+    }))
+    try:
+        requests = []
+        client = gateway_client(requests)
+        await asyncio.sleep(0)
+        assert await client.list_tools() == []
+        assert await client.list_tools() == []
+        assert len(requests) == 2
+
+        await startup
+        tools = await client.list_tools()
+        assert {tool["name"] for tool in tools} >= {"echo"}
+        assert await client.list_tools() is tools
+        assert len(requests) == 3
+    finally:
+        await gateway.shutdown()
+
+
+def load_tools_module():
+    """Import react_agent.tools itself, which conftest stubs out for the graph."""
+    spec = importlib.util.spec_from_file_location(
+        "react_agent_tools_under_test", Path(mcp_client.__file__).with_name("tools.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.asyncio
+async def test_colliding_tools_bind_to_a_chat_model(monkeypatch) -> None:
+    gateway = Gateway()
+    monkeypatch.setattr(gateway_server, "gateway", gateway)
+    monkeypatch.setattr(mcp_client, "_client", gateway_client())
+    for name in ("a", "b"):
+        await gateway.start_server(name, MCPServerConfig(command=sys.executable, args=[fake_server.__file__]))
+    try:
+        tools_module = load_tools_module()
+        assert await tools_module.refresh_tools()
+        tools = tools_module.TOOLS
+        model = ChatOpenAI(model="gpt-4o-mini", api_key="test").bind_tools(tools)
+
+        names = [tool["function"]["name"] for tool in model.kwargs["tools"]]
+        assert "a__echo" in names and "b__echo" in names
+        assert all(re.fullmatch(r"[a-zA-Z0-9_-]{1,64}", name) for name in names)
+        echo = next(tool for tool in tools if tool.name == "b__echo")
+        assert "from b" in str(await echo.ainvoke({"text": "from b"}))
+    finally:
+        await gateway.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tool_calls_share_one_request(monkeypatch) -> None:
+    gateway = Gateway()
+    monkeypatch.setattr(gateway_server, "gateway", gateway)
+    await gateway.start_server("fake", MCPServerConfig(command=sys.executable, args=[fake_server.__file__]))
+    try:
+        requests = []
+        client = gateway_client(requests)
+
+        results = await asyncio.gather(
+            client.call_tool("echo", {"text": "a"}),
+            client.call_tool("echo", {"text": "b"}),
+            client.call_tool("missing", {}),
+            return_exceptions=True,
+        )
+        assert results[:2] == ["a", "b"]
+        assert isinstance(results[2], Exception)
+        assert len(requests) == 1
+
+        assert await client.call_tool("echo", {"text": "alone"}) == "alone"
+        assert await client.call_tools([("echo", {"text": "x"}), ("echo", {"text": "y"})]) == ["x", "y"]
+    finally:
+        await gateway.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_stream_tool_yields_progress_then_content(monkeypatch) -> None:
+    gateway = Gateway()
+    monkeypatch.setattr(gateway_server, "gateway", gateway)
+    await gateway.start_server("fake", MCPServerConfig(command=sys.executable, args=[fake_server.__file__]))
+    try:
+        client = gateway_client()
+        events = [event async for event in client.stream_tool("count", {"n": 3})]
+
+        assert [event["event"] for event in events] == ["progress"] * 3 + ["content"] * 3 + ["result"]
+        assert [event["data"]["progress"] for event in events[:3]] == [1, 2, 3]
+        assert [event["data"]["text"] for event in events[3:6]] == ["1", "2", "3"]
+
+        with pytest.raises(Exception, match="404"):
+            async for _ in client.stream_tool("missing", {}):
+                pass
+    finally:
+        await gateway.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_call_timeout_is_sent_to_gateway(monkeypatch) -> None:
+    gateway = Gateway()
+    monkeypatch.setattr(gateway_server, "gateway", gateway)
+    await gateway.start_server("fake", MCPServerConfig(command=sys.executable, args=[fake_server.__file__]))
+    try:
+        requests = []
+        client = gateway_client(requests)
+        client.call_timeout = 0.2
+
+        with pytest.raises(Exception, match="504"):
+            await client.call_tool("sleep", {"seconds": 5})
+        assert requests[0].headers["X-Request-Timeout"] == "0.2"
+
+        results = await asyncio.gather(
+            client.call_tool("sleep", {"seconds": 5}),
+            client.call_tool("echo", {"text": "fast"}, timeout=1),
+            return_exceptions=True,
+        )
+        assert "timed out" in str(results[0])
+        assert results[1] == "fast"
+    finally:
+        await gateway.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_trace_context_flows_from_agent_to_gateway(monkeypatch, tmp_path) -> None:
+    trace_file = tmp_path / "spans.jsonl"
+    monkeypatch.setenv("TRACE_FILE", str(trace_file))
+    gateway = Gateway(trace_file=str(trace_file))
+    monkeypatch.setattr(gateway_server, "gateway", gateway)
+    await gateway.start_server("fake", MCPServerConfig(command=sys.executable, args=[fake_server.__file__]))
+    requests = []
+    client = gateway_client(requests)
+    client.batch_window = None
+
+    # Nodes and tools span their work as graph.py and tools.py do
+    async def call_model(state: MessagesState, config: RunnableConfig) -> dict:
+        with tracing.span("call_model", config):
+            call = {"name": "echo", "args": {"text": "traced"}, "id": "call-1"}
+            return {"messages": [AIMessage(content="", tool_calls=[call])]}
+
+    @tool
+    async def echo(text: str) -> str:
+        """Echo the text through the gateway."""
+        with tracing.span("tool", ensure_config(), tool="echo"):
+            return await client.call_tool("echo", {"text": text})
+
+    builder = StateGraph(MessagesState)
+    builder.add_node(call_model)
+    builder.add_node("tools", ToolNode([echo]))
+    builder.add_edge("__start__", "call_model")
+    builder.add_edge("call_model", "tools")
+    graph = builder.compile().with_config(callbacks=[tracing.RUN_TRACER])
+    try:
+        state = await graph.ainvoke({"messages": [HumanMessage(content="hi")]})
+        assert state["messages"][-1].content == "traced"
+        # A second run gets a trace of its own
+        await graph.ainvoke({"messages": [HumanMessage(content="again")]})
+    finally:
+        await gateway.shutdown()
+    assert not tracing.RUN_TRACER._runs
+    tracing.flush()
+
+    spans = []
+    for line in trace_file.read_text().splitlines():
+        resource_spans = json.loads(line)["resourceSpans"][0]
+        spans.append(resource_spans["scopeSpans"][0]["spans"][0])
+    runs = [span for span in spans if span["name"] == "graph_run"]
+    assert len(runs) == 2 and runs[0]["traceId"] != runs[1]["traceId"]
+    first = {span["name"]: span for span in spans if span["traceId"] == runs[0]["traceId"]}
+
+    assert set(first) == {"graph_run", "call_model", "tool", "gateway_request", "call_tool", "server_request"}
+    assert "parentSpanId" not in first["graph_run"]
+    assert first["call_model"]["parentSpanId"] == first["graph_run"]["spanId"]
+    assert first["tool"]["parentSpanId"] == first["graph_run"]["spanId"]
+    assert first["gateway_request"]["parentSpanId"] == first["tool"]["spanId"]
+    assert first["call_tool"]["parentSpanId"] == first["gateway_request"]["spanId"]
+    assert first["server_request"]["parentSpanId"] == first["call_tool"]["spanId"]
+    assert requests[0].headers["traceparent"].split("-")[1] == runs[0]["traceId"]
+
+
+@pytest.mark.asyncio
+async def test_priority_hint_is_sent_to_gateway(monkeypatch) -> None:
+    gateway = Gateway()
+    monkeypatch.setattr(gateway_server, "gateway", gateway)
+    await gateway.start_server(
+        "fake", MCPServerConfig(command=sys.executable, args=[fake_server.__file__], max_concurrency=2)
+    )
+    try:
+        requests = []
+        client = gateway_client(requests)
+
+        with mcp_client.priority("High"):
+            assert await client.call_tool("echo", {"text": "alone"}) == "alone"
+            assert await asyncio.gather(
+                client.call_tool("echo", {"text": "a"}),
+                client.call_tool("echo", {"text": "b"}, priority="low"),
+            ) == ["a", "b"]
+        await client.call_tool("echo", {"text": "unset"})
+
+        assert requests[0].headers["X-Priority"] == "high"
+        assert [msg["priority"] for msg in json.loads(requests[1].content)] == ["high", "low"]
+        assert "X-Priority" not in requests[2].headers
+        stats = gateway.servers["fake"].admission.stats()
+        assert stats["admitted_by_priority"] == {"high": 2, "medium": 1, "low": 1}
+    finally:
+        await gateway.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_unix_socket_gateway_url(monkeypatch, tmp_path) -> None:
+    gateway = Gateway()
+    monkeypatch.setattr(gateway_server, "gateway", gateway)
+    await gateway.start_server("fake", MCPServerConfig(command=sys.executable, args=[fake_server.__file__]))
+    socket_path = str(tmp_path / "gateway.sock")
+    server = uvicorn.Server(uvicorn.Config(app, uds=socket_path, lifespan="off", log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    try:
+        while not server.started:
+            await asyncio.sleep(0.01)
+        client = MCPGatewayClient(f"unix://{socket_path}")
+        assert client.gateway_url == "http://localhost"
+
+        assert await client.call_tools([("echo", {"text": "a"}), ("echo", {"text": "b"})]) == ["a", "b"]
+        assert "echo" in {tool["name"] for tool in await client.list_tools()}
+        await client.client.aclose()
+    finally:
+        server.should_exit = True
+        await serving
+        await gateway.shutdown()